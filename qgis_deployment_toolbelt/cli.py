@@ -25,6 +25,8 @@ from qgis_deployment_toolbelt.__about__ import (
     __uri_homepage__,
     __version__,
 )
+from qgis_deployment_toolbelt.commands.cache import parser_cache
+from qgis_deployment_toolbelt.commands.cache_serve import parser_cache_serve
 from qgis_deployment_toolbelt.commands.cmd_rules_context import (
     parser_rules_context_export,
 )
@@ -188,6 +190,29 @@ def main(in_args: list[str] | None = None):
     add_common_arguments(subcmd_upgrade)
     parser_upgrade(subcmd_upgrade)
 
+    # LAN cache server
+    subcmd_cache_serve = subparsers.add_parser(
+        "cache-serve",
+        help="Serve the plugins archives downloaded by QDT over HTTP so that other "
+        "machines can use them as a cache. Listens on 127.0.0.1 by default: set the "
+        "--host option to share them on the LAN.",
+        formatter_class=main_parser.formatter_class,
+        prog="cache-serve",
+    )
+    add_common_arguments(subcmd_cache_serve)
+    parser_cache_serve(subcmd_cache_serve)
+
+    # Local cache management
+    subcmd_cache = subparsers.add_parser(
+        "cache",
+        help="Manage the local QDT cache (plugins, profiles, git mirrors, remote "
+        "scenarios).",
+        formatter_class=main_parser.formatter_class,
+        prog="cache",
+    )
+    add_common_arguments(subcmd_cache)
+    parser_cache(subcmd_cache)
+
     # -- PARSE ARGS --
     set_default_subparser(parser_to_update=main_parser, default_subparser_name="deploy")
 
@@ -0,0 +1,123 @@
+#! python3  # noqa: E265
+
+"""
+    Sub-commands managing the local QDT cache (plugins archives, downloaded
+    repositories, git mirrors and remote scenarios).
+
+    Author: Julien M. (https://github.com/guts)
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import argparse
+import logging
+from os import getenv
+from pathlib import Path
+
+# submodules
+from qgis_deployment_toolbelt.utils.bouncer import exit_cli_error, exit_cli_success
+from qgis_deployment_toolbelt.utils.cache_manager import QdtCacheManager, parse_size
+from qgis_deployment_toolbelt.utils.formatters import convert_octets
+
+# #############################################################################
+# ########## Globals ###############
+# ##################################
+
+logger = logging.getLogger(__name__)
+
+# ############################################################################
+# ########## CLI #################
+# ################################
+
+
+def parser_cache(
+    subparser: argparse.ArgumentParser,
+) -> argparse.ArgumentParser:
+    """Set the argument parser for the cache subcommand.
+
+    Args:
+        subparser (argparse.ArgumentParser): parser to set up
+
+    Returns:
+        argparse.ArgumentParser: parser ready to use
+    """
+    subparser.add_argument(
+        "action",
+        help="Action to perform. prune: evict the least recently used entries until "
+        "the cache fits its budget.",
+        choices=("prune",),
+    )
+
+    subparser.add_argument(
+        "-m",
+        "--max-size",
+        help="Cache budget: a number of bytes or a number followed by a unit (K, M, "
+        "G, T), i.e. 2G.",
+        default=getenv("QDT_CACHE_MAX_SIZE"),
+        type=str,
+        dest="max_size",
+    )
+
+    subparser.add_argument(
+        "-w",
+        "--work-dir",
+        help="QDT working directory to manage. Defaults to the one used by deploy.",
+        default=None,
+        type=Path,
+        dest="working_directory",
+    )
+
+    subparser.add_argument(
+        "--dry-run",
+        help="List the entries which would be evicted, without removing them.",
+        action="store_true",
+        dest="opt_dry_run",
+    )
+
+    subparser.set_defaults(func=run)
+
+    return subparser
+
+
+# ############################################################################
+# ########## MAIN ################
+# ################################
+
+
+def run(args: argparse.Namespace):
+    """Run the sub command logic.
+
+    Prune the local cache down to its budget.
+
+    Args:
+        args (argparse.Namespace): arguments passed to the subcommand
+    """
+    logger.debug(f"Running {args.command} {args.action} with {args}")
+
+    if not args.max_size:
+        exit_cli_error(
+            "No cache budget set. Use --max-size or the QDT_CACHE_MAX_SIZE "
+            "environment variable."
+        )
+        return
+    try:
+        max_size = parse_size(args.max_size)
+    except ValueError as err:
+        exit_cli_error(err)
+        return
+
+    cache_manager = QdtCacheManager(working_directory=args.working_directory)
+    evicted, cache_size = cache_manager.prune(
+        max_size=max_size, dry_run=args.opt_dry_run
+    )
+    for entry in evicted:
+        print(f"{entry.kind}\t{convert_octets(entry.size)}\t{entry.path}")
+
+    exit_cli_success(
+        f"{len(evicted)} cache entries "
+        f"{'would be evicted' if args.opt_dry_run else 'evicted'}. Cache size: "
+        f"{convert_octets(cache_size)} / {convert_octets(max_size)}."
+    )
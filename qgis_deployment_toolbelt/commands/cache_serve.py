@@ -0,0 +1,250 @@
+#! python3  # noqa: E265
+
+"""
+    Sub-command exposing the plugins archives of the local QDT working directory over
+    HTTP, so that a machine can act as a LAN cache for others.
+
+    Author: Julien M. (https://github.com/guts)
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import argparse
+import logging
+import mimetypes
+import os
+from email.utils import formatdate
+from functools import partial
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from os import getenv
+from pathlib import Path, PurePosixPath
+from shutil import copyfileobj
+from urllib.parse import unquote, urlsplit
+
+# submodules
+from qgis_deployment_toolbelt.__about__ import __title_clean__, __version__
+from qgis_deployment_toolbelt.constants import get_qdt_working_directory
+from qgis_deployment_toolbelt.utils.bouncer import exit_cli_error, exit_cli_normal
+from qgis_deployment_toolbelt.utils.cache_peers import (
+    get_cache_served_folders,
+    is_servable_path,
+)
+
+# #############################################################################
+# ########## Globals ###############
+# ##################################
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SERVER_HOST: str = "127.0.0.1"
+DEFAULT_CACHE_SERVER_PORT: int = 8765
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class QdtCacheRequestHandler(BaseHTTPRequestHandler):
+    """Serve plugins archives of the QDT working directory, read-only, with ETag and
+    Last-Modified validators."""
+
+    server_version = f"{__title_clean__}/{__version__}"
+
+    def __init__(self, *args, served_folders: dict[str, Path], **kwargs) -> None:
+        """Object instanciation.
+
+        Args:
+            served_folders (dict[str, Path]): URL prefix and matching local folder
+        """
+        self.served_folders = served_folders
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self) -> None:
+        """Serve a file."""
+        self._serve(with_body=True)
+
+    def do_HEAD(self) -> None:
+        """Serve file headers only."""
+        self._serve(with_body=False)
+
+    def _resolve_local_path(self) -> Path | None:
+        """Map the request path to a local file, refusing anything outside the served
+            folders, in a hidden folder or which is not a plugin archive.
+
+        Returns:
+            Path | None: local file path or None if not found or not allowed
+        """
+        url_path = unquote(urlsplit(self.path).path).strip("/")
+        prefix, _, relative_path = url_path.partition("/")
+        served_folder = self.served_folders.get(prefix)
+        if served_folder is None or not is_servable_path(PurePosixPath(relative_path)):
+            return None
+
+        served_folder = Path(os.path.realpath(served_folder))
+        local_path = Path(os.path.realpath(served_folder / relative_path))
+        if not local_path.is_relative_to(served_folder) or not local_path.is_file():
+            return None
+
+        return local_path
+
+    def _serve(self, with_body: bool) -> None:
+        """Send the response for the requested file.
+
+        Args:
+            with_body (bool): send file content or only headers
+        """
+        local_path = self._resolve_local_path()
+        if local_path is None:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        file_stat = local_path.stat()
+        etag = f'"{file_stat.st_size:x}-{file_stat.st_mtime_ns:x}"'
+        if etag in {
+            tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")
+        }:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header(
+            "Content-Type",
+            mimetypes.guess_type(local_path.name)[0] or "application/octet-stream",
+        )
+        self.send_header("Content-Length", str(file_stat.st_size))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", formatdate(file_stat.st_mtime, usegmt=True))
+        self.end_headers()
+
+        if with_body:
+            with local_path.open(mode="rb") as served_file:
+                copyfileobj(served_file, self.wfile)
+
+    def log_message(self, format: str, *args) -> None:
+        """Route access logs to the QDT logger instead of stderr."""
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+
+# #############################################################################
+# ####### Functions ###############
+# #################################
+
+
+def create_cache_server(
+    host: str = DEFAULT_CACHE_SERVER_HOST,
+    port: int = DEFAULT_CACHE_SERVER_PORT,
+    working_directory: Path | None = None,
+) -> ThreadingHTTPServer:
+    """Create the cache HTTP server, without starting it.
+
+    Args:
+        host (str, optional): interface to listen on. Defaults to
+            DEFAULT_CACHE_SERVER_HOST (local machine only).
+        port (int, optional): port to listen on. 0 picks a free port. Defaults to
+            DEFAULT_CACHE_SERVER_PORT.
+        working_directory (Path | None, optional): QDT working directory to serve.
+            If None, the current one is used. Defaults to None.
+
+    Returns:
+        ThreadingHTTPServer: server ready to serve_forever
+    """
+    served_folders = get_cache_served_folders(working_directory=working_directory)
+    return ThreadingHTTPServer(
+        (host, port),
+        partial(QdtCacheRequestHandler, served_folders=served_folders),
+    )
+
+
+# ############################################################################
+# ########## CLI #################
+# ################################
+
+
+def parser_cache_serve(
+    subparser: argparse.ArgumentParser,
+) -> argparse.ArgumentParser:
+    """Set the argument parser subcommand.
+
+    Args:
+        subparser (argparse.ArgumentParser): parser to set up
+
+    Returns:
+        argparse.ArgumentParser: parser ready to use
+    """
+    subparser.add_argument(
+        "--host",
+        help="Network interface to listen on. Defaults to the local machine only: "
+        "use 0.0.0.0 to serve the LAN.",
+        default=getenv("QDT_CACHE_SERVE_HOST", DEFAULT_CACHE_SERVER_HOST),
+        dest="host",
+    )
+
+    subparser.add_argument(
+        "-p",
+        "--port",
+        help="Port to listen on.",
+        default=int(getenv("QDT_CACHE_SERVE_PORT", DEFAULT_CACHE_SERVER_PORT)),
+        type=int,
+        dest="port",
+    )
+
+    subparser.add_argument(
+        "-w",
+        "--work-dir",
+        help="QDT working directory whose plugins archives are served. Defaults to "
+        "the one used by deploy.",
+        default=None,
+        type=Path,
+        dest="working_directory",
+    )
+
+    subparser.set_defaults(func=run)
+
+    return subparser
+
+
+# ############################################################################
+# ########## MAIN ################
+# ################################
+
+
+def run(args: argparse.Namespace):
+    """Run the sub command logic.
+
+    Serve the plugins archives of the QDT working directory until interrupted.
+
+    Args:
+        args (argparse.Namespace): arguments passed to the subcommand
+    """
+    logger.debug(f"Running {args.command} with {args}")
+
+    working_directory = get_qdt_working_directory(specific_value=args.working_directory)
+    try:
+        server = create_cache_server(
+            host=args.host, port=args.port, working_directory=working_directory
+        )
+    except OSError as err:
+        exit_cli_error(err)
+        return
+
+    served_folders = ", ".join(
+        str(folder) for folder in get_cache_served_folders(working_directory).values()
+    )
+    print(
+        f"Serving QDT cache on http://{args.host}:{server.server_port}/ "
+        f"({served_folders}). Press Ctrl+C to stop."
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+    exit_cli_normal("QDT cache server stopped.")
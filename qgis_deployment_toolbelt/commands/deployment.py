@@ -24,10 +24,26 @@ from qgis_deployment_toolbelt.constants import (
     get_qdt_working_directory,
 )
 from qgis_deployment_toolbelt.jobs import JobsOrchestrator
+from qgis_deployment_toolbelt.jobs.run_context import RunContext
+from qgis_deployment_toolbelt.profiles.git_mirror import GIT_MIRRORS_REGISTRY
 from qgis_deployment_toolbelt.scenarios import ScenarioReader
 from qgis_deployment_toolbelt.utils.bouncer import exit_cli_error, exit_cli_success
+from qgis_deployment_toolbelt.utils.cache_manager import (
+    CACHE_USAGE,
+    QdtCacheManager,
+    parse_size,
+)
 from qgis_deployment_toolbelt.utils.check_path import check_path
-from qgis_deployment_toolbelt.utils.file_downloader import download_remote_file_to_local
+from qgis_deployment_toolbelt.utils.file_downloader import (
+    DOWNLOADS_REGISTRY,
+    download_remote_file_to_local,
+)
+from qgis_deployment_toolbelt.utils.network_scheduler import (
+    apply_host_jitter,
+    reset_host_jitter,
+)
+from qgis_deployment_toolbelt.utils.proxies import clear_proxy_caches
+from qgis_deployment_toolbelt.utils.run_metrics import RUN_METRICS
 from qgis_deployment_toolbelt.utils.slugger import sluggy
 from qgis_deployment_toolbelt.utils.str2bool import str2bool
 
@@ -68,7 +84,10 @@ def get_remote_scenario_from_url(remote_url: str) -> Path:
             f" Trace: {err}. Fallback to default: {local_filepath_for_remote_scenario}"
         )
 
-    return download_remote_file_to_local(
+    # spread the fleet before hitting the network
+    apply_host_jitter(phase_name="remote scenario download")
+
+    remote_scenario_path = download_remote_file_to_local(
         remote_url_to_download=remote_url,
         local_file_path=Path(
             get_qdt_working_directory().parent,
@@ -76,6 +95,30 @@ def get_remote_scenario_from_url(remote_url: str) -> Path:
         ),
         use_stream=str2bool(getenv("QDT_STREAMED_DOWNLOADS", True)),
     )
+    CACHE_USAGE.touch(remote_scenario_path)
+
+    return remote_scenario_path
+
+
+def prune_cache(working_directory: Path) -> None:
+    """Record the cache entries referenced by the deployment and, if a budget is set
+        (QDT_CACHE_MAX_SIZE), evict the least recently used ones. Entries referenced
+        by the deployment are kept. Failures are logged without failing the
+        deployment.
+
+    Args:
+        working_directory (Path): QDT working directory
+    """
+    references = CACHE_USAGE.snapshot()
+    try:
+        cache_manager = QdtCacheManager(working_directory=working_directory)
+        cache_manager.save_usage(references=references)
+        if cache_max_size := getenv("QDT_CACHE_MAX_SIZE"):
+            cache_manager.prune(
+                max_size=parse_size(cache_max_size), protected=references
+            )
+    except (OSError, ValueError) as err:
+        logger.error(f"Pruning the local cache failed. Trace: {err}")
 
 
 # ############################################################################
@@ -121,6 +164,14 @@ def run(args: argparse.Namespace):
     """
     logger.debug(f"Running {args.command} with {args}")
 
+    # jitter is applied once per run, before the first network phase
+    reset_host_jitter()
+    # downloads are deduplicated per run
+    DOWNLOADS_REGISTRY.clear()
+    GIT_MIRRORS_REGISTRY.clear()
+    RUN_METRICS.reset()
+    CACHE_USAGE.reset()
+
     # check if scenario file is local or remote
     if isinstance(args.scenario_filepath, str) and args.scenario_filepath.startswith(
         ("http",)
@@ -176,6 +227,8 @@ def run(args: argparse.Namespace):
             environ[f"QDT_{var}"] = str(value)
         else:
             logger.debug(f"Ignored None value: {var}.")
+    # scenario settings may change the proxy configuration
+    clear_proxy_caches()
 
     qdt_local_working_folder = get_qdt_working_directory(
         specific_value=scenario.settings.get("LOCAL_QDT_WORKDIR"),
@@ -187,6 +240,8 @@ def run(args: argparse.Namespace):
     # -- STEPS JOBS
     steps_ok: list = []
     orchestrator: JobsOrchestrator = JobsOrchestrator()
+    # operating system configuration, rules context and folders shared by the jobs
+    run_context = RunContext()
 
     # filter out unrecognized jobs
     logger.debug("Filtering valid steps in scenario...")
@@ -202,11 +257,17 @@ def run(args: argparse.Namespace):
         logger.info(f"Running step: {step.get('uses')}")
         try:
             job = orchestrator.init_job_class_from_id(
-                job_id=step.get("uses"), options=step.get("with")
+                job_id=step.get("uses"),
+                options=step.get("with"),
+                run_context=run_context,
             )
             job.run()
         except Exception as err:
             exit_cli_error(err)
 
+    # keep the local cache within its budget
+    prune_cache(working_directory=run_context.qdt_working_folder)
+
     # exit nicely
+    RUN_METRICS.log_summary()
     exit_cli_success("Deployment achieved!")
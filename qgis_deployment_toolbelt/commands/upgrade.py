@@ -22,7 +22,6 @@ from urllib.parse import urlsplit, urlunsplit
 
 # 3rd party library
 import requests
-from packaging.version import Version
 
 # submodules
 from qgis_deployment_toolbelt.__about__ import (
@@ -40,6 +39,7 @@ from qgis_deployment_toolbelt.utils.bouncer import (
 from qgis_deployment_toolbelt.utils.file_downloader import download_remote_file_to_local
 from qgis_deployment_toolbelt.utils.proxies import get_proxy_settings
 from qgis_deployment_toolbelt.utils.str2bool import str2bool
+from qgis_deployment_toolbelt.utils.versions import version_key
 
 # #############################################################################
 # ########## Globals ###############
@@ -221,7 +221,7 @@ def run(args: argparse.Namespace):
 
     # compare it
     latest_version: str = latest_release.get("tag_name")
-    if Version(version=actual_version) < Version(version=latest_version):
+    if version_key(actual_version) < version_key(latest_version):
         print(f"A newer version is available: {latest_version}")
         if args.opt_show_release_notes:
             print(latest_release.get("body"))
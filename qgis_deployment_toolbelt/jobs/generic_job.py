@@ -12,26 +12,24 @@
 # ##################################
 
 # Standard library
+import json
 import logging
 from functools import lru_cache
-from os import getenv
 from pathlib import Path
 
 # 3rd party
 from python_rule_engine import RuleEngine
 
 # package
-from qgis_deployment_toolbelt.constants import (
-    OSConfiguration,
-    get_qdt_working_directory,
-)
 from qgis_deployment_toolbelt.exceptions import (
     JobOptionBadName,
     JobOptionBadValue,
     JobOptionBadValueType,
 )
+from qgis_deployment_toolbelt.jobs.run_context import RunContext
+from qgis_deployment_toolbelt.profiles.profiles_finder import find_profiles_json
 from qgis_deployment_toolbelt.profiles.qdt_profile import QdtProfile
-from qgis_deployment_toolbelt.profiles.rules_context import QdtRulesContext
+from qgis_deployment_toolbelt.utils.cache_manager import CACHE_USAGE
 
 # #############################################################################
 # ########## Globals ###############
@@ -40,6 +38,11 @@ from qgis_deployment_toolbelt.profiles.rules_context import QdtRulesContext
 # logs
 logger = logging.getLogger(__name__)
 
+# paths changed in downloaded repositories and not yet synchronized, stored next to
+# the downloaded repositories folder (which may be a git working tree), suffixing its
+# name
+CHANGED_PATHS_MANIFEST_SUFFIX: str = ".qdt_changed_paths.json"
+
 # #############################################################################
 # ########## Classes ###############
 # ##################################
@@ -51,36 +54,35 @@ class GenericJob:
     ID: str = ""
     OPTIONS_SCHEMA: dict[dict] = dict(dict())
 
-    def __init__(self) -> None:
-        """Object instanciation."""
+    def __init__(self, run_context: RunContext | None = None) -> None:
+        """Object instanciation.
+
+        Args:
+            run_context (RunContext | None, optional): environment shared by the jobs
+                of the run. If None, a new one is created. Defaults to None.
+        """
+        self.run_context = run_context or RunContext()
+
         # operating system configuration
-        self.os_config = OSConfiguration.from_opersys()
-        self.qdt_rules_context = QdtRulesContext()
+        self.os_config = self.run_context.os_config
+        self.qdt_rules_context = self.run_context.qdt_rules_context
 
         # local QDT folders
-        self.qdt_working_folder = get_qdt_working_directory()
-        if not self.qdt_working_folder.exists():
-            logger.info(
-                f"QDT downloaded folder not found: {self.qdt_working_folder}. "
-                "Creating it to properly run the job."
-            )
-            self.qdt_working_folder.mkdir(parents=True, exist_ok=True)
-        logger.debug(f"QDT working folder: {self.qdt_working_folder}")
-
-        self.qdt_downloaded_repositories = self.qdt_working_folder.joinpath(
-            f"repositories/{getenv('QDT_TMP_RUNNING_SCENARIO_ID', 'default')}"
-        )
+        self.qdt_working_folder = self.run_context.qdt_working_folder
+        self.qdt_downloaded_repositories = self.run_context.qdt_downloaded_repositories
         self.qdt_plugins_folder = self.qdt_working_folder.joinpath("plugins")
+        self.qdt_plugins_repositories_index_folder = self.qdt_working_folder.joinpath(
+            "plugins_repositories_index"
+        )
+        self.qdt_plugins_installed_inventory_folder = self.qdt_working_folder.joinpath(
+            "plugins_installed_inventory"
+        )
+        self.qdt_plugins_quarantine_folder = self.qdt_working_folder.joinpath(
+            "plugins_quarantine"
+        )
 
         # destination profiles folder
         self.qgis_profiles_path: Path = self.os_config.qgis_profiles_path
-        if not self.qgis_profiles_path.exists():
-            logger.info(
-                f"Installed QGIS profiles folder not found: {self.qgis_profiles_path}. "
-                "Creating it to properly run the job."
-            )
-            self.qgis_profiles_path.mkdir(parents=True)
-        logger.debug(f"Installed QGIS profiles folder: {self.qgis_profiles_path}")
 
     def list_downloaded_profiles(self) -> tuple[QdtProfile] | None:
         """List downloaded QGIS profiles, i.e. a profile's folder located into the QDT
@@ -92,10 +94,111 @@ class GenericJob:
             tuple[QdtProfile] | None: tuple of profiles objects or None if no profile
                 folder listed
         """
+        CACHE_USAGE.touch(self.qdt_downloaded_repositories)
         return self.filter_profiles_folder(
             start_parent_folder=self.qdt_downloaded_repositories
         )
 
+    @property
+    def changed_paths_manifest_path(self) -> Path:
+        """Path to the file storing paths changed in the downloaded repositories. It's
+            kept out of the downloaded repositories folder, so it's never seen as an
+            untracked file of a git working tree.
+
+        Returns:
+            Path: path to the changed paths manifest
+        """
+        return self.qdt_downloaded_repositories.with_name(
+            f"{self.qdt_downloaded_repositories.name}{CHANGED_PATHS_MANIFEST_SUFFIX}"
+        )
+
+    def list_changed_paths(self) -> set[str] | None:
+        """List paths changed in the downloaded repositories since the last profiles
+            synchronization, relative to the downloaded repositories folder.
+
+        Returns:
+            set[str] | None: changed paths (POSIX style) or None if unknown, meaning
+                that everything must be considered as changed
+        """
+        manifest_path = self.changed_paths_manifest_path
+        try:
+            changed_paths = json.loads(manifest_path.read_text(encoding="UTF-8")).get(
+                "paths"
+            )
+        except (OSError, ValueError, AttributeError) as err:
+            logger.debug(f"Changed paths are unknown. Trace: {err}")
+            return None
+
+        return None if changed_paths is None else set(changed_paths)
+
+    def record_changed_paths(
+        self, destination: Path, changed_paths: tuple[str, ...] | None
+    ) -> None:
+        """Add paths changed by a download to the ones not yet synchronized.
+
+        Args:
+            destination (Path): folder where the repository has been downloaded, within
+                the downloaded repositories folder
+            changed_paths (tuple[str, ...] | None): paths changed, relative to
+                destination. None if unknown, i.e. after a fresh clone.
+        """
+        pending_paths = self.list_changed_paths()
+        if pending_paths is not None and changed_paths is not None:
+            prefix = destination.resolve().relative_to(
+                self.qdt_downloaded_repositories.resolve()
+            )
+            pending_paths.update(
+                (prefix / changed_path).as_posix() for changed_path in changed_paths
+            )
+        else:
+            pending_paths = None
+
+        self.write_changed_paths(changed_paths=pending_paths)
+
+    def write_changed_paths(self, changed_paths: set[str] | None) -> None:
+        """Store paths changed in the downloaded repositories and not yet synchronized.
+
+        Args:
+            changed_paths (set[str] | None): changed paths. An empty set once profiles
+                are synchronized, None if unknown.
+        """
+        manifest_path = self.changed_paths_manifest_path
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        manifest_path.write_text(
+            json.dumps(
+                {"paths": None if changed_paths is None else sorted(changed_paths)},
+                indent=4,
+            ),
+            encoding="UTF-8",
+        )
+
+    def list_changed_downloaded_profiles(
+        self, downloaded_profiles: tuple[QdtProfile, ...]
+    ) -> tuple[QdtProfile, ...] | None:
+        """Filter downloaded profiles on those with changed files since the last
+            profiles synchronization.
+
+        Args:
+            downloaded_profiles (tuple[QdtProfile, ...]): downloaded profiles
+
+        Returns:
+            tuple[QdtProfile, ...] | None: changed profiles or None if unknown
+        """
+        changed_paths = self.list_changed_paths()
+        if changed_paths is None:
+            return None
+
+        downloaded_root = self.qdt_downloaded_repositories.resolve()
+        changed_profiles = []
+        for profile in downloaded_profiles:
+            profile_prefix = (
+                f"{profile.folder.resolve().relative_to(downloaded_root).as_posix()}/"
+            )
+            if any(path.startswith(profile_prefix) for path in changed_paths):
+                changed_profiles.append(profile)
+
+        return tuple(changed_profiles)
+
     def list_installed_profiles(self) -> tuple[QdtProfile] | None:
         """List installed QGIS profiles, i.e. a profile's folder located into the QGIS
             profiles path and so accessible to the end-user through the QGIS interface.
@@ -111,7 +214,12 @@ class GenericJob:
     def filter_profiles_folder(
         self, start_parent_folder: Path
     ) -> tuple[QdtProfile, ...] | None:
-        """Parse a folder structure to filter on QGIS profiles folders.
+        """Parse a folder structure to filter on QGIS profiles folders. Only the known
+            profiles layout depth is walked through, skipping plugins, logs and git
+            folders.
+
+        Args:
+            start_parent_folder (Path): folder to start searching from
 
         Returns:
             tuple[QdtProfile] | None: tuple of profiles objects matching criteria or
@@ -120,7 +228,7 @@ class GenericJob:
         # first, try to get folders containing a profile.json
         li_qgis_qdt_profiles: list[QdtProfile] = [
             QdtProfile.from_json(profile_json_path=f, profile_folder=f.parent)
-            for f in start_parent_folder.glob("**/profile.json")
+            for f in find_profiles_json(start_parent_folder=start_parent_folder)
         ]
 
         if not len(li_qgis_qdt_profiles):
@@ -180,7 +288,7 @@ class GenericJob:
             )
             try:
                 engine = RuleEngine(rules=profile.rules)
-                results = engine.evaluate(obj=self.qdt_rules_context.to_dict())
+                results = engine.evaluate(obj=self.run_context.rules_context_dict)
                 if len(results) == len(profile.rules):
                     logger.debug(
                         f"Profile '{profile.name}' matches {len(profile.rules)} "
@@ -20,6 +20,7 @@ from sys import platform as opersys
 
 # package
 from qgis_deployment_toolbelt.jobs.generic_job import GenericJob
+from qgis_deployment_toolbelt.jobs.run_context import RunContext
 from qgis_deployment_toolbelt.utils.check_path import (
     check_path_exists,
     check_var_can_be_path,
@@ -97,14 +98,18 @@ class JobEnvironmentVariables(GenericJob):
         },
     }
 
-    def __init__(self, options: list[dict]) -> None:
+    def __init__(
+        self, options: list[dict], run_context: RunContext | None = None
+    ) -> None:
         """Instantiate the class.
         Args:
             options (List[dict]): list of dictionary with environment variables to set
             or remove.
+            run_context (RunContext | None, optional): environment shared by the
+                jobs of the run. Defaults to None: a new one is created.
         """
 
-        super().__init__()
+        super().__init__(run_context=run_context)
         self.options: list[dict] = [self.validate_options(opt) for opt in options]
 
     def run(self) -> None:
@@ -13,17 +13,28 @@
 
 # Standard library
 import logging
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from os import getenv
+from os.path import expandvars
 from pathlib import Path
-from shutil import copy2
 
 # package
 from qgis_deployment_toolbelt.__about__ import __title_clean__
 from qgis_deployment_toolbelt.jobs.generic_job import GenericJob
+from qgis_deployment_toolbelt.jobs.run_context import RunContext
+from qgis_deployment_toolbelt.plugins.archives_index import PluginsArchivesIndex
+from qgis_deployment_toolbelt.plugins.installer import check_plugin_archive
 from qgis_deployment_toolbelt.plugins.plugin import QgisPlugin
-from qgis_deployment_toolbelt.utils.check_path import check_path
+from qgis_deployment_toolbelt.plugins.repository_index import (
+    resolve_plugins_from_repositories,
+)
+from qgis_deployment_toolbelt.utils.cache_manager import CACHE_USAGE
 from qgis_deployment_toolbelt.utils.file_downloader import download_remote_file_to_local
+from qgis_deployment_toolbelt.utils.network_scheduler import apply_host_jitter
+from qgis_deployment_toolbelt.utils.shared_cache import (
+    SharedFileCache,
+    copy_file_if_changed,
+)
 from qgis_deployment_toolbelt.utils.str2bool import str2bool
 
 # #############################################################################
@@ -62,18 +73,31 @@ class JobPluginsDownloader(GenericJob):
         },
     }
 
-    def __init__(self, options: dict) -> None:
+    def __init__(self, options: dict, run_context: RunContext | None = None) -> None:
         """Instantiate the class.
 
         :param dict options:  job options.
+        :param RunContext run_context: environment shared by the jobs of the run.
+            Defaults to None: a new one is created.
         """
-        super().__init__()
+        super().__init__(run_context=run_context)
         self.options: dict = self.validate_options(options)
 
         # where QDT downloads plugins
         self.qdt_plugins_folder.mkdir(exist_ok=True, parents=True)
         logger.info(f"QDT plugins folder: {self.qdt_plugins_folder}")
 
+        # optional cache shared between machines (i.e. a network share)
+        self.shared_cache: SharedFileCache | None = None
+        if shared_cache_folder := getenv("QDT_PLUGINS_SHARED_CACHE"):
+            self.shared_cache = SharedFileCache(
+                cache_folder=Path(expandvars(shared_cache_folder)).expanduser()
+            )
+            logger.info(
+                f"Plugins shared cache: {self.shared_cache.cache_folder}. It will be "
+                "looked up before downloading plugins."
+            )
+
     def run(self) -> None:
         """Execute job logic."""
         # list plugins through different profiles
@@ -86,121 +110,75 @@ class JobPluginsDownloader(GenericJob):
             )
             return
 
+        # referenced archives are kept when the cache is pruned
+        for plugin in qdt_referenced_plugins:
+            CACHE_USAGE.touch(
+                Path(self.qdt_plugins_folder, f"{plugin.id_with_version}.zip")
+            )
+
         # filter plugins to download, filtering out those which are not already present locally
         if self.options.get("force") is True:
-            qdt_plugins_to_download = qdt_referenced_plugins
-            qdt_plugins_to_copy = []
+            # local archives are still compared on their size and modification time
+            # before being copied
+            qdt_plugins_to_fetch = qdt_referenced_plugins
         else:
-            qdt_plugins_to_download = self.filter_list_downloadable_plugins(
-                input_list=qdt_referenced_plugins
-            )
-            qdt_plugins_to_copy = self.filter_list_copiable_plugins(
+            qdt_plugins_to_fetch = self.filter_list_downloadable_plugins(
                 input_list=qdt_referenced_plugins
-            )
-            if not len(qdt_plugins_to_download + qdt_plugins_to_copy):
+            ) + self.filter_list_copiable_plugins(input_list=qdt_referenced_plugins)
+            if not len(qdt_plugins_to_fetch):
                 logger.info(
                     f"All referenced plugins are already present in {self.qdt_plugins_folder}. "
                     "Skipping download/copy step."
                 )
                 return
 
-        # launch download
-        if len(qdt_plugins_to_download):
-            downloaded_plugins, failed_downloads = self.download_remote_plugins(
-                plugins_to_download=qdt_plugins_to_download,
-                destination_parent_folder=self.qdt_plugins_folder,
-                threads=self.options.get("threads", 5),
+        # launch download and copy, in the same pool
+        if any(plugin.location != "local" for plugin in qdt_plugins_to_fetch):
+            # spread the fleet before hitting the network
+            apply_host_jitter(phase_name=self.ID)
+        downloaded_plugins, failed_downloads = self.download_remote_plugins(
+            plugins_to_download=qdt_plugins_to_fetch,
+            destination_parent_folder=self.qdt_plugins_folder,
+            threads=self.options.get("threads", 5),
+        )
+        logger.debug(f"{len(downloaded_plugins)} plugins downloaded or copied.")
+        if len(failed_downloads):
+            logger.error(
+                f"{len(failed_downloads)} failed plugin downloads or copies. "
+                "Check previous log lines."
             )
-            logger.debug(f"{len(downloaded_plugins)} plugins downloaded.")
-            if len(failed_downloads):
-                logger.error(
-                    f"{len(failed_downloads)} failed plugin downloads. "
-                    "Check previous log lines."
-                )
 
-        if len(qdt_plugins_to_copy):
-            copied_plugins, failed_copies = self.copy_plugins(
-                plugins_to_copy=qdt_plugins_to_copy,
-                destination_parent_folder=self.qdt_plugins_folder,
-            )
-            logger.debug(f"{len(copied_plugins)} plugins copied.")
-            if len(failed_copies):
-                logger.error(
-                    f"{len(failed_copies)} failed plugin copies. "
-                    "Check previous log lines."
-                )
+        # read new archives metadata once, for the jobs using them afterwards
+        PluginsArchivesIndex(plugins_folder=self.qdt_plugins_folder).update()
 
         logger.debug(f"Job {self.ID} ran successfully.")
 
-    def copy_plugins(
-        self, plugins_to_copy: list[QgisPlugin], destination_parent_folder: Path
-    ) -> tuple[list[QgisPlugin], list[QgisPlugin]]:
-        """Copy listed plugins into the specified folder.
+    def copy_plugin(self, plugin: QgisPlugin, plugin_destination_path: Path) -> Path:
+        """Copy a plugin archive from local disk or network, straight to its final
+            name through a temporary file.
 
         Args:
-            plugins_to_copy (List[QgisPlugin]): list of plugins to copy
-            destination_parent_folder (Path): where to store copied plugins
+            plugin (QgisPlugin): plugin to copy
+            plugin_destination_path (Path): local path where to store the archive
 
         Returns:
-            Tuple[List[QgisPlugin],List[QgisPlugin]]: tuple of (copied plugins, failed copies)
+            Path: local path to the copied archive
         """
-        copied_plugins: list[QgisPlugin] = []
-        failed_plugins: list[QgisPlugin] = []
-
-        logger.debug(
-            f"Copying {len(plugins_to_copy)} plugins into {destination_parent_folder}."
-        )
-        for plugin in plugins_to_copy:
-            # check if source plugin can be accessed
-            try:
-                check_path(
-                    input_path=plugin.url,
-                    must_be_a_file=True,
-                    must_be_readable=True,
-                    must_be_a_folder=False,
-                    must_exists=True,
-                )
-                src_plugin_path = Path(plugin.url)
-            except Exception as err:
-                logger.error(
-                    f"The plugin '{plugin.name}' can't be copied from {plugin.url}. "
-                    f"Trace: {err}."
-                )
-                failed_plugins.append(plugin)
-                continue
-
-            # try to copy
-            try:
-                dst_plugin_path = destination_parent_folder / src_plugin_path.name
-                copy2(src=src_plugin_path, dst=destination_parent_folder)
-                logger.info(
-                    f"Plugin {plugin.name} has been copied from {src_plugin_path} "
-                    f"to {dst_plugin_path}"
-                )
-                check_path(
-                    input_path=dst_plugin_path,
-                    must_be_a_file=True,
-                    must_exists=True,
-                    raise_error=True,
-                )
-
-                dst_plugin_path_final = dst_plugin_path.rename(
-                    dst_plugin_path.with_name(f"{plugin.id_with_version}.zip")
-                )
-                logger.debug(
-                    f"Plugin ZIP archive has been renamed from '{dst_plugin_path}' "
-                    f"into '{dst_plugin_path_final}' to make it consistent with sync."
-                )
-
-                copied_plugins.append(plugin)
-            except Exception as err:
-                logger.error(
-                    f"Copy of plugin {plugin.name} from {plugin.url} failed. Trace: {err}"
-                )
-                failed_plugins.append(plugin)
-                continue
+        src_plugin_path = Path(plugin.url).expanduser()
+        if copy_file_if_changed(
+            source_path=src_plugin_path, destination_path=plugin_destination_path
+        ):
+            logger.info(
+                f"Plugin {plugin.name} has been copied from {src_plugin_path} "
+                f"to {plugin_destination_path}"
+            )
+        else:
+            logger.debug(
+                f"Plugin {plugin.name} is unchanged since the last copy from "
+                f"{src_plugin_path}."
+            )
 
-        return copied_plugins, failed_plugins
+        return plugin_destination_path
 
     def download_remote_plugins(
         self,
@@ -209,6 +187,7 @@ class JobPluginsDownloader(GenericJob):
         threads: int = 5,
     ) -> tuple[list[QgisPlugin], list[QgisPlugin]]:
         """Download listed plugins into the specified folder, using multithreads or not.
+            Plugins stored locally (location: local) are copied by the same workers.
 
         Args:
             plugins_to_download (List[QgisPlugin]): list of plugins to download
@@ -233,15 +212,8 @@ class JobPluginsDownloader(GenericJob):
                     destination_parent_folder, f"{plugin.id_with_version}.zip"
                 )
                 try:
-                    download_remote_file_to_local(
-                        local_file_path=plugin_download_path,
-                        remote_url_to_download=plugin.download_url,
-                        content_type="application/zip, application/x-zip-compressed, application/octet-stream, multipart/x-zip",
-                        use_stream=str2bool(getenv("QDT_STREAMED_DOWNLOADS", True)),
-                    )
-                    logger.info(
-                        f"Plugin {plugin.name} from {plugin.download_url} "
-                        f"downloaded in {plugin_download_path}"
+                    self.fetch_plugin(
+                        plugin=plugin, plugin_download_path=plugin_download_path
                     )
                     downloaded_plugins.append(plugin)
                 except Exception as err:
@@ -257,30 +229,157 @@ class JobPluginsDownloader(GenericJob):
             with ThreadPoolExecutor(
                 max_workers=threads, thread_name_prefix=f"{__title_clean__}"
             ) as executor:
-                for plugin in plugins_to_download:
-                    # local path
-                    plugin_download_path = Path(
-                        destination_parent_folder, f"{plugin.id_with_version}.zip"
-                    )
-
-                    # submit download to pool
+                future_to_plugin = {
+                    executor.submit(
+                        # func to execute
+                        self.fetch_plugin,
+                        # func parameters
+                        plugin=plugin,
+                        plugin_download_path=Path(
+                            destination_parent_folder, f"{plugin.id_with_version}.zip"
+                        ),
+                    ): plugin
+                    for plugin in plugins_to_download
+                }
+                for future in as_completed(future_to_plugin):
+                    plugin = future_to_plugin[future]
                     try:
-                        executor.submit(
-                            # func to execute
-                            download_remote_file_to_local,
-                            # func parameters
-                            local_file_path=plugin_download_path,
-                            remote_url_to_download=plugin.download_url,
-                            content_type="application/zip, application/x-zip-compressed, application/octet-stream, multipart/x-zip",
-                            use_stream=str2bool(getenv("QDT_STREAMED_DOWNLOADS", True)),
-                        )
+                        future.result()
                         downloaded_plugins.append(plugin)
                     except Exception as err:
-                        logger.error(err)
+                        logger.error(
+                            f"Download of plugin {plugin.name} failed. Trace: {err}"
+                        )
                         failed_plugins.append(plugin)
 
         return downloaded_plugins, failed_plugins
 
+    def fetch_plugin(self, plugin: QgisPlugin, plugin_download_path: Path) -> Path:
+        """Copy a plugin archive stored locally or download a remote one.
+
+        Args:
+            plugin (QgisPlugin): plugin to fetch
+            plugin_download_path (Path): local path where to store the archive
+
+        Returns:
+            Path: local path to the archive
+        """
+        if plugin.location == "local":
+            return self.copy_plugin(
+                plugin=plugin, plugin_destination_path=plugin_download_path
+            )
+
+        plugin_download_path = self.download_plugin(
+            plugin=plugin, plugin_download_path=plugin_download_path
+        )
+        logger.info(
+            f"Plugin {plugin.name} from {plugin.download_url} "
+            f"downloaded in {plugin_download_path}"
+        )
+        return plugin_download_path
+
+    def download_plugin(self, plugin: QgisPlugin, plugin_download_path: Path) -> Path:
+        """Download a plugin archive, through the shared cache if it's enabled.
+
+        Args:
+            plugin (QgisPlugin): plugin to download
+            plugin_download_path (Path): local path where to store the archive
+
+        Returns:
+            Path: local path to the downloaded archive
+        """
+        if self.shared_cache is None:
+            return self.download_plugin_from_origin(
+                plugin=plugin, plugin_download_path=plugin_download_path
+            )
+
+        return self.shared_cache.fetch(
+            file_name=plugin_download_path.name,
+            local_file_path=plugin_download_path,
+            populate=lambda local_file_path: self.download_plugin_from_origin(
+                plugin=plugin, plugin_download_path=local_file_path
+            ),
+        )
+
+    def download_plugin_from_origin(
+        self, plugin: QgisPlugin, plugin_download_path: Path
+    ) -> Path:
+        """Download a plugin archive from its remote URL.
+
+        Args:
+            plugin (QgisPlugin): plugin to download
+            plugin_download_path (Path): local path where to store the archive
+
+        Returns:
+            Path: local path to the downloaded archive
+        """
+        return download_remote_file_to_local(
+            local_file_path=plugin_download_path,
+            remote_url_to_download=plugin.download_url,
+            content_type="application/zip, application/x-zip-compressed, application/octet-stream, multipart/x-zip",
+            use_stream=str2bool(getenv("QDT_STREAMED_DOWNLOADS", True)),
+        )
+
+    def retry_plugins(
+        self, plugins_to_retry: list[QgisPlugin], destination_parent_folder: Path
+    ) -> tuple[list[QgisPlugin], list[QgisPlugin]]:
+        """Fetch again, once, plugins whose archive has been found corrupted. Remote
+            plugins are downloaded from their origin, bypassing the shared cache which
+            may hold the corrupted copy. Valid archives then replace it.
+
+        Args:
+            plugins_to_retry (list[QgisPlugin]): plugins to fetch again
+            destination_parent_folder (Path): where to store fetched plugins
+
+        Returns:
+            tuple[list[QgisPlugin], list[QgisPlugin]]: tuple of \
+                (valid plugins archives, failed plugins)
+        """
+        retried_plugins: list[QgisPlugin] = []
+        failed_plugins: list[QgisPlugin] = []
+
+        for plugin in plugins_to_retry:
+            plugin_destination_path = Path(
+                destination_parent_folder, f"{plugin.id_with_version}.zip"
+            )
+            try:
+                if plugin.location == "remote":
+                    self.download_plugin_from_origin(
+                        plugin=plugin, plugin_download_path=plugin_destination_path
+                    )
+                else:
+                    self.copy_plugin(
+                        plugin=plugin, plugin_destination_path=plugin_destination_path
+                    )
+            except Exception as err:
+                logger.error(
+                    f"Plugin {plugin.name} ({plugin.version}) could not be fetched "
+                    f"again. Trace: {err}"
+                )
+                failed_plugins.append(plugin)
+                continue
+
+            if archive_error := check_plugin_archive(plugin_destination_path):
+                logger.error(
+                    f"Plugin {plugin.name} ({plugin.version}) fetched again from "
+                    f"{plugin.url} is still corrupted: {archive_error}"
+                )
+                failed_plugins.append(plugin)
+                continue
+
+            if self.shared_cache is not None and plugin.location == "remote":
+                self.shared_cache.put(
+                    local_file_path=plugin_destination_path,
+                    file_name=plugin_destination_path.name,
+                )
+            logger.info(
+                f"Plugin {plugin.name} ({plugin.version}) fetched again into "
+                f"{plugin_destination_path}"
+            )
+            retried_plugins.append(plugin)
+
+        return retried_plugins, failed_plugins
+
     def list_referenced_plugins(self, parent_folder: Path) -> list[QgisPlugin] | None:
         """Return a list of plugins referenced in profile.json files found within a \
             parent folder and sorted by unique id with version.
@@ -300,11 +399,20 @@ class JobPluginsDownloader(GenericJob):
             logger.error("No QGIS profile found in the downloaded folder.")
             return
 
-        for qdt_profile in li_qdt_downloaded_profiles:
-            for plugin in qdt_profile.plugins:
-                if plugin.id_with_version not in unique_plugins_identifiers:
-                    unique_plugins_identifiers.append(plugin.id_with_version)
-                    all_profiles.append(plugin)
+        # resolve 'latest' versions and missing URLs from repositories indexes, at once
+        referenced_plugins = resolve_plugins_from_repositories(
+            plugins=(
+                plugin
+                for qdt_profile in li_qdt_downloaded_profiles
+                for plugin in qdt_profile.plugins
+            ),
+            cache_folder=self.qdt_plugins_repositories_index_folder,
+        )
+
+        for plugin in referenced_plugins:
+            if plugin.id_with_version not in unique_plugins_identifiers:
+                unique_plugins_identifiers.append(plugin.id_with_version)
+                all_profiles.append(plugin)
 
         logger.debug(
             f"{len(unique_plugins_identifiers)} unique plugins referenced in "
@@ -13,13 +13,31 @@
 
 # Standard library
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from shutil import ReadError, unpack_archive
+from zipfile import BadZipFile
 
 # package
+from qgis_deployment_toolbelt.__about__ import __title_clean__
 from qgis_deployment_toolbelt.jobs.generic_job import GenericJob
+from qgis_deployment_toolbelt.jobs.job_plugins_downloader import JobPluginsDownloader
+from qgis_deployment_toolbelt.jobs.run_context import RunContext
+from qgis_deployment_toolbelt.plugins.archives_index import PluginsArchivesIndex
+from qgis_deployment_toolbelt.plugins.installed_inventory import (
+    InstalledPluginsInventory,
+)
+from qgis_deployment_toolbelt.plugins.installer import (
+    check_plugins_archives,
+    install_plugin_archive,
+    quarantine_archive,
+    remove_leftovers,
+)
 from qgis_deployment_toolbelt.plugins.plugin import QgisPlugin
+from qgis_deployment_toolbelt.plugins.repository_index import (
+    resolve_plugins_from_repositories,
+)
 from qgis_deployment_toolbelt.profiles.qdt_profile import QdtProfile
+from qgis_deployment_toolbelt.utils.cache_manager import CACHE_USAGE
 
 # #############################################################################
 # ########## Globals ###############
@@ -62,14 +80,23 @@ class JobPluginsSynchronizer(GenericJob):
             "possible_values": None,
             "condition": None,
         },
+        "threads": {
+            "type": int,
+            "required": False,
+            "default": 4,
+            "possible_values": (1, 2, 3, 4, 5),
+            "condition": "in",
+        },
     }
 
-    def __init__(self, options: dict) -> None:
+    def __init__(self, options: dict, run_context: RunContext | None = None) -> None:
         """Instantiate the class.
 
         :param dict options:  job options.
+        :param RunContext run_context: environment shared by the jobs of the run.
+            Defaults to None: a new one is created.
         """
-        super().__init__()
+        super().__init__(run_context=run_context)
         self.options: dict = self.validate_options(options)
 
         # where QDT downloads plugins
@@ -110,6 +137,10 @@ class JobPluginsSynchronizer(GenericJob):
             )
             return
 
+        # metadata of downloaded archives, read once and kept between runs
+        archives_index = PluginsArchivesIndex(plugins_folder=self.qdt_plugins_folder)
+        archives_index.update()
+
         for qdt_profile in qdt_profiles:
             # determine folder
             if self.options.get("installed"):
@@ -117,8 +148,19 @@ class JobPluginsSynchronizer(GenericJob):
             else:
                 profile_plugins_folder = qdt_profile.path_in_qgis / "python/plugins"
 
-            # parse plugins in profile
-            for expected_plugin in qdt_profile.plugins:
+            # installed plugins, read again only if their metadata.txt changed
+            installed_plugins = InstalledPluginsInventory(
+                plugins_folder=profile_plugins_folder,
+                cache_folder=self.qdt_plugins_installed_inventory_folder,
+            )
+            installed_plugins.refresh()
+
+            # parse plugins in profile, resolved from the indexes built by downloader
+            for expected_plugin in resolve_plugins_from_repositories(
+                plugins=qdt_profile.plugins,
+                cache_folder=self.qdt_plugins_repositories_index_folder,
+                offline=True,
+            ):
                 # expected_plugin = expected version to be installed into the profile
 
                 # is the plugin downloaded
@@ -133,12 +175,22 @@ class JobPluginsSynchronizer(GenericJob):
                         f"archive is not found: {plugin_downloaded_zip_source}"
                     )
                     continue
+                CACHE_USAGE.touch(plugin_downloaded_zip_source)
+
+                # the archive tells the folder name, otherwise it's guessed
+                archive_metadata = (
+                    archives_index.get_metadata(
+                        archive_path=plugin_downloaded_zip_source
+                    )
+                    or {}
+                )
 
                 # check if the plugin is already installed or not
-                plugin_installed_folder = Path(
-                    profile_plugins_folder, expected_plugin.installation_folder_name
+                plugin_installed = installed_plugins.get(
+                    folder_name=archive_metadata.get("folder_name")
+                    or expected_plugin.installation_folder_name
                 )
-                if not plugin_installed_folder.is_dir():
+                if plugin_installed is None:
                     logger.debug(
                         f"Profile {qdt_profile.name} - "
                         f"Plugin {expected_plugin.name} is not present. It will be added."
@@ -152,11 +204,6 @@ class JobPluginsSynchronizer(GenericJob):
                     )
                     continue
 
-                # if the plugin is already present into the profile
-                plugin_installed: QgisPlugin = QgisPlugin.from_plugin_folder(
-                    input_plugin_folder=plugin_installed_folder
-                )
-
                 # if the installed plugin has the same version, don't touch anything
                 if plugin_installed.version == expected_plugin.version:
                     logger.debug(
@@ -191,8 +238,9 @@ class JobPluginsSynchronizer(GenericJob):
                 f"{len(qdt_profiles)} profiles parsed."
             )
         else:
-            self.install_plugin_into_profile(profile_plugins_to_create)
-            self.install_plugin_into_profile(profile_plugins_to_upgrade)
+            self.install_plugin_into_profile(
+                profile_plugins_to_create + profile_plugins_to_upgrade
+            )
 
         logger.debug(f"Job {self.ID} ran successfully.")
 
@@ -200,39 +248,175 @@ class JobPluginsSynchronizer(GenericJob):
     def install_plugin_into_profile(
         self, list_plugins_to_profiles: list[tuple[QdtProfile, QgisPlugin, Path]]
     ):
-        """Unzip downloaded plugins into the matching profiles.
+        """Install downloaded plugins into the matching profiles, concurrently.
+
+        Archives are checked first: corrupted ones are quarantined and fetched again
+        once. Each archive is then extracted into a staging folder next to the
+        installed plugin and swapped with it, so a plugin is never half-written nor
+        mixed with files of its previous version.
 
         Args:
             list_plugins_to_profiles (List[Tuple[QdtProfile, QgisPlugin, Path]]): list \
                 of tuples containing the target profile, the plugin object and the ZIP path.
         """
+        install_queue: list[tuple[QdtProfile, QgisPlugin, Path, Path]] = []
+        queued_installs: set[tuple[Path, Path]] = set()
         for profile, plugin, source_path in list_plugins_to_profiles:
             if self.options.get("installed"):
                 profile_plugins_folder = profile.folder / "python/plugins"
             else:
                 profile_plugins_folder = profile.path_in_qgis / "python/plugins"
+            # the same archive is installed once into a given folder
+            if (profile_plugins_folder, source_path) in queued_installs:
+                continue
+            queued_installs.add((profile_plugins_folder, source_path))
+            install_queue.append((profile, plugin, source_path, profile_plugins_folder))
+
+        if not install_queue:
+            return
 
-            # make sure destination folder exists
-            profile_plugins_folder.mkdir(parents=True, exist_ok=True)
-
-            # in some cases related to proxies issues, the plugin archive download
-            # returns a success but in fact it's just some HTML error from the proxy
-            # (but with wrong HTTP error code...) so the ZIP file is not really a zip...
-            try:
-                unpack_archive(filename=source_path, extract_dir=profile_plugins_folder)
-            except ReadError as err:
-                logger.error(
-                    f"Plugin {plugin.name} ({plugin.version}) could not be unzipped nor "
-                    f"installed in profile {profile.name}. Probably because of corrupted "
-                    f"zip file. Is the plugin download worked before? Trace: {err}"
+        # corrupted archives are detected before any installation starts
+        invalid_archives = self.check_archives_before_install(
+            plugins_archives={
+                source_path: plugin for _, plugin, source_path, _ in install_queue
+            }
+        )
+        if invalid_archives:
+            install_queue = [
+                install_item
+                for install_item in install_queue
+                if install_item[2] not in invalid_archives
+            ]
+            if not install_queue:
+                return
+
+        # folders left by an interrupted run, before any installation starts
+        for profile_plugins_folder in {folder for folder, _ in queued_installs}:
+            remove_leftovers(plugins_folder=profile_plugins_folder)
+
+        threads = min(self.options.get("threads", 4), len(install_queue))
+        logger.info(f"Installing {len(install_queue)} plugins in {threads} threads.")
+        with ThreadPoolExecutor(
+            max_workers=threads,
+            thread_name_prefix=f"{__title_clean__}_plugins_install_",
+        ) as executor:
+            futures = [
+                executor.submit(
+                    self._install_plugin,
+                    profile=profile,
+                    plugin=plugin,
+                    source_path=source_path,
+                    profile_plugins_folder=profile_plugins_folder,
                 )
-                continue
+                for profile, plugin, source_path, profile_plugins_folder in install_queue
+            ]
+            count_installed = sum(future.result() for future in as_completed(futures))
 
-            logger.info(
-                f"Profile {profile.name} - "
-                f"Plugin {plugin.name} {plugin.version} has been unzipped from "
-                f"{source_path} to {profile_plugins_folder}"
+        logger.info(f"{count_installed}/{len(install_queue)} plugins installed.")
+
+    def check_archives_before_install(
+        self, plugins_archives: dict[Path, QgisPlugin]
+    ) -> set[Path]:
+        """Check the integrity of plugins archives to install, concurrently. Corrupted
+            archives are quarantined and their plugins fetched again, once, by the
+            plugins downloader.
+
+        Args:
+            plugins_archives (dict[Path, QgisPlugin]): plugins by archive path
+
+        Returns:
+            set[Path]: archives still invalid, which must not be installed
+        """
+        threads = self.options.get("threads", 4)
+        invalid_archives = check_plugins_archives(
+            archives_paths=plugins_archives, max_workers=threads
+        )
+        if not invalid_archives:
+            logger.debug(f"{len(plugins_archives)} plugins archives checked.")
+            return set()
+
+        for archive_path, archive_error in invalid_archives.items():
+            logger.warning(
+                f"Plugin {plugins_archives[archive_path].name} "
+                f"({plugins_archives[archive_path].version}) archive is corrupted: "
+                f"{archive_error}. It will be fetched again."
+            )
+            quarantine_archive(
+                archive_path=archive_path,
+                quarantine_folder=self.qdt_plugins_quarantine_folder,
+            )
+
+        # single retry pass
+        downloader = JobPluginsDownloader(options={}, run_context=self.run_context)
+        _, failed_plugins = downloader.retry_plugins(
+            plugins_to_retry=[
+                plugins_archives[archive_path] for archive_path in invalid_archives
+            ],
+            destination_parent_folder=self.qdt_plugins_folder,
+        )
+
+        still_invalid_archives: set[Path] = set()
+        for plugin in failed_plugins:
+            archive_path = self.qdt_plugins_folder / f"{plugin.id_with_version}.zip"
+            if archive_path.exists():
+                quarantine_archive(
+                    archive_path=archive_path,
+                    quarantine_folder=self.qdt_plugins_quarantine_folder,
+                )
+            logger.error(
+                f"Plugin {plugin.name} ({plugin.version}) will not be installed: its "
+                "archive is still corrupted or missing after a retry."
+            )
+            still_invalid_archives.add(archive_path)
+
+        return still_invalid_archives
+
+    def _install_plugin(
+        self,
+        profile: QdtProfile,
+        plugin: QgisPlugin,
+        source_path: Path,
+        profile_plugins_folder: Path,
+    ) -> bool:
+        """Install a downloaded plugin into a profile plugins folder.
+
+        Args:
+            profile (QdtProfile): target profile
+            plugin (QgisPlugin): plugin to install
+            source_path (Path): path to the plugin archive
+            profile_plugins_folder (Path): profile plugins folder
+
+        Returns:
+            bool: True if the plugin has been installed
+        """
+        # in some cases related to proxies issues, the plugin archive download
+        # returns a success but in fact it's just some HTML error from the proxy
+        # (but with wrong HTTP error code...) so the ZIP file is not really a zip...
+        try:
+            install_plugin_archive(
+                archive_path=source_path, plugins_folder=profile_plugins_folder
             )
+        except BadZipFile as err:
+            logger.error(
+                f"Plugin {plugin.name} ({plugin.version}) could not be unzipped nor "
+                f"installed in profile {profile.name}. Probably because of corrupted "
+                f"zip file. Is the plugin download worked before? Trace: {err}"
+            )
+            return False
+        except (OSError, ValueError) as err:
+            logger.error(
+                f"Plugin {plugin.name} ({plugin.version}) could not be installed in "
+                f"profile {profile.name}. The installed version, if any, is kept. "
+                f"Trace: {err}"
+            )
+            return False
+
+        logger.info(
+            f"Profile {profile.name} - "
+            f"Plugin {plugin.name} {plugin.version} has been unzipped from "
+            f"{source_path} to {profile_plugins_folder}"
+        )
+        return True
 
 
 # #############################################################################
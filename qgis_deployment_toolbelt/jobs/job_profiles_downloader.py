@@ -12,12 +12,28 @@
 # ##################################
 
 # Standard library
+import json
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from urllib.parse import urlsplit
 
 # package
+from qgis_deployment_toolbelt.__about__ import __title_clean__
 from qgis_deployment_toolbelt.jobs.generic_job import GenericJob
+from qgis_deployment_toolbelt.jobs.job_plugins_downloader import JobPluginsDownloader
+from qgis_deployment_toolbelt.jobs.run_context import RunContext
+from qgis_deployment_toolbelt.plugins.prefetcher import PluginsPrefetcher
 from qgis_deployment_toolbelt.profiles import LocalGitHandler, RemoteGitHandler
+from qgis_deployment_toolbelt.profiles.local_folder_handler import LocalFolderHandler
+from qgis_deployment_toolbelt.profiles.profiles_finder import find_profiles_json
+from qgis_deployment_toolbelt.profiles.profiles_handler_base import (
+    RemoteProfilesHandlerBase,
+)
+from qgis_deployment_toolbelt.profiles.qdt_profile import QdtProfile
 from qgis_deployment_toolbelt.profiles.remote_http_handler import HttpHandler
+from qgis_deployment_toolbelt.utils.network_scheduler import apply_host_jitter
+from qgis_deployment_toolbelt.utils.slugger import sluggy
 
 # #############################################################################
 # ########## Globals ###############
@@ -46,42 +62,281 @@ class JobProfilesDownloader(GenericJob):
             "possible_values": None,
             "condition": None,
         },
+        "prefetch_plugins": {
+            "type": bool,
+            "required": False,
+            "default": False,
+            "possible_values": None,
+            "condition": None,
+        },
         "protocol": {
             "type": str,
             "required": True,
             "default": "git_remote",
-            "possible_values": ("git", "git_local", "git_remote", "http"),
+            "possible_values": ("folder", "git", "git_local", "git_remote", "http"),
             "condition": "in",
         },
+        "compare_checksums": {
+            "type": bool,
+            "required": False,
+            "default": False,
+            "possible_values": None,
+            "condition": None,
+        },
         "source": {
             "type": str,
-            "required": True,
+            "required": False,
             "default": None,
             "possible_values": ("https://", "http://", "git://", "file://"),
             "condition": "startswith",
         },
+        "sources": {
+            "type": list,
+            "required": False,
+            "default": None,
+            "possible_values": None,
+            "condition": None,
+        },
+        "sparse_checkout": {
+            "type": bool,
+            "required": False,
+            "default": False,
+            "possible_values": None,
+            "condition": None,
+        },
+        "threads": {
+            "type": int,
+            "required": False,
+            "default": 4,
+            "possible_values": (1, 2, 3, 4, 5),
+            "condition": "in",
+        },
     }
     PROFILES_NAMES_DOWNLOADED: list = []
 
-    def __init__(self, options: dict) -> None:
+    def __init__(self, options: dict, run_context: RunContext | None = None) -> None:
         """Instantiate the class.
 
         Args:
             options (List[dict]): list of dictionary with environment variables to set
             or remove.
+            run_context (RunContext | None, optional): environment shared by the
+                jobs of the run. Defaults to None: a new one is created.
         """
-        super().__init__()
+        super().__init__(run_context=run_context)
         self.options: dict = self.validate_options(options)
 
         # where QDT downloads remote repositories
         self.qdt_downloaded_repositories.mkdir(exist_ok=True, parents=True)
         logger.debug(f"Local repositories folder: {self.qdt_downloaded_repositories}")
 
+        # plugins downloaded while profiles are still being downloaded
+        self.plugins_prefetcher: PluginsPrefetcher | None = None
+
     def run(self) -> None:
         """Execute job logic."""
+        # spread the fleet before hitting the network
+        apply_host_jitter(phase_name=self.ID)
+
+        self.plugins_prefetcher = None
+        if self.options.get("prefetch_plugins", False):
+            plugins_downloader = JobPluginsDownloader(
+                options={}, run_context=self.run_context
+            )
+            self.plugins_prefetcher = PluginsPrefetcher(
+                download_plugin=plugins_downloader.download_plugin,
+                plugins_folder=plugins_downloader.qdt_plugins_folder,
+                repositories_index_folder=self.qdt_plugins_repositories_index_folder,
+                threads=self.options.get("threads", 4),
+            )
+
+        try:
+            if self.options.get("sources"):
+                self.download_sources(sources_options=self.list_sources_options())
+            else:
+                # run download operation
+                downloader = self.get_downloader(source_options=self.options)
+                downloader.download(
+                    destination_local_path=self.qdt_downloaded_repositories
+                )
+                self.record_changed_paths(
+                    destination=self.qdt_downloaded_repositories,
+                    changed_paths=downloader.CHANGED_PATHS,
+                )
+                self.prefetch_downloaded_plugins(
+                    downloader=downloader,
+                    destination=self.qdt_downloaded_repositories,
+                )
+        finally:
+            if self.plugins_prefetcher is not None:
+                prefetched_plugins, failed_prefetches = self.plugins_prefetcher.wait()
+                logger.info(
+                    f"{len(prefetched_plugins)} plugins prefetched, "
+                    f"{len(failed_prefetches)} failed."
+                )
+
+        # check of there are some profiles folders within the downloaded folder
+        profiles_folders = self.list_downloaded_profiles()
+        if profiles_folders is None:
+            logger.error("No QGIS profile found in the downloaded folder.")
+            return
+
+        # store downloaded profiles names
+        self.PROFILES_NAMES_DOWNLOADED = [d.name for d in profiles_folders]
+        logger.info(
+            f"{len(self.PROFILES_NAMES_DOWNLOADED)} downloaded profiles: "
+            f"{', '.join(self.PROFILES_NAMES_DOWNLOADED)}"
+        )
+
+        logger.debug(f"Job {self.ID} ran successfully.")
+
+    def get_downloader(self, source_options: dict) -> RemoteProfilesHandlerBase:
+        """Get the handler matching the protocol and the source, set up to download
+            only the profiles matching their deployment rules with the HTTP protocol or
+            if sparse checkout is enabled. Otherwise, git handlers hand the profile.json
+            files to the plugins prefetcher before checking out the whole tree.
+
+        Args:
+            source_options (dict): options with protocol, source and branch
+
+        Raises:
+            NotImplementedError: if the protocol or the source type is not supported
+
+        Returns:
+            RemoteProfilesHandlerBase: handler ready to download
+        """
+        downloader = self._get_downloader(source_options=source_options)
+        # profiles published over HTTP are always filtered on their deployment rules:
+        # files of excluded profiles are neither downloaded one by one nor extracted
+        # from the bundle
+        if self.options.get("sparse_checkout", False) or isinstance(
+            downloader, HttpHandler
+        ):
+            downloader.PROFILES_SELECTOR = self.select_profiles_folders
+        elif self.plugins_prefetcher is not None and isinstance(
+            downloader, (LocalGitHandler, RemoteGitHandler)
+        ):
+            downloader.PROFILES_OBSERVER = self.prefetch_profiles_plugins
+        return downloader
+
+    def select_profiles_folders(self, profiles_json: dict[str, bytes]) -> set[str]:
+        """Pick the profiles folders to check out, evaluating the deployment rules of
+            profile.json contents read from the git object store. A profile.json which
+            can't be parsed is kept, to be reported later.
+
+        Args:
+            profiles_json (dict[str, bytes]): profile.json content by profile folder
+
+        Returns:
+            set[str]: profiles folders to check out
+        """
+        profiles_by_folder, selected_folders = self.parse_profiles_json(
+            profiles_json=profiles_json
+        )
+
+        profiles_matched, _ = self.filter_profiles_on_rules(
+            tup_qdt_profiles=tuple(profiles_by_folder.values())
+        )
+        selected_folders.update(
+            folder
+            for folder, profile in profiles_by_folder.items()
+            if profile in profiles_matched
+        )
+
+        # the rest of the profiles files is not downloaded yet: start with plugins
+        if self.plugins_prefetcher is not None:
+            self.plugins_prefetcher.enqueue_profiles(profiles_matched)
+
+        return selected_folders
+
+    def prefetch_profiles_plugins(self, profiles_json: dict[str, bytes]) -> None:
+        """Enqueue the plugins of the profiles matching their deployment rules, from
+            profile.json contents read from the git object store before the checkout.
+
+        Args:
+            profiles_json (dict[str, bytes]): profile.json content by profile folder
+        """
+        if self.plugins_prefetcher is None:
+            return
+
+        profiles_by_folder, _ = self.parse_profiles_json(profiles_json=profiles_json)
+        profiles_matched, _ = self.filter_profiles_on_rules(
+            tup_qdt_profiles=tuple(profiles_by_folder.values())
+        )
+        self.plugins_prefetcher.enqueue_profiles(profiles_matched)
+
+    def parse_profiles_json(
+        self, profiles_json: dict[str, bytes]
+    ) -> tuple[dict[str, QdtProfile], set[str]]:
+        """Parse profile.json contents read from the git object store.
+
+        Args:
+            profiles_json (dict[str, bytes]): profile.json content by profile folder
+
+        Returns:
+            tuple[dict[str, QdtProfile], set[str]]: tuple of (profiles by folder,
+                folders whose profile.json can't be parsed)
+        """
+        profiles_by_folder: dict[str, QdtProfile] = {}
+        unreadable_folders: set[str] = set()
+        for folder, profile_json in profiles_json.items():
+            try:
+                profiles_by_folder[folder] = QdtProfile.from_dict(
+                    profile_data=json.loads(profile_json),
+                    profile_folder=Path(folder),
+                )
+            except (ValueError, TypeError) as err:
+                logger.warning(
+                    f"profile.json of '{folder}' can't be read from git objects: {err}"
+                )
+                unreadable_folders.add(folder)
+
+        return profiles_by_folder, unreadable_folders
+
+    def prefetch_downloaded_plugins(
+        self, downloader: RemoteProfilesHandlerBase, destination: Path
+    ) -> None:
+        """Enqueue the plugins of the profiles downloaded from a source, unless they
+            were already enqueued from the git objects, while downloading.
+
+        Args:
+            downloader (RemoteProfilesHandlerBase): handler which downloaded the source
+            destination (Path): folder where the source was downloaded
+        """
+        if (
+            self.plugins_prefetcher is None
+            or getattr(downloader, "PROFILES_SELECTOR", None) is not None
+            or getattr(downloader, "PROFILES_OBSERVER", None) is not None
+        ):
+            return
+
+        profiles_matched, _ = self.filter_profiles_on_rules(
+            tup_qdt_profiles=tuple(
+                QdtProfile.from_json(profile_json_path=f, profile_folder=f.parent)
+                for f in find_profiles_json(start_parent_folder=destination)
+            )
+        )
+        self.plugins_prefetcher.enqueue_profiles(profiles_matched)
+
+    def _get_downloader(self, source_options: dict) -> RemoteProfilesHandlerBase:
+        """Get the handler matching the protocol and the source.
+
+        Args:
+            source_options (dict): options with protocol, source and branch
+
+        Raises:
+            NotImplementedError: if the protocol or the source type is not supported
+
+        Returns:
+            RemoteProfilesHandlerBase: handler
+        """
+        protocol = source_options.get("protocol", "git_remote")
+        source: str = source_options.get("source") or ""
+        branch = source_options.get("branch", "master")
+
         # prepare remote source
-        if self.options.get("protocol") in ("git", "git_local", "git_remote"):
-            if self.options.get("protocol") == "git":
+        if protocol in ("git", "git_local", "git_remote"):
+            if protocol == "git":
                 logger.warning(
                     DeprecationWarning(
                         "'git' protocol has been split into 2 more explicit: 'git_local' "
@@ -91,58 +346,182 @@ class JobProfilesDownloader(GenericJob):
                         "Please update your scenario consequently."
                     )
                 )
-            if self.options.get("protocol") == "git_remote" or self.options.get(
-                "source"
-            ).startswith(("git://", "http://", "https://")):
-                downloader = RemoteGitHandler(
-                    source_repository_url=self.options.get("source"),
-                    branch_to_use=self.options.get("branch", "master"),
+            if protocol == "git_remote" or source.startswith(
+                ("git://", "http://", "https://")
+            ):
+                return RemoteGitHandler(
+                    source_repository_url=source, branch_to_use=branch
                 )
-            elif self.options.get("source").startswith("file://"):
-                downloader = LocalGitHandler(
-                    source_repository_path_or_uri=self.options.get("source"),
-                    branch_to_use=self.options.get("branch", "master"),
+            elif source.startswith("file://"):
+                return LocalGitHandler(
+                    source_repository_path_or_uri=source, branch_to_use=branch
                 )
             else:
                 logger.error(
-                    f"Source type is not implemented yet: {self.options.get('source')}"
-                    f"for '{self.options.get('protocol')}' protocol"
+                    f"Source type is not implemented yet: {source}"
+                    f"for '{protocol}' protocol"
                 )
                 raise NotImplementedError
-        elif self.options.get("protocol") == "http":
-            if not self.options.get("source").startswith(("http://", "https://")):
+        elif protocol == "folder":
+            if not source.startswith("file://"):
                 logger.error(
-                    f"Source type not implemented yet: {self.options.get('source')} "
-                    f"for '{self.options.get('protocol')}' protocol"
+                    f"Source type not implemented yet: {source} "
+                    f"for '{protocol}' protocol"
                 )
                 raise NotImplementedError
-            downloader = HttpHandler(
-                source_repository_path_or_uri=self.options.get("source"),
+            return LocalFolderHandler(
+                source_repository_path_or_uri=source,
+                compare_checksums=self.options.get("compare_checksums", False),
             )
+        elif protocol == "http":
+            if not source.startswith(("http://", "https://")):
+                logger.error(
+                    f"Source type not implemented yet: {source} "
+                    f"for '{protocol}' protocol"
+                )
+                raise NotImplementedError
+            return HttpHandler(source_repository_path_or_uri=source)
         else:
             logger.critical(
-                f"Protocol '{self.options.get('protocol')}' is not part of supported ones: "
+                f"Protocol '{protocol}' is not part of supported ones: "
                 f"{self.OPTIONS_SCHEMA.get('protocol').get('possible_values')}"
             )
             raise NotImplementedError
 
-        # run download operation
-        downloader.download(destination_local_path=self.qdt_downloaded_repositories)
+    def list_sources_options(self) -> list[dict]:
+        """List options of each source to download, completed with the job level
+            options (protocol, branch). If the job level 'source' is set, it's
+            downloaded too, first.
 
-        # check of there are some profiles folders within the downloaded folder
-        profiles_folders = self.list_downloaded_profiles()
-        if profiles_folders is None:
-            logger.error("No QGIS profile found in the downloaded folder.")
-            return
+        Returns:
+            list[dict]: validated options of each source
+        """
+        sources_options: list[dict] = []
+        sources: list = list(self.options.get("sources"))
+        if self.options.get("source"):
+            sources.insert(0, {"source": self.options.get("source")})
+
+        for source in sources:
+            # shortcut: a source can be a simple string
+            if isinstance(source, str):
+                source = {"source": source}
+            source_options = {
+                "branch": self.options.get("branch", "master"),
+                "protocol": self.options.get("protocol", "git_remote"),
+            }
+            source_options.update(source)
+            sources_options.append(
+                self.validate_options(
+                    {
+                        k: v
+                        for k, v in source_options.items()
+                        if k in self.OPTIONS_SCHEMA
+                    }
+                )
+            )
+
+        return sources_options
+
+    def get_source_destination(self, source: str) -> Path:
+        """Get the folder where a source is downloaded when several sources are set,
+            named after the source.
+
+        Args:
+            source (str): source URL
+
+        Returns:
+            Path: destination folder
+        """
+        source_parts = urlsplit(source)
+        return self.qdt_downloaded_repositories.joinpath(
+            sluggy(f"{source_parts.netloc}{source_parts.path}".strip("/"))
+        )
+
+    def download_sources(self, sources_options: list[dict]) -> list[dict]:
+        """Download several sources concurrently, each one into its own folder.
+
+        Args:
+            sources_options (list[dict]): options of each source
+
+        Returns:
+            list[dict]: options of sources which failed to download
+        """
+        failed_sources: list[tuple[dict, Exception]] = []
+        threads = min(self.options.get("threads", 4), len(sources_options))
 
-        # store downloaded profiles names
-        self.PROFILES_NAMES_DOWNLOADED = [d.name for d in profiles_folders]
         logger.info(
-            f"{len(self.PROFILES_NAMES_DOWNLOADED)} downloaded profiles: "
-            f"{', '.join(self.PROFILES_NAMES_DOWNLOADED)}"
+            f"Downloading {len(sources_options)} profiles sources in {threads} threads."
         )
+        with ThreadPoolExecutor(
+            max_workers=threads, thread_name_prefix=f"{__title_clean__}_profiles_dl_"
+        ) as executor:
+            # handlers are built in the workers: some of them reach the source as
+            # soon as they are instantiated (e.g. git ls-remote)
+            futures = {
+                executor.submit(
+                    self.download_source,
+                    source_options=source_options,
+                    destination=self.get_source_destination(
+                        source_options.get("source")
+                    ),
+                ): source_options
+                for source_options in sources_options
+            }
 
-        logger.debug(f"Job {self.ID} ran successfully.")
+            for done_count, future in enumerate(as_completed(futures), start=1):
+                source_options = futures.get(future)
+                destination = self.get_source_destination(source_options.get("source"))
+                try:
+                    downloader = future.result()
+                    self.record_changed_paths(
+                        destination=destination,
+                        changed_paths=getattr(downloader, "CHANGED_PATHS", None),
+                    )
+                    self.prefetch_downloaded_plugins(
+                        downloader=downloader, destination=destination
+                    )
+                    logger.info(
+                        f"[{done_count}/{len(futures)}] Profiles from "
+                        f"{source_options.get('source')} downloaded to {destination}."
+                    )
+                except Exception as err:
+                    logger.error(
+                        f"[{done_count}/{len(futures)}] Downloading profiles from "
+                        f"{source_options.get('source')} failed. Trace: {err}"
+                    )
+                    failed_sources.append((source_options, err))
+
+        if len(failed_sources) == len(sources_options):
+            raise RuntimeError(
+                f"Every profiles source ({len(sources_options)}) failed to download: "
+                + " ; ".join(
+                    f"{src.get('source')} ({err})" for src, err in failed_sources
+                )
+            )
+        if failed_sources:
+            logger.error(
+                f"{len(failed_sources)}/{len(sources_options)} profiles sources failed "
+                "to download: "
+                + ", ".join(src.get("source") for src, _ in failed_sources)
+            )
+
+        return [src for src, _ in failed_sources]
+
+    def download_source(
+        self, source_options: dict, destination: Path
+    ) -> RemoteProfilesHandlerBase:
+        """Build the handler of a source and download it.
+
+        Args:
+            source_options (dict): options of the source
+            destination (Path): folder where to download the source
+
+        Returns:
+            RemoteProfilesHandlerBase: handler used to download the source
+        """
+        downloader = self.get_downloader(source_options=source_options)
+        downloader.download(destination_local_path=destination)
+        return downloader
 
 
 # #############################################################################
@@ -20,6 +20,7 @@ from shutil import copy2, copytree
 
 # package
 from qgis_deployment_toolbelt.jobs.generic_job import GenericJob
+from qgis_deployment_toolbelt.jobs.run_context import RunContext
 from qgis_deployment_toolbelt.profiles.qdt_profile import QdtProfile
 
 # #############################################################################
@@ -59,14 +60,16 @@ class JobProfilesSynchronizer(GenericJob):
     PROFILES_NAMES_DOWNLOADED: list = []
     PROFILES_NAMES_INSTALLED: list = []
 
-    def __init__(self, options: dict) -> None:
+    def __init__(self, options: dict, run_context: RunContext | None = None) -> None:
         """Instantiate the class.
 
         Args:
             options (List[dict]): list of dictionary with environment variables to set
             or remove.
+            run_context (RunContext | None, optional): environment shared by the
+                jobs of the run. Defaults to None: a new one is created.
         """
-        super().__init__()
+        super().__init__(run_context=run_context)
         self.options: dict = self.validate_options(options)
 
         # where QDT downloads remote repositories
@@ -180,6 +183,7 @@ class JobProfilesSynchronizer(GenericJob):
 
             # copy all downloaded profiles
             self.sync_overwrite_local_profiles(profiles_to_copy=downloaded_profiles)
+            self.write_changed_paths(changed_paths=set())
 
         elif self.options.get("sync_mode") == "only_missing":
             already_installed = []
@@ -252,10 +256,27 @@ class JobProfilesSynchronizer(GenericJob):
             logger.debug(
                 "Installed profiles are going to be overridden by downloaded ones."
             )
-            # copy all downloaded profiles
+            profiles_to_copy = downloaded_profiles
+            # if the downloaded files which changed are known, skip installed profiles
+            # which did not change
+            changed_profiles = self.list_changed_downloaded_profiles(
+                downloaded_profiles=tuple(downloaded_profiles)
+            )
+            if changed_profiles is not None:
+                profiles_to_copy = [
+                    profile
+                    for profile in downloaded_profiles
+                    if profile in changed_profiles or not profile.path_in_qgis.is_dir()
+                ]
+                logger.info(
+                    f"{len(profiles_to_copy)}/{len(downloaded_profiles)} downloaded "
+                    "profiles changed since last synchronization or are not installed."
+                )
+
             self.sync_overwrite_local_profiles(
-                profiles_to_copy=downloaded_profiles, overwrite=True
+                profiles_to_copy=profiles_to_copy, overwrite=True
             )
+            self.write_changed_paths(changed_paths=set())
 
         else:
             logger.debug(
@@ -28,7 +28,9 @@ from qgis_deployment_toolbelt.constants import (
 )
 from qgis_deployment_toolbelt.exceptions import QgisInstallNotFound
 from qgis_deployment_toolbelt.jobs.generic_job import GenericJob
+from qgis_deployment_toolbelt.jobs.run_context import RunContext
 from qgis_deployment_toolbelt.utils.check_path import check_path_exists
+from qgis_deployment_toolbelt.utils.versions import version_key
 
 # #############################################################################
 # ########## Globals ###############
@@ -78,14 +80,16 @@ class JobQgisInstallationFinder(GenericJob):
         },
     }
 
-    def __init__(self, options: dict) -> None:
+    def __init__(self, options: dict, run_context: RunContext | None = None) -> None:
         """Instantiate the class.
 
         Args:
             options (dict): job options
+            run_context (RunContext | None, optional): environment shared by the
+                jobs of the run. Defaults to None: a new one is created.
         """
 
-        super().__init__()
+        super().__init__(run_context=run_context)
         self.options: dict = self.validate_options(options)
 
     def run(self) -> None:
@@ -185,7 +189,8 @@ class JobQgisInstallationFinder(GenericJob):
 
     @staticmethod
     def _get_latest_version_from_list(versions: list[str]) -> str | None:
-        """Get latest version from a list, OSGEO4W are last.
+        """Get latest version from a list, OSGEO4W are last. Versions are compared on
+            their release segments: 3.34 is more recent than 3.9.
 
         Args:
             versions (list[str]): list of found version
@@ -194,9 +199,7 @@ class JobQgisInstallationFinder(GenericJob):
             str | None: latest version, None if no version provided
         """
         if len(versions):
-            used_version = versions
-            used_version.sort(reverse=True)
-            return used_version[0]
+            return max(versions, key=version_key)
 
         return None
 
@@ -18,6 +18,7 @@ from pathlib import Path
 # package
 from qgis_deployment_toolbelt.__about__ import __title__, __version__
 from qgis_deployment_toolbelt.jobs.generic_job import GenericJob
+from qgis_deployment_toolbelt.jobs.run_context import RunContext
 from qgis_deployment_toolbelt.profiles.qdt_profile import QdtProfile
 from qgis_deployment_toolbelt.shortcuts.shortcuts_handler import ApplicationShortcut
 
@@ -103,13 +104,15 @@ class JobShortcutsManager(GenericJob):
     SHORTCUTS_CREATED: list = []
     SHORTCUTS_REMOVED: list = []
 
-    def __init__(self, options: dict) -> None:
+    def __init__(self, options: dict, run_context: RunContext | None = None) -> None:
         """Instantiate the class.
 
         :param dict options: profiles source (remote, can be a local network) and
         destination (local).
+        :param RunContext run_context: environment shared by the jobs of the run.
+            Defaults to None: a new one is created.
         """
-        super().__init__()
+        super().__init__(run_context=run_context)
         self.options: dict = self.validate_options(options)
 
     def run(self) -> None:
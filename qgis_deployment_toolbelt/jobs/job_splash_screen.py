@@ -18,6 +18,7 @@ from pathlib import Path
 # package
 from qgis_deployment_toolbelt.exceptions import SplashScreenBadDimensions
 from qgis_deployment_toolbelt.jobs.generic_job import GenericJob
+from qgis_deployment_toolbelt.jobs.run_context import RunContext
 from qgis_deployment_toolbelt.profiles.qdt_profile import QdtProfile
 from qgis_deployment_toolbelt.profiles.qgis_ini_handler import QgisIniHelper
 from qgis_deployment_toolbelt.utils.check_image_size import check_image_dimensions
@@ -60,13 +61,15 @@ class JobSplashScreenManager(GenericJob):
     DEFAULT_SPLASH_FILEPATH: str = "images/splash.png"
     SPLASH_FILENAME: str = "splash.png"
 
-    def __init__(self, options: dict) -> None:
+    def __init__(self, options: dict, run_context: RunContext | None = None) -> None:
         """Instantiate the class.
 
         Args:
             options (dict): dictionary of options.
+            run_context (RunContext | None, optional): environment shared by the
+                jobs of the run. Defaults to None: a new one is created.
         """
-        super().__init__()
+        super().__init__(run_context=run_context)
         self.options: dict = self.validate_options(options)
 
     def run(self) -> None:
@@ -33,6 +33,7 @@ from qgis_deployment_toolbelt.jobs.job_qgis_installation_finder import (
 )
 from qgis_deployment_toolbelt.jobs.job_shortcuts import JobShortcutsManager
 from qgis_deployment_toolbelt.jobs.job_splash_screen import JobSplashScreenManager
+from qgis_deployment_toolbelt.jobs.run_context import RunContext
 
 # #############################################################################
 # ########## Globals ###############
@@ -93,13 +94,17 @@ class JobsOrchestrator:
             if job.ID == job_id:
                 return job
 
-    def init_job_class_from_id(self, job_id: str, options: dict) -> GenericJob | None:
+    def init_job_class_from_id(
+        self, job_id: str, options: dict, run_context: RunContext | None = None
+    ) -> GenericJob | None:
         """Get job class from id and instanciate it with options.
 
         :param str job_id: job identifier (i.e. "qprofiles-manager")
         :param dict options: job options
+        :param RunContext run_context: environment shared by the jobs of the run.
+            Defaults to None: the job creates its own.
 
         :return object: instanciated job class with options
         """
         if job := self.get_job_module_from_id(job_id):
-            return job(options)
+            return job(options, run_context=run_context)
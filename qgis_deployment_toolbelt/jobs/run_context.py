@@ -0,0 +1,134 @@
+#! python3  # noqa: E265
+
+"""
+    Environment shared by the jobs of a deployment run.
+
+    Author: Julien Moura (https://github.com/guts)
+"""
+
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import logging
+from os import getenv
+from pathlib import Path
+
+# package
+from qgis_deployment_toolbelt.constants import OSConfiguration
+from qgis_deployment_toolbelt.profiles.qdt_profile import (
+    ProfilesEnvironment,
+    get_profiles_environment,
+)
+from qgis_deployment_toolbelt.profiles.rules_context import QdtRulesContext
+
+# #############################################################################
+# ########## Globals ###############
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class RunContext:
+    """Operating system configuration, rules context and local folders shared by the
+    jobs of a run. It's created once by the deployment command and injected into each
+    job, so that building a job doesn't bootstrap the environment again.
+
+    The operating system configuration and the working folder come from the snapshot
+    shared with profiles objects: they only change if a job changes the environment
+    variables they depend on (i.e. QGIS_CUSTOM_CONFIG_PATH).
+    """
+
+    def __init__(self) -> None:
+        """Object instanciation."""
+        self.qdt_rules_context = QdtRulesContext()
+        self._rules_context_dict: dict | None = None
+        self._prepared_environment: ProfilesEnvironment | None = None
+
+    @property
+    def environment(self) -> ProfilesEnvironment:
+        """Returns the working folder and operating system configuration, making sure
+            the related folders exist.
+
+        Returns:
+            ProfilesEnvironment: working folder and operating system configuration
+        """
+        environment = get_profiles_environment()
+        if environment is not self._prepared_environment:
+            self.prepare_folders(environment=environment)
+            self._prepared_environment = environment
+        return environment
+
+    @property
+    def os_config(self) -> OSConfiguration:
+        """Returns the operating system configuration.
+
+        Returns:
+            OSConfiguration: operating system configuration
+        """
+        return self.environment.os_config
+
+    @property
+    def qdt_working_folder(self) -> Path:
+        """Returns the QDT working folder.
+
+        Returns:
+            Path: QDT working folder
+        """
+        return self.environment.qdt_working_folder
+
+    @property
+    def qdt_downloaded_repositories(self) -> Path:
+        """Returns the folder where profiles of the running scenario are downloaded.
+
+        Returns:
+            Path: downloaded repositories folder
+        """
+        return self.qdt_working_folder.joinpath(
+            f"repositories/{getenv('QDT_TMP_RUNNING_SCENARIO_ID', 'default')}"
+        )
+
+    @property
+    def rules_context_dict(self) -> dict:
+        """Returns the context profiles deployment rules are evaluated on, built once
+            per run: it looks up user groups, which can be slow.
+
+        Returns:
+            dict: rules context
+        """
+        if self._rules_context_dict is None:
+            self._rules_context_dict = self.qdt_rules_context.to_dict()
+        return self._rules_context_dict
+
+    @staticmethod
+    def prepare_folders(environment: ProfilesEnvironment) -> None:
+        """Create the QDT working folder and the QGIS profiles folder if they don't
+            exist.
+
+        Args:
+            environment (ProfilesEnvironment): working folder and operating system
+                configuration
+        """
+        if not environment.qdt_working_folder.exists():
+            logger.info(
+                f"QDT working folder not found: {environment.qdt_working_folder}. "
+                "Creating it to properly run the jobs."
+            )
+            environment.qdt_working_folder.mkdir(parents=True, exist_ok=True)
+        logger.debug(f"QDT working folder: {environment.qdt_working_folder}")
+
+        qgis_profiles_path = environment.os_config.qgis_profiles_path
+        if not qgis_profiles_path.exists():
+            logger.info(
+                f"Installed QGIS profiles folder not found: {qgis_profiles_path}. "
+                "Creating it to properly run the jobs."
+            )
+            qgis_profiles_path.mkdir(parents=True, exist_ok=True)
+        logger.debug(f"Installed QGIS profiles folder: {qgis_profiles_path}")
@@ -0,0 +1,253 @@
+#! python3  # noqa: E265
+
+"""
+    Index of the plugins archives stored by QDT, mapping each archive to the metadata
+    read from its metadata.txt, so that archives are opened only once.
+
+    Author: Julien Moura (https://github.com/guts)
+"""
+
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# special
+from __future__ import annotations
+
+# Standard library
+import logging
+import os
+import zipfile
+from configparser import Error as ConfigParserError
+from datetime import datetime, timezone
+from pathlib import Path
+
+# package
+from qgis_deployment_toolbelt.plugins.plugin import QgisPlugin
+from qgis_deployment_toolbelt.utils.json_files import (
+    load_json_file,
+    write_json_atomically,
+)
+
+# #############################################################################
+# ########## Globals ###############
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+# metadata.txt keys kept in the index, mapped to their name in the index
+INDEXED_METADATA: dict[str, str] = {
+    "name": "name",
+    "version": "version",
+    "folder_name": "folder_name",
+    "qgisminimumversion": "qgis_minimum_version",
+    "qgismaximumversion": "qgis_maximum_version",
+    "plugin_dependencies": "plugin_dependencies",
+}
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class PluginsArchivesIndex:
+    """Local index of the plugins archives (ZIP) stored in a folder.
+
+    The index is stored as a JSON file, next to the archives, with this structure:
+
+    .. code-block:: json
+
+        {
+            "updated": "2024-12-04T10:00:00+00:00",
+            "archives": {
+                "qtribu_0-14-2.zip": {
+                    "size": 123456,
+                    "mtime_ns": 1733306400000000000,
+                    "metadata": {"name": "QTribu", "version": "0.14.2", ...}
+                }
+            }
+        }
+
+    An archive is read again only if its size or its modification time changed.
+    Archives which can't be read are indexed with a null metadata and an error, so
+    that they are not read again either until they are replaced.
+    """
+
+    INDEX_FILENAME: str = "plugins_archives_index.json"
+
+    def __init__(self, plugins_folder: Path) -> None:
+        """Object instanciation.
+
+        Args:
+            plugins_folder (Path): folder where plugins archives are stored
+        """
+        self.plugins_folder = plugins_folder
+        self.index_path = plugins_folder.joinpath(self.INDEX_FILENAME)
+        self.archives: dict[str, dict] = {}
+
+        self.load()
+
+    # -- I/O -----------------------------------------------------------------
+    def load(self) -> bool:
+        """Load the local index, if it exists.
+
+        Returns:
+            bool: True if the index has been loaded
+        """
+        index_data = load_json_file(file_path=self.index_path)
+        if index_data is None:
+            return False
+
+        self.archives = index_data.get("archives", {})
+        return True
+
+    def save(self) -> Path:
+        """Write the local index, atomically.
+
+        Returns:
+            Path: path to the index file
+        """
+        return write_json_atomically(
+            json_data={
+                "updated": datetime.now(tz=timezone.utc).isoformat(),
+                "archives": self.archives,
+            },
+            file_path=self.index_path,
+        )
+
+    # -- Indexing ------------------------------------------------------------
+    def update(self) -> bool:
+        """Index new and changed archives of the plugins folder and forget the removed
+            ones. Unchanged archives cost a single directory listing.
+
+        Returns:
+            bool: True if the index changed (and has been saved)
+        """
+        if not self.plugins_folder.is_dir():
+            return False
+
+        stored_archives: dict[str, os.stat_result] = {}
+        with os.scandir(self.plugins_folder) as entries:
+            for entry in entries:
+                if entry.name.endswith(".zip") and entry.is_file():
+                    stored_archives[entry.name] = entry.stat()
+
+        changed = False
+        for archive_name in set(self.archives) - set(stored_archives):
+            del self.archives[archive_name]
+            changed = True
+
+        for archive_name, archive_stat in stored_archives.items():
+            if self._is_up_to_date(
+                archive_name=archive_name, archive_stat=archive_stat
+            ):
+                continue
+            self.archives[archive_name] = self._read_archive(
+                archive_path=self.plugins_folder.joinpath(archive_name),
+                archive_stat=archive_stat,
+            )
+            changed = True
+
+        if changed:
+            logger.debug(
+                f"Plugins archives index updated: {len(self.archives)} archives."
+            )
+            self.save()
+
+        return changed
+
+    def get_metadata(self, archive_path: Path) -> dict | None:
+        """Get the metadata of an archive, reading it only if it's not indexed or
+            changed since.
+
+        Args:
+            archive_path (Path): path to the plugin archive
+
+        Returns:
+            dict | None: indexed metadata or None if the archive is missing or can't
+                be read
+        """
+        try:
+            archive_stat = archive_path.stat()
+        except OSError:
+            return None
+
+        if not self._is_up_to_date(
+            archive_name=archive_path.name, archive_stat=archive_stat
+        ):
+            self.archives[archive_path.name] = self._read_archive(
+                archive_path=archive_path, archive_stat=archive_stat
+            )
+            self.save()
+
+        return self.archives[archive_path.name].get("metadata")
+
+    def get_plugin(self, archive_path: Path) -> QgisPlugin | None:
+        """Get a plugin object from the indexed metadata of an archive.
+
+        Args:
+            archive_path (Path): path to the plugin archive
+
+        Returns:
+            QgisPlugin | None: plugin or None if the archive is missing or can't be
+                read
+        """
+        if metadata := self.get_metadata(archive_path=archive_path):
+            return QgisPlugin.from_dict(dict(metadata))
+        return None
+
+    def _is_up_to_date(self, archive_name: str, archive_stat: os.stat_result) -> bool:
+        """Tell if the index entry of an archive matches its size and modification
+            time.
+
+        Args:
+            archive_name (str): archive file name
+            archive_stat (os.stat_result): archive status
+
+        Returns:
+            bool: True if the archive is indexed and unchanged
+        """
+        indexed_archive = self.archives.get(archive_name)
+        return (
+            indexed_archive is not None
+            and indexed_archive.get("size") == archive_stat.st_size
+            and indexed_archive.get("mtime_ns") == archive_stat.st_mtime_ns
+        )
+
+    @staticmethod
+    def _read_archive(archive_path: Path, archive_stat: os.stat_result) -> dict:
+        """Read the metadata of an archive to build its index entry.
+
+        Args:
+            archive_path (Path): path to the plugin archive
+            archive_stat (os.stat_result): archive status
+
+        Returns:
+            dict: index entry
+        """
+        archive_entry = {
+            "size": archive_stat.st_size,
+            "mtime_ns": archive_stat.st_mtime_ns,
+            "metadata": None,
+        }
+        try:
+            plugin_metadata = QgisPlugin.read_zip_metadata(input_zip_path=archive_path)
+        except (
+            ConfigParserError,
+            OSError,
+            UnicodeDecodeError,
+            ValueError,
+            zipfile.BadZipFile,
+        ) as err:
+            logger.warning(f"Plugin archive {archive_path} can't be read: {err}")
+            archive_entry["error"] = str(err)
+            return archive_entry
+
+        archive_entry["metadata"] = {
+            index_key: plugin_metadata[metadata_key]
+            for metadata_key, index_key in INDEXED_METADATA.items()
+            if metadata_key in plugin_metadata
+        }
+        return archive_entry
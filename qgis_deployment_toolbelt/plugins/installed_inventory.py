@@ -0,0 +1,254 @@
+#! python3  # noqa: E265
+
+"""
+    Inventory of the plugins installed into a QGIS profile, kept on disk and refreshed
+    only for plugins whose metadata.txt changed.
+
+    Author: Julien Moura (https://github.com/guts)
+"""
+
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# special
+from __future__ import annotations
+
+# Standard library
+import hashlib
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from configparser import Error as ConfigParserError
+from datetime import datetime, timezone
+from pathlib import Path
+
+# package
+from qgis_deployment_toolbelt.__about__ import __title_clean__
+from qgis_deployment_toolbelt.plugins.plugin import QgisPlugin
+from qgis_deployment_toolbelt.utils.json_files import (
+    load_json_file,
+    write_json_atomically,
+)
+from qgis_deployment_toolbelt.utils.slugger import sluggy
+
+# #############################################################################
+# ########## Globals ###############
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class InstalledPluginsInventory:
+    """Inventory of the plugins installed into a profile plugins folder
+    (QGIS3/profiles/{profile}/python/plugins).
+
+    The inventory is stored as a JSON file into a cache folder, with this structure:
+
+    .. code-block:: json
+
+        {
+            "plugins_folder": "/home/user/.local/share/QGIS/QGIS3/profiles/...",
+            "updated": "2024-12-04T10:00:00+00:00",
+            "plugins": {
+                "qtribu": {
+                    "size": 1234,
+                    "mtime_ns": 1733306400000000000,
+                    "metadata": {"name": "QTribu", "version": "0.14.2", ...}
+                }
+            }
+        }
+
+    Where plugins are keyed by their folder name and checked against the size and
+    modification time of their metadata.txt.
+    """
+
+    def __init__(
+        self, plugins_folder: Path, cache_folder: Path, max_workers: int = 8
+    ) -> None:
+        """Object instanciation.
+
+        Args:
+            plugins_folder (Path): folder where plugins are installed
+            cache_folder (Path): folder where to store the inventory
+            max_workers (int, optional): maximum number of metadata.txt read at the
+                same time. Defaults to 8.
+        """
+        self.plugins_folder = plugins_folder
+        self.max_workers = max_workers
+        plugins_folder_hash = hashlib.sha256(
+            os.fspath(plugins_folder.resolve()).encode("UTF-8")
+        ).hexdigest()[:12]
+        self.inventory_path = cache_folder.joinpath(
+            f"{sluggy(plugins_folder.parent.parent.name)}_{plugins_folder_hash}.json"
+        )
+        self.plugins: dict[str, dict] = {}
+
+        self.load()
+
+    # -- I/O -----------------------------------------------------------------
+    def load(self) -> bool:
+        """Load the stored inventory, if it exists.
+
+        Returns:
+            bool: True if the inventory has been loaded
+        """
+        inventory_data = load_json_file(file_path=self.inventory_path)
+        if inventory_data is None:
+            return False
+
+        self.plugins = inventory_data.get("plugins", {})
+        return True
+
+    def save(self) -> Path:
+        """Write the inventory, atomically.
+
+        Returns:
+            Path: path to the inventory file
+        """
+        return write_json_atomically(
+            json_data={
+                "plugins_folder": os.fspath(self.plugins_folder),
+                "updated": datetime.now(tz=timezone.utc).isoformat(),
+                "plugins": self.plugins,
+            },
+            file_path=self.inventory_path,
+        )
+
+    # -- Inventory -----------------------------------------------------------
+    def refresh(self) -> bool:
+        """Read metadata of new or changed plugins, in parallel, and forget removed
+            ones. Unchanged plugins cost a stat request on their metadata.txt.
+
+        Returns:
+            bool: True if the inventory changed (and has been saved)
+        """
+        installed_plugins: dict[str, os.stat_result] = {}
+        if self.plugins_folder.is_dir():
+            with os.scandir(self.plugins_folder) as entries:
+                for entry in entries:
+                    if not entry.is_dir():
+                        continue
+                    try:
+                        installed_plugins[entry.name] = os.stat(
+                            os.path.join(entry.path, "metadata.txt")
+                        )
+                    except OSError:
+                        # not a plugin, or a broken one
+                        continue
+
+        changed = False
+        for folder_name in set(self.plugins) - set(installed_plugins):
+            del self.plugins[folder_name]
+            changed = True
+
+        folders_to_read = [
+            folder_name
+            for folder_name, metadata_stat in installed_plugins.items()
+            if not self._is_up_to_date(
+                folder_name=folder_name, metadata_stat=metadata_stat
+            )
+        ]
+        if folders_to_read:
+            with ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix=f"{__title_clean__}_plugins_inventory_",
+            ) as executor:
+                for folder_name, plugin_entry in zip(
+                    folders_to_read,
+                    executor.map(
+                        lambda folder_name: self._read_plugin(
+                            folder_name=folder_name,
+                            metadata_stat=installed_plugins[folder_name],
+                        ),
+                        folders_to_read,
+                    ),
+                ):
+                    if plugin_entry is None:
+                        self.plugins.pop(folder_name, None)
+                    else:
+                        self.plugins[folder_name] = plugin_entry
+            changed = True
+
+        if changed:
+            logger.debug(
+                f"Installed plugins inventory of {self.plugins_folder} updated: "
+                f"{len(folders_to_read)} plugins read, {len(self.plugins)} installed."
+            )
+            self.save()
+
+        return changed
+
+    def get(self, folder_name: str) -> QgisPlugin | None:
+        """Get an installed plugin from the inventory.
+
+        Args:
+            folder_name (str): name of the plugin folder
+
+        Returns:
+            QgisPlugin | None: installed plugin or None if not installed
+        """
+        if plugin_entry := self.plugins.get(folder_name):
+            return QgisPlugin.from_dict(
+                {**plugin_entry["metadata"], "folder_name": folder_name}
+            )
+        return None
+
+    def _is_up_to_date(self, folder_name: str, metadata_stat: os.stat_result) -> bool:
+        """Tell if the inventory entry of a plugin matches the size and modification
+            time of its metadata.txt.
+
+        Args:
+            folder_name (str): name of the plugin folder
+            metadata_stat (os.stat_result): metadata.txt status
+
+        Returns:
+            bool: True if the plugin is in the inventory and unchanged
+        """
+        plugin_entry = self.plugins.get(folder_name)
+        return (
+            plugin_entry is not None
+            and plugin_entry.get("size") == metadata_stat.st_size
+            and plugin_entry.get("mtime_ns") == metadata_stat.st_mtime_ns
+        )
+
+    def _read_plugin(
+        self, folder_name: str, metadata_stat: os.stat_result
+    ) -> dict | None:
+        """Read the metadata.txt of an installed plugin to build its entry.
+
+        Args:
+            folder_name (str): name of the plugin folder
+            metadata_stat (os.stat_result): metadata.txt status
+
+        Returns:
+            dict | None: inventory entry or None if the metadata can't be read
+        """
+        metadata_path = self.plugins_folder.joinpath(folder_name, "metadata.txt")
+        try:
+            with metadata_path.open(encoding="UTF-8") as config_file:
+                plugin_metadata = QgisPlugin.parse_metadata_txt(config_file=config_file)
+        except (ConfigParserError, OSError, UnicodeDecodeError) as err:
+            logger.warning(f"Plugin metadata {metadata_path} can't be read: {err}")
+            return None
+
+        return {
+            "size": metadata_stat.st_size,
+            "mtime_ns": metadata_stat.st_mtime_ns,
+            "metadata": {
+                key: plugin_metadata[key]
+                for key in (
+                    "name",
+                    "version",
+                    "qgisminimumversion",
+                    "qgismaximumversion",
+                )
+                if key in plugin_metadata
+            },
+        }
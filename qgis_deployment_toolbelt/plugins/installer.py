@@ -0,0 +1,295 @@
+#! python3  # noqa: E265
+
+"""
+    Install plugins archives into a profile plugins folder: archives are checked, then
+    extracted into a staging folder next to the target and swapped with the installed
+    plugin, so QGIS never loads a half-written plugin nor files left by an older
+    version.
+
+    Author: Julien Moura (https://github.com/guts)
+"""
+
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# special
+from __future__ import annotations
+
+# Standard library
+import logging
+import os
+import zlib
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from shutil import move, rmtree
+from uuid import uuid4
+from zipfile import BadZipFile, ZipFile, ZipInfo
+
+# package
+from qgis_deployment_toolbelt.__about__ import __title_clean__
+
+# #############################################################################
+# ########## Globals ###############
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+# archives whose uncompressed size exceeds this value are extracted in parallel
+PARALLEL_EXTRACTION_MIN_SIZE: int = 8 * 1024**2
+
+# prefixes of the temporary folders, hidden from QGIS which only loads folders
+# containing a metadata.txt
+STAGING_PREFIX: str = ".qdt-staging-"
+BACKUP_PREFIX: str = ".qdt-previous-"
+
+# #############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def install_plugin_archive(
+    archive_path: Path, plugins_folder: Path, max_workers: int = 4
+) -> list[Path]:
+    """Install a plugin archive into a plugins folder, replacing the installed
+        version as a whole.
+
+    The archive is extracted into a staging folder created into the plugins folder
+    (so on the same filesystem), its members in parallel for large archives. Each top
+    folder of the archive then replaces the installed one with two renames: the
+    installed folder is moved aside, the staged one takes its place and the previous
+    one is removed. If the second rename fails, the previous version is restored.
+
+    Args:
+        archive_path (Path): path to the plugin ZIP archive
+        plugins_folder (Path): profile plugins folder (.../python/plugins)
+        max_workers (int, optional): maximum number of members extracted at the same
+            time. Defaults to 4.
+
+    Raises:
+        zipfile.BadZipFile: if the archive is not a valid ZIP file (typically some
+            HTML error page returned by a proxy)
+        ValueError: if a member would be extracted outside of the staging folder
+        OSError: if the plugin can't be extracted nor moved into place
+
+    Returns:
+        list[Path]: installed plugin folders
+    """
+    plugins_folder.mkdir(parents=True, exist_ok=True)
+    staging_folder = plugins_folder.joinpath(f"{STAGING_PREFIX}{uuid4().hex}")
+    staging_folder.mkdir()
+
+    installed_folders: list[Path] = []
+    try:
+        with ZipFile(archive_path) as zip_archive:
+            extract_members(
+                zip_archive=zip_archive,
+                destination_folder=staging_folder,
+                max_workers=max_workers,
+            )
+
+        for staged_folder in sorted(staging_folder.iterdir()):
+            installed_folders.append(
+                swap_folder(
+                    staged_folder=staged_folder,
+                    target_folder=plugins_folder.joinpath(staged_folder.name),
+                )
+            )
+    finally:
+        rmtree(staging_folder, ignore_errors=True)
+
+    return installed_folders
+
+
+def extract_members(
+    zip_archive: ZipFile, destination_folder: Path, max_workers: int = 4
+) -> int:
+    """Extract every member of an archive. Folders are created first so members can
+        be written concurrently, in threads, when the archive is large enough.
+
+    Args:
+        zip_archive (ZipFile): opened archive
+        destination_folder (Path): folder where to extract members
+        max_workers (int, optional): maximum number of members extracted at the same
+            time. Defaults to 4.
+
+    Raises:
+        ValueError: if a member would be extracted outside of the destination folder
+
+    Returns:
+        int: number of extracted files
+    """
+    destination_root = os.path.realpath(destination_folder)
+    members_files: list[ZipInfo] = []
+    for member in zip_archive.infolist():
+        member_path = os.path.realpath(os.path.join(destination_root, member.filename))
+        if os.path.commonpath((destination_root, member_path)) != destination_root:
+            raise ValueError(
+                f"Archive member {member.filename} would be extracted outside of "
+                f"{destination_folder}."
+            )
+        if member.is_dir():
+            os.makedirs(member_path, exist_ok=True)
+        else:
+            os.makedirs(os.path.dirname(member_path), exist_ok=True)
+            members_files.append(member)
+
+    uncompressed_size = sum(member.file_size for member in members_files)
+    if max_workers < 2 or uncompressed_size < PARALLEL_EXTRACTION_MIN_SIZE:
+        for member in members_files:
+            zip_archive.extract(member=member, path=destination_root)
+    else:
+        # members are read through a shared file handle protected by a lock, while
+        # decompression and writes run concurrently
+        with ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=f"{__title_clean__}_plugin_extract_",
+        ) as executor:
+            list(
+                executor.map(
+                    lambda member: zip_archive.extract(
+                        member=member, path=destination_root
+                    ),
+                    members_files,
+                )
+            )
+
+    return len(members_files)
+
+
+def swap_folder(staged_folder: Path, target_folder: Path) -> Path:
+    """Replace a folder by a staged one, located on the same filesystem.
+
+    Args:
+        staged_folder (Path): folder to move into place
+        target_folder (Path): folder to replace, which may not exist
+
+    Raises:
+        OSError: if the staged folder can't be moved into place
+
+    Returns:
+        Path: target folder
+    """
+    backup_folder = None
+    if target_folder.exists():
+        backup_folder = target_folder.with_name(
+            f"{BACKUP_PREFIX}{target_folder.name}-{uuid4().hex}"
+        )
+        target_folder.rename(backup_folder)
+
+    try:
+        staged_folder.rename(target_folder)
+    except OSError:
+        if backup_folder is not None:
+            backup_folder.rename(target_folder)
+        raise
+
+    if backup_folder is not None and backup_folder.is_dir():
+        rmtree(backup_folder, ignore_errors=True)
+    elif backup_folder is not None:
+        backup_folder.unlink(missing_ok=True)
+
+    return target_folder
+
+
+def check_plugin_archive(archive_path: Path) -> str | None:
+    """Check the integrity of a plugin archive: ZIP structure and CRC of every member.
+
+    Args:
+        archive_path (Path): path to the plugin ZIP archive
+
+    Returns:
+        str | None: why the archive is invalid or None if it's valid
+    """
+    try:
+        with ZipFile(archive_path) as zip_archive:
+            bad_member = zip_archive.testzip()
+    except (BadZipFile, EOFError, NotImplementedError, OSError, zlib.error) as err:
+        return f"{err}"
+
+    if bad_member is not None:
+        return f"CRC or header check failed for member {bad_member}"
+    return None
+
+
+def check_plugins_archives(
+    archives_paths: Iterable[Path], max_workers: int = 4
+) -> dict[Path, str]:
+    """Check the integrity of plugins archives, concurrently. Decompression and CRC
+        computation release the GIL, so threads check archives in parallel.
+
+    Args:
+        archives_paths (Iterable[Path]): paths to the plugins ZIP archives
+        max_workers (int, optional): maximum number of archives checked at the same
+            time. Defaults to 4.
+
+    Returns:
+        dict[Path, str]: invalid archives with the reason
+    """
+    archives_paths = list(dict.fromkeys(archives_paths))
+    if not archives_paths:
+        return {}
+
+    with ThreadPoolExecutor(
+        max_workers=max(min(max_workers, len(archives_paths)), 1),
+        thread_name_prefix=f"{__title_clean__}_plugins_check_",
+    ) as executor:
+        checks = executor.map(check_plugin_archive, archives_paths)
+        return {
+            archive_path: error
+            for archive_path, error in zip(archives_paths, checks)
+            if error is not None
+        }
+
+
+def quarantine_archive(archive_path: Path, quarantine_folder: Path) -> Path | None:
+    """Move an invalid archive aside, keeping it for further investigation.
+
+    Args:
+        archive_path (Path): path to the invalid archive
+        quarantine_folder (Path): folder where to move invalid archives
+
+    Returns:
+        Path | None: path to the quarantined archive or None if it can't be moved
+    """
+    quarantine_folder.mkdir(parents=True, exist_ok=True)
+    quarantined_path = quarantine_folder.joinpath(
+        f"{archive_path.stem}_{datetime.now():%Y%m%dT%H%M%S%f}{archive_path.suffix}"
+    )
+    try:
+        move(archive_path, quarantined_path)
+    except OSError as err:
+        logger.error(f"Archive {archive_path} can't be quarantined. Trace: {err}")
+        return None
+
+    logger.warning(f"Archive {archive_path} quarantined to {quarantined_path}.")
+    return quarantined_path
+
+
+def remove_leftovers(plugins_folder: Path) -> int:
+    """Remove staging and backup folders left by an interrupted installation.
+
+    Args:
+        plugins_folder (Path): profile plugins folder (.../python/plugins)
+
+    Returns:
+        int: number of removed folders
+    """
+    if not plugins_folder.is_dir():
+        return 0
+
+    count_removed = 0
+    with os.scandir(plugins_folder) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False) and entry.name.startswith(
+                (STAGING_PREFIX, BACKUP_PREFIX)
+            ):
+                logger.debug(f"Removing folder left by an installation: {entry.path}")
+                rmtree(entry.path, ignore_errors=True)
+                count_removed += 1
+
+    return count_removed
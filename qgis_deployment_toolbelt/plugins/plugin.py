@@ -18,18 +18,17 @@ from __future__ import annotations
 import configparser
 import logging
 import zipfile
+from collections.abc import Iterable
 from dataclasses import dataclass, fields
 from enum import Enum
 from os.path import expanduser, expandvars
 from pathlib import Path
 from urllib.parse import quote, urlsplit, urlunsplit
 
-# 3rd party
-from packaging.version import InvalidVersion, Version
-
 # package
 from qgis_deployment_toolbelt.utils.check_path import check_path
 from qgis_deployment_toolbelt.utils.slugger import sluggy
+from qgis_deployment_toolbelt.utils.versions import parse_version
 
 # #############################################################################
 # ########## Globals ###############
@@ -152,9 +151,7 @@ class QgisPlugin:
 
         # read it
         with plugin_metadata_txt.open(encoding="UTF-8") as config_file:
-            config = configparser.ConfigParser(strict=False)
-            config.read_file(config_file)
-        plugin_md_as_dict = {k: v for k, v in config.items(section="general")}
+            plugin_md_as_dict = QgisPlugin.parse_metadata_txt(config_file=config_file)
 
         # add folder name
         plugin_md_as_dict["folder_name"] = input_plugin_folder.name
@@ -171,26 +168,62 @@ class QgisPlugin:
         Returns:
             QgisPlugin: instanciated object
         """
+        return cls.from_dict(cls.read_zip_metadata(input_zip_path=input_zip_path))
+
+    @staticmethod
+    def read_zip_metadata(input_zip_path: Path) -> dict:
+        """Read the metadata.txt of a plugin archive, added with the name of the
+            plugin folder.
+
+        Args:
+            input_zip_path (Path): filepath of the input zip
+
+        Raises:
+            ValueError: if the archive doesn't contain a metadata.txt in a folder
+
+        Returns:
+            dict: metadata of the general section, lowercased keys, and folder_name
+        """
         with zipfile.ZipFile(file=input_zip_path) as zf:
-            # find the metadata.txt file
+            # find the metadata.txt file, right under the plugin folder
             for i in zf.infolist():
-                if not i.is_dir() and i.filename.split("/")[1] == "metadata.txt":
+                filename_parts = i.filename.split("/")
+                if (
+                    not i.is_dir()
+                    and len(filename_parts) == 2
+                    and filename_parts[1] == "metadata.txt"
+                ):
                     break
+            else:
+                raise ValueError(f"No metadata.txt found in {input_zip_path}.")
 
             # open and read it
             zip_path = zipfile.Path(zf)
             metadata_file = zip_path / i.filename
             plugin_folder_name = metadata_file.parent.name
             with metadata_file.open(encoding="UTF-8") as config_file:
-                config = configparser.ConfigParser(strict=False)
-                config.read_file(config_file)
-
-        plugin_md_as_dict = {k: v for k, v in config.items(section="general")}
+                plugin_md_as_dict = QgisPlugin.parse_metadata_txt(
+                    config_file=config_file
+                )
 
         # add folder name
         plugin_md_as_dict["folder_name"] = plugin_folder_name
 
-        return cls.from_dict(plugin_md_as_dict)
+        return plugin_md_as_dict
+
+    @staticmethod
+    def parse_metadata_txt(config_file: Iterable[str]) -> dict:
+        """Parse the general section of a plugin metadata.txt.
+
+        Args:
+            config_file (Iterable[str]): opened metadata.txt
+
+        Returns:
+            dict: metadata of the general section, with lowercased keys
+        """
+        config = configparser.ConfigParser(strict=False, interpolation=None)
+        config.read_file(config_file)
+        return {k: v for k, v in config.items(section="general")}
 
     @property
     def download_url(self) -> str:
@@ -274,33 +307,28 @@ class QgisPlugin:
             # store the version string
             version_to_compare = version_to_compare.version
 
-        # load object version as packaging.Version object
-        try:
-            plugin_version = Version(self.version)
-        except InvalidVersion as err:
+        # parse versions as packaging.Version objects (memoized)
+        plugin_version = parse_version(self.version)
+        if plugin_version is None:
             logger.error(
                 f"Plugin {self.name} (current) uses an incompatible versioning scheme: "
                 f"{self.version}. It's not Semver (even prefixed by 'v'), nor Calver or "
-                "any of supported specification. See https://peps.python.org/pep-0440/. "
-                f"Trace: {err}"
+                "any of supported specification. See https://peps.python.org/pep-0440/."
             )
             return None
 
-        # load version to compare as packaging.Version object
-        try:
-            version_to_compare = Version(version_to_compare)
-        except InvalidVersion as err:
+        compared_version = parse_version(version_to_compare)
+        if compared_version is None:
             logger.error(
                 f"Plugin {self.name} (to compare) uses an incompatible versioning scheme: "
-                f"{self.version}. It's not Semver (even prefixed by 'v'), nor Calver or "
-                "any of supported specification. See https://peps.python.org/pep-0440/. "
-                f"Trace: {err}"
+                f"{version_to_compare}. It's not Semver (even prefixed by 'v'), nor Calver or "
+                "any of supported specification. See https://peps.python.org/pep-0440/."
             )
             return None
 
-        logger.debug(f"Comparing versions: {plugin_version} and {version_to_compare}")
+        logger.debug(f"Comparing versions: {plugin_version} and {compared_version}")
 
-        return plugin_version < version_to_compare
+        return plugin_version < compared_version
 
     @property
     def uri_to_zip(self) -> str:
@@ -0,0 +1,172 @@
+#! python3  # noqa: E265
+
+"""
+    Download plugins referenced by profiles while profiles are still being downloaded.
+
+    Author: Julien Moura (https://github.com/guts)
+"""
+
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import logging
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from threading import Lock
+
+# package
+from qgis_deployment_toolbelt.__about__ import __title_clean__
+from qgis_deployment_toolbelt.plugins.plugin import QgisPlugin
+from qgis_deployment_toolbelt.plugins.repository_index import (
+    resolve_plugins_from_repositories,
+)
+from qgis_deployment_toolbelt.profiles.qdt_profile import QdtProfile
+
+# #############################################################################
+# ########## Globals ###############
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class PluginsPrefetcher:
+    """Download the plugins of profiles as soon as their profile.json are known, in
+    background threads, so that plugins and profiles transfers overlap.
+
+    Plugins are stored where the plugins downloader expects them, which then finds
+    them already there.
+    """
+
+    def __init__(
+        self,
+        download_plugin: Callable[[QgisPlugin, Path], Path],
+        plugins_folder: Path,
+        repositories_index_folder: Path,
+        threads: int = 5,
+    ) -> None:
+        """Object instanciation.
+
+        Args:
+            download_plugin (Callable[[QgisPlugin, Path], Path]): function downloading
+                a plugin archive to a local path
+            plugins_folder (Path): folder where plugins archives are stored
+            repositories_index_folder (Path): folder where plugins repositories
+                indexes are stored
+            threads (int, optional): maximum number of plugins downloaded at the same
+                time. Defaults to 5.
+        """
+        self.download_plugin = download_plugin
+        self.plugins_folder = plugins_folder
+        self.repositories_index_folder = repositories_index_folder
+
+        self.downloaded_plugins: list[QgisPlugin] = []
+        self.failed_plugins: list[QgisPlugin] = []
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=threads,
+            thread_name_prefix=f"{__title_clean__}_plugins_prefetch_",
+        )
+        self._futures: list[Future] = []
+        self._lock = Lock()
+        # repositories indexes are updated and read by one thread at a time
+        self._resolve_lock = Lock()
+        self._enqueued_plugins: set[str] = set()
+
+    def enqueue_profiles(self, profiles: Iterable[QdtProfile]) -> None:
+        """Enqueue the plugins of profiles. It returns immediately: plugins are
+            resolved and downloaded in background.
+
+        Args:
+            profiles (Iterable[QdtProfile]): profiles whose plugins to download
+        """
+        plugins = [plugin for profile in profiles for plugin in profile.plugins]
+        if plugins:
+            self._submit(self._resolve_and_download, plugins)
+
+    def wait(self) -> tuple[list[QgisPlugin], list[QgisPlugin]]:
+        """Wait for every enqueued plugin and stop the background threads.
+
+        Returns:
+            tuple[list[QgisPlugin], list[QgisPlugin]]: tuple of (downloaded plugins,
+                failed downloads)
+        """
+        while True:
+            with self._lock:
+                pending_futures = [f for f in self._futures if not f.done()]
+            if not pending_futures:
+                break
+            wait(pending_futures)
+
+        self._executor.shutdown(wait=True)
+        return self.downloaded_plugins, self.failed_plugins
+
+    def _submit(self, func: Callable, *args) -> None:
+        """Run a function in background, keeping track of it.
+
+        Args:
+            func (Callable): function to run
+        """
+        with self._lock:
+            self._futures.append(self._executor.submit(func, *args))
+
+    def _resolve_and_download(self, plugins: list[QgisPlugin]) -> None:
+        """Resolve plugins versions and URLs, then enqueue the download of those which
+            are remote, not enqueued yet and not already stored.
+
+        Args:
+            plugins (list[QgisPlugin]): plugins to download
+        """
+        try:
+            with self._resolve_lock:
+                resolved_plugins = resolve_plugins_from_repositories(
+                    plugins=plugins, cache_folder=self.repositories_index_folder
+                )
+        except Exception as err:
+            logger.warning(
+                f"Resolving plugins to prefetch failed, they will be downloaded by the "
+                f"plugins downloader. Trace: {err}"
+            )
+            return
+
+        for plugin in resolved_plugins:
+            if plugin.location != "remote" or not plugin.download_url:
+                continue
+            plugin_download_path = Path(
+                self.plugins_folder, f"{plugin.id_with_version}.zip"
+            )
+            with self._lock:
+                if plugin.id_with_version in self._enqueued_plugins:
+                    continue
+                self._enqueued_plugins.add(plugin.id_with_version)
+            if plugin_download_path.is_file():
+                continue
+            self._submit(self._download, plugin, plugin_download_path)
+
+    def _download(self, plugin: QgisPlugin, plugin_download_path: Path) -> None:
+        """Download a plugin, recording the outcome.
+
+        Args:
+            plugin (QgisPlugin): plugin to download
+            plugin_download_path (Path): local path where to store the archive
+        """
+        try:
+            self.download_plugin(plugin, plugin_download_path)
+            logger.info(
+                f"Plugin {plugin.name} prefetched from {plugin.download_url} to "
+                f"{plugin_download_path}"
+            )
+            with self._lock:
+                self.downloaded_plugins.append(plugin)
+        except Exception as err:
+            logger.error(f"Prefetching plugin {plugin.name} failed. Trace: {err}")
+            with self._lock:
+                self.failed_plugins.append(plugin)
@@ -0,0 +1,439 @@
+#! python3  # noqa: E265
+
+"""
+    Index of QGIS plugins repositories (plugins.xml), fetched conditionally, parsed
+    incrementally and cached on disk as a compact JSON file.
+
+    Author: Julien Moura (https://github.com/guts)
+"""
+
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# special
+from __future__ import annotations
+
+# Standard library
+import logging
+import xml.etree.ElementTree as ET
+from collections.abc import Iterable, Iterator
+from dataclasses import replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO
+from urllib.parse import urlsplit
+
+# package
+from qgis_deployment_toolbelt.plugins.plugin import QgisPlugin
+from qgis_deployment_toolbelt.utils.file_downloader import build_http_session
+from qgis_deployment_toolbelt.utils.json_files import (
+    load_json_file,
+    write_json_atomically,
+)
+from qgis_deployment_toolbelt.utils.network_scheduler import request_with_retries
+from qgis_deployment_toolbelt.utils.slugger import sluggy
+from qgis_deployment_toolbelt.utils.versions import version_key
+
+# #############################################################################
+# ########## Globals ###############
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+# XML tag of a plugin entry in plugins.xml
+PLUGIN_ENTRY_TAG: str = "pyqgis_plugin"
+
+# children tags of a plugin entry kept in the index
+INDEXED_TAGS: tuple[str, ...] = (
+    "download_url",
+    "experimental",
+    "file_name",
+    "qgis_maximum_version",
+    "qgis_minimum_version",
+)
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class QgisPluginsRepositoryIndex:
+    """Compact local index of a QGIS plugins repository (plugins.xml).
+
+    The index is stored as a JSON file with this structure:
+
+    .. code-block:: json
+
+        {
+            "url": "https://plugins.qgis.org/plugins/plugins.xml",
+            "etag": "...",
+            "last_modified": "...",
+            "updated": "2024-12-04T10:00:00+00:00",
+            "entries": [{"name": "QTribu", "version": "0.14.2", ...}],
+            "lookup": {"qtribu": [0], "2733": [0]}
+        }
+
+    Where lookup maps lowercased names, folder names and plugin ids to the entries
+    positions.
+    """
+
+    def __init__(self, repository_url_xml: str, cache_folder: Path) -> None:
+        """Object instanciation.
+
+        Args:
+            repository_url_xml (str): URL to the plugins.xml of the repository
+            cache_folder (Path): folder where to store the local index
+        """
+        self.repository_url_xml = repository_url_xml
+        url_parts = urlsplit(repository_url_xml)
+        self.index_path = cache_folder.joinpath(
+            f"{sluggy(url_parts.netloc)}_{sluggy(url_parts.path)}.json"
+        )
+
+        self.etag: str | None = None
+        self.last_modified: str | None = None
+        self.entries: list[dict] = []
+        self.lookup: dict[str, list[int]] = {}
+
+        self.load()
+
+    # -- I/O -----------------------------------------------------------------
+    def load(self) -> bool:
+        """Load the local index, if it exists.
+
+        Returns:
+            bool: True if the index has been loaded
+        """
+        index_data = load_json_file(file_path=self.index_path)
+        if index_data is None:
+            return False
+
+        self.etag = index_data.get("etag")
+        self.last_modified = index_data.get("last_modified")
+        self.entries = index_data.get("entries", [])
+        self.lookup = index_data.get("lookup", {})
+        return True
+
+    def save(self) -> Path:
+        """Write the local index, atomically.
+
+        Returns:
+            Path: path to the index file
+        """
+        return write_json_atomically(
+            json_data={
+                "url": self.repository_url_xml,
+                "etag": self.etag,
+                "last_modified": self.last_modified,
+                "updated": datetime.now(tz=timezone.utc).isoformat(),
+                "entries": self.entries,
+                "lookup": self.lookup,
+            },
+            file_path=self.index_path,
+        )
+
+    @property
+    def is_empty(self) -> bool:
+        """Tell if the index has no entries.
+
+        Returns:
+            bool: True if there is no plugin indexed
+        """
+        return not len(self.entries)
+
+    # -- Fetch and parse -----------------------------------------------------
+    def update(self, timeout: tuple[int, int] = (30, 300)) -> bool:
+        """Fetch the repository plugins.xml only if it changed since the previous
+            fetch (using ETag and Last-Modified validators) and rebuild the index,
+            parsing the XML while it's downloaded.
+
+        Args:
+            timeout (tuple[int, int], optional): custom timeout (request, response).
+                Defaults to (30, 300).
+
+        Returns:
+            bool: True if the index is usable (updated or still valid)
+        """
+        conditional_headers = {}
+        if not self.is_empty:
+            if self.etag:
+                conditional_headers["If-None-Match"] = self.etag
+            if self.last_modified:
+                conditional_headers["If-Modified-Since"] = self.last_modified
+
+        try:
+            with build_http_session(
+                url=self.repository_url_xml, content_type="application/xml, text/xml"
+            ) as session:
+                with request_with_retries(
+                    url=self.repository_url_xml,
+                    session=session,
+                    headers=conditional_headers,
+                    stream=True,
+                    timeout=timeout,
+                ) as response:
+                    if response.status_code == 304:
+                        logger.debug(
+                            f"Plugins repository {self.repository_url_xml} has not "
+                            f"changed since last fetch. Using index {self.index_path}."
+                        )
+                        return True
+                    response.raise_for_status()
+
+                    # let urllib3 handle gzip/deflate transparently while reading
+                    response.raw.decode_content = True
+                    self.build_from_xml(xml_stream=response.raw)
+                    self.etag = response.headers.get("ETag")
+                    self.last_modified = response.headers.get("Last-Modified")
+        except Exception as err:
+            logger.error(
+                f"Updating index of plugins repository {self.repository_url_xml} "
+                f"failed. Trace: {err}"
+            )
+            return not self.is_empty
+
+        self.save()
+        logger.info(
+            f"Index of plugins repository {self.repository_url_xml} updated: "
+            f"{len(self.entries)} plugins versions."
+        )
+        return True
+
+    def build_from_xml(self, xml_stream: IO[bytes] | Path) -> None:
+        """(Re)build the index from a plugins.xml stream or file.
+
+        Args:
+            xml_stream (IO[bytes] | Path): file-like object or path to the plugins.xml
+        """
+        self.entries = []
+        self.lookup = {}
+
+        for entry in iter_plugins_xml_entries(xml_source=xml_stream):
+            entry_position = len(self.entries)
+            self.entries.append(entry)
+            for lookup_key in {
+                entry.get("name", "").lower(),
+                (entry.get("folder_name") or "").lower(),
+                entry.get("plugin_id") or "",
+            }:
+                if lookup_key:
+                    self.lookup.setdefault(lookup_key, []).append(entry_position)
+
+    # -- Resolution ----------------------------------------------------------
+    def find_entries(self, plugin: QgisPlugin) -> list[dict]:
+        """List indexed versions of a plugin, looking up by plugin id, then folder name,
+            then name.
+
+        Args:
+            plugin (QgisPlugin): plugin to look for
+
+        Returns:
+            list[dict]: matching index entries
+        """
+        for lookup_key in (plugin.plugin_id, plugin.folder_name, plugin.name):
+            if not lookup_key:
+                continue
+            if positions := self.lookup.get(str(lookup_key).lower()):
+                return [self.entries[i] for i in positions]
+
+        return []
+
+    def resolve(self, plugin: QgisPlugin) -> QgisPlugin | None:
+        """Resolve version and download URL of a plugin from the index. If the plugin
+            version is 'latest' (or not set), the most recent stable version is used.
+
+        Args:
+            plugin (QgisPlugin): plugin to resolve
+
+        Returns:
+            QgisPlugin | None: a new plugin object with version and URL resolved or
+                None if no matching entry is found
+        """
+        entries = self.find_entries(plugin=plugin)
+        if not entries:
+            return None
+
+        if plugin.version in (None, "", "latest"):
+            stable_entries = [e for e in entries if not e.get("experimental")]
+            matching_entry = max(
+                stable_entries or entries, key=lambda e: version_key(e["version"])
+            )
+        else:
+            matching_entry = next(
+                (e for e in entries if e.get("version") == plugin.version), None
+            )
+            if matching_entry is None:
+                return None
+
+        return replace(
+            plugin,
+            folder_name=plugin.folder_name or matching_entry.get("folder_name"),
+            plugin_id=plugin.plugin_id or _as_int(matching_entry.get("plugin_id")),
+            qgis_maximum_version=plugin.qgis_maximum_version
+            or matching_entry.get("qgis_maximum_version"),
+            qgis_minimum_version=plugin.qgis_minimum_version
+            or matching_entry.get("qgis_minimum_version"),
+            repository_url_xml=self.repository_url_xml,
+            url=matching_entry.get("download_url"),
+            version=matching_entry.get("version"),
+        )
+
+
+# #############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def _as_int(value: str | None) -> int | None:
+    """Convert a value to integer, if possible.
+
+    Args:
+        value (str | None): value to convert
+
+    Returns:
+        int | None: integer or None if the value can't be converted
+    """
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def iter_plugins_xml_entries(xml_source: IO[bytes] | Path) -> Iterator[dict]:
+    """Parse a plugins.xml incrementally, yielding one compact dictionary per plugin
+        version. Parsed elements are freed as soon as they are read, so the whole
+        document is never loaded in memory.
+
+    Args:
+        xml_source (IO[bytes] | Path): file-like object or path to the plugins.xml
+
+    Yields:
+        Iterator[dict]: plugin entry with name, version, plugin_id, folder_name and
+            indexed tags
+    """
+    root = None
+    for event, element in ET.iterparse(xml_source, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = element
+            continue
+
+        if element.tag != PLUGIN_ENTRY_TAG:
+            continue
+
+        entry = {
+            "name": element.get("name"),
+            "version": element.get("version") or element.findtext("version"),
+            "plugin_id": element.get("plugin_id"),
+        }
+        for tag in INDEXED_TAGS:
+            entry[tag] = (element.findtext(tag) or "").strip() or None
+        entry["experimental"] = str(entry.get("experimental")).lower() == "true"
+        entry["folder_name"] = _folder_name_from_entry(entry)
+
+        # free memory: children of root are not needed anymore
+        element.clear()
+        root.clear()
+
+        if entry.get("name") and entry.get("version"):
+            yield entry
+
+
+def _folder_name_from_entry(entry: dict) -> str | None:
+    """Guess the plugin folder name from the archive file name (folder.version.zip).
+
+    Args:
+        entry (dict): plugin entry
+
+    Returns:
+        str | None: folder name or None if it can't be guessed
+    """
+    file_name: str | None = entry.get("file_name")
+    version: str | None = entry.get("version")
+    if not file_name:
+        return None
+
+    suffix = f".{version}.zip"
+    if version and file_name.endswith(suffix):
+        return file_name[: -len(suffix)]
+
+    return file_name.split(".")[0]
+
+
+def plugin_needs_resolution(plugin: QgisPlugin) -> bool:
+    """Tell if a plugin version or download URL must be resolved from its repository.
+
+    Args:
+        plugin (QgisPlugin): plugin to check
+
+    Returns:
+        bool: True if version is 'latest' (or not set) or if URL is unknown
+    """
+    if plugin.location == "local":
+        return False
+
+    # without repository, only plugins without any URL can be looked up (official)
+    if not plugin.repository_url_xml:
+        return not plugin.url and plugin.official_repository is not False
+
+    return plugin.version in (None, "", "latest") or not plugin.url
+
+
+def resolve_plugins_from_repositories(
+    plugins: Iterable[QgisPlugin], cache_folder: Path, offline: bool = False
+) -> list[QgisPlugin]:
+    """Resolve versions and download URLs of plugins from their repositories indexes,
+        in one pass: each repository index is updated at most once.
+
+    Args:
+        plugins (Iterable[QgisPlugin]): plugins to resolve
+        cache_folder (Path): folder where repositories indexes are stored
+        offline (bool, optional): if True, only local indexes are used, without any
+            network request. Defaults to False.
+
+    Returns:
+        list[QgisPlugin]: plugins, resolved when needed and possible, in the same order
+    """
+    plugins = list(plugins)
+    indexes: dict[str, QgisPluginsRepositoryIndex | None] = {}
+    resolved_plugins: list[QgisPlugin] = []
+
+    for plugin in plugins:
+        if not plugin_needs_resolution(plugin=plugin):
+            resolved_plugins.append(plugin)
+            continue
+
+        repository_url_xml = (
+            plugin.repository_url_xml or QgisPlugin.OFFICIAL_REPOSITORY_XML
+        )
+
+        if repository_url_xml not in indexes:
+            repository_index = QgisPluginsRepositoryIndex(
+                repository_url_xml=repository_url_xml, cache_folder=cache_folder
+            )
+            if not offline:
+                repository_index.update()
+            indexes[repository_url_xml] = (
+                None if repository_index.is_empty else repository_index
+            )
+
+        repository_index = indexes.get(repository_url_xml)
+        resolved_plugin = repository_index.resolve(plugin) if repository_index else None
+        if resolved_plugin is None:
+            (logger.debug if offline else logger.warning)(
+                f"Plugin {plugin.name} (version: {plugin.version}) could not be "
+                f"resolved from repository {repository_url_xml}."
+            )
+            resolved_plugins.append(plugin)
+            continue
+
+        logger.debug(
+            f"Plugin {plugin.name} resolved from {repository_url_xml}: version "
+            f"{resolved_plugin.version} at {resolved_plugin.url}"
+        )
+        resolved_plugins.append(resolved_plugin)
+
+    return resolved_plugins
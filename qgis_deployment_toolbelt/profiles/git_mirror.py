@@ -0,0 +1,302 @@
+#! python3  # noqa: E265
+
+"""
+    Local mirror of remote git repositories, shared by every scenario: objects are
+    fetched once into a bare repository and scenarios working trees borrow them through
+    git alternates.
+
+    Author: Julien Moura (https://github.com/guts)
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import logging
+import time
+from collections.abc import Callable
+from pathlib import Path
+from shutil import rmtree
+from urllib.parse import urlsplit
+
+# 3rd party
+from dulwich.client import get_transport_and_path
+from dulwich.errors import NotGitRepository
+from dulwich.repo import Repo
+
+# package
+from qgis_deployment_toolbelt.constants import get_qdt_working_directory
+from qgis_deployment_toolbelt.profiles.git_worktree import (
+    build_profiles_paths_filter,
+    get_head_tree_id,
+    update_working_tree,
+)
+from qgis_deployment_toolbelt.utils.cache_manager import CACHE_USAGE
+from qgis_deployment_toolbelt.utils.file_lock import FileLock
+from qgis_deployment_toolbelt.utils.run_metrics import RUN_METRICS
+from qgis_deployment_toolbelt.utils.single_flight import SingleFlight
+from qgis_deployment_toolbelt.utils.slugger import sluggy
+
+# #############################################################################
+# ########## Globals ###############
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+# mirrors fetched during the current run, by mirror path
+GIT_MIRRORS_REGISTRY = SingleFlight()
+
+# name of the file touched after each successful fetch of a mirror
+_FETCH_MARKER_NAME = "qdt_last_fetch"
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class GitMirror:
+    """Bare repository mirroring the branches and tags of a remote repository, stored
+    under the QDT working directory and keyed by the remote URL.
+
+    .. code-block:: python
+
+        mirror = GitMirror(remote_url="https://gitlab.com/Oslandia/qgis/profils.git")
+        mirror.update()
+        mirror.checkout(local_path=Path("repositories/scenario-a"), branch="main")
+    """
+
+    def __init__(self, remote_url: str, mirrors_folder: Path | None = None) -> None:
+        """Object instanciation.
+
+        Args:
+            remote_url (str): URL of the remote repository
+            mirrors_folder (Path | None, optional): folder where mirrors are stored.
+                If None, 'git_mirrors' in the QDT working directory is used. Defaults
+                to None.
+        """
+        self.remote_url = str(remote_url)
+        # paths changed by the last checkout, None if the whole tree was written
+        self.changed_paths: tuple[str, ...] | None = None
+        if mirrors_folder is None:
+            mirrors_folder = get_qdt_working_directory().joinpath("git_mirrors")
+
+        # credentials (user:token@) must not end up in a folder name
+        url_parts = urlsplit(self.remote_url)
+        url_host = url_parts.hostname or ""
+        if url_parts.port:
+            url_host += f"-{url_parts.port}"
+        self.mirror_path: Path = Path(mirrors_folder).joinpath(
+            f"{sluggy(f'{url_host}{url_parts.path}'.strip('/'))}.git"
+        )
+
+    def open(self) -> Repo:
+        """Open the mirror repository, creating it if needed.
+
+        Returns:
+            Repo: bare mirror repository
+        """
+        if self.mirror_path.joinpath("objects").is_dir():
+            try:
+                return Repo(root=f"{self.mirror_path}", bare=True)
+            except NotGitRepository as err:
+                logger.warning(f"Invalid git mirror {self.mirror_path}. Trace: {err}")
+
+        logger.debug(f"Creating git mirror {self.mirror_path}")
+        rmtree(self.mirror_path, ignore_errors=True)
+        self.mirror_path.mkdir(parents=True, exist_ok=True)
+        return Repo.init_bare(path=f"{self.mirror_path}")
+
+    def update(self, transport_options: dict | None = None) -> bool:
+        """Fetch the remote into the mirror, once per run whatever the number of
+            scenarios or jobs asking for it. A lock file serializes the processes
+            sharing the mirror and a process waiting for another one fetching the same
+            remote reuses its result.
+
+        Args:
+            transport_options (dict | None, optional): keyword arguments for dulwich
+                transport, i.e. a pool manager. Defaults to None.
+
+        Returns:
+            bool: True if the remote has been fetched by this call, False if a fetch
+                done during the run was reused
+        """
+        CACHE_USAGE.touch(self.mirror_path)
+        fetched, shared = GIT_MIRRORS_REGISTRY.do(
+            f"{self.mirror_path}",
+            self._update_locked,
+            transport_options=transport_options or {},
+        )
+        return fetched and not shared
+
+    def _update_locked(self, transport_options: dict) -> bool:
+        """Fetch the remote into the mirror, holding the mirror lock file.
+
+        Args:
+            transport_options (dict): keyword arguments for dulwich transport
+
+        Returns:
+            bool: True if the remote has been fetched, False if another process just
+                did it
+        """
+        waiting_since = time.time()
+        self.mirror_path.parent.mkdir(parents=True, exist_ok=True)
+        with FileLock(self.mirror_path.with_name(f"{self.mirror_path.name}.lock")):
+            fetch_marker = self.mirror_path.joinpath(_FETCH_MARKER_NAME)
+            if fetch_marker.exists() and fetch_marker.stat().st_mtime >= waiting_since:
+                logger.info(
+                    f"Git mirror of {self.remote_url} has just been updated by another "
+                    "process."
+                )
+                return False
+
+            with self.open() as mirror_repo:
+                self._fetch(
+                    mirror_repo=mirror_repo, transport_options=transport_options
+                )
+            fetch_marker.touch()
+
+        return True
+
+    def _fetch(self, mirror_repo: Repo, transport_options: dict) -> None:
+        """Fetch every object and mirror branches, tags and HEAD of the remote.
+
+        Args:
+            mirror_repo (Repo): bare mirror repository
+            transport_options (dict): keyword arguments for dulwich transport
+        """
+        logger.info(f"Updating git mirror of {self.remote_url} ({self.mirror_path})")
+        client, remote_path = get_transport_and_path(
+            self.remote_url, **transport_options
+        )
+        fetch_result = client.fetch(remote_path, mirror_repo)
+        RUN_METRICS.increment("git_mirror.fetches")
+
+        remote_refs = {
+            ref: sha
+            for ref, sha in fetch_result.refs.items()
+            if ref.startswith((b"refs/heads/", b"refs/tags/"))
+            and not ref.endswith(b"^{}")
+        }
+        # remove branches and tags deleted on the remote
+        for ref in list(mirror_repo.refs.keys()):
+            if (
+                ref.startswith((b"refs/heads/", b"refs/tags/"))
+                and ref not in remote_refs
+            ):
+                mirror_repo.refs.remove_if_equals(ref, None)
+        for ref, sha in remote_refs.items():
+            mirror_repo.refs[ref] = sha
+
+        if remote_head := fetch_result.symrefs.get(b"HEAD"):
+            mirror_repo.refs.set_symbolic_ref(b"HEAD", remote_head)
+
+    def checkout(
+        self,
+        local_path: Path,
+        branch: str | None = None,
+        profiles_selector: Callable[[dict[str, bytes]], set[str]] | None = None,
+        profiles_observer: Callable[[dict[str, bytes]], None] | None = None,
+    ) -> Repo:
+        """Create or update a working tree from the mirror, without copying objects:
+            the local repository reads them from the mirror through git alternates.
+
+        Args:
+            local_path (Path): working tree folder
+            branch (str | None, optional): branch to check out. If None, the default
+                branch of the remote is used. Defaults to None.
+            profiles_selector (Callable[[dict[str, bytes]], set[str]] | None, optional):
+                function picking the profiles folders to check out from the
+                profile.json contents. If None, the whole tree is checked out. Defaults
+                to None.
+            profiles_observer (Callable[[dict[str, bytes]], None] | None, optional):
+                function receiving the profile.json contents before the checkout,
+                without restricting it. Defaults to None.
+
+        Raises:
+            KeyError: if the branch doesn't exist in the mirror
+
+        Returns:
+            Repo: the local repository object
+        """
+        if isinstance(branch, bytes):
+            branch = branch.decode()
+
+        with Repo(root=f"{self.mirror_path}", bare=True) as mirror_repo:
+            if branch:
+                branch_ref = f"refs/heads/{branch}".encode()
+            else:
+                branch_ref = mirror_repo.refs.follow(b"HEAD")[0][-1]
+            commit_sha = mirror_repo.refs[branch_ref]
+            mirror_objects_path = Path(mirror_repo.object_store.path).resolve()
+
+        local_repo = self._open_or_init_working_tree(local_path=local_path)
+
+        # borrow objects from the mirror
+        alternates_path = Path(local_repo.object_store.path, "info", "alternates")
+        if not alternates_path.is_file() or f"{mirror_objects_path}" not in (
+            alternates_path.read_text(encoding="UTF-8").splitlines()
+        ):
+            local_repo.object_store.add_alternate_path(f"{mirror_objects_path}")
+
+        config = local_repo.get_config()
+        config.set((b"remote", b"origin"), b"url", self.remote_url.encode())
+        config.set(
+            (b"remote", b"origin"), b"fetch", b"+refs/heads/*:refs/remotes/origin/*"
+        )
+        config.write_to_path()
+
+        # write only what changed since the previous checkout
+        old_tree = get_head_tree_id(repo=local_repo)
+        new_tree = local_repo[commit_sha].tree
+
+        local_repo.refs[branch_ref] = commit_sha
+        local_repo.refs[
+            branch_ref.replace(b"refs/heads/", b"refs/remotes/origin/", 1)
+        ] = commit_sha
+        local_repo.refs.set_symbolic_ref(b"HEAD", branch_ref)
+        self.changed_paths = update_working_tree(
+            repo=local_repo,
+            old_tree_id=old_tree,
+            new_tree_id=new_tree,
+            include_path=build_profiles_paths_filter(
+                object_store=local_repo.object_store,
+                tree_id=new_tree,
+                profiles_selector=profiles_selector,
+                profiles_observer=profiles_observer,
+            ),
+        )
+
+        logger.debug(
+            f"Working tree {local_path} checked out from git mirror at "
+            f"{branch_ref.decode()} ({commit_sha.decode()})."
+        )
+        return local_repo
+
+    def _open_or_init_working_tree(self, local_path: Path) -> Repo:
+        """Open the local repository or create it, replacing any other content.
+
+        Args:
+            local_path (Path): working tree folder
+
+        Returns:
+            Repo: the local repository object
+        """
+        try:
+            return Repo(root=f"{local_path}")
+        except NotGitRepository:
+            if local_path.exists():
+                logger.debug(f"{local_path} is not a git repository. Replacing it.")
+                rmtree(local_path, ignore_errors=True)
+            local_path.mkdir(parents=True, exist_ok=True)
+            return Repo.init(path=f"{local_path}")
+
+
+# #############################################################################
+# ##### Stand alone program ########
+# ##################################
+
+if __name__ == "__main__":
+    """Standalone execution."""
+    pass
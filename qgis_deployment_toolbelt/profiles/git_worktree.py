@@ -0,0 +1,235 @@
+#! python3  # noqa: E265
+
+"""
+    Update a git working tree from a tree to another, writing only changed paths and
+    optionally only the profiles folders selected from their profile.json.
+
+    Author: Julien Moura (https://github.com/guts)
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import logging
+import os
+from collections.abc import Callable
+from pathlib import Path
+from shutil import rmtree
+
+# 3rd party
+from dulwich.index import build_file_from_blob, index_entry_from_stat, validate_path
+from dulwich.object_store import BaseObjectStore, iter_tree_contents
+from dulwich.objects import S_ISGITLINK
+from dulwich.repo import Repo
+
+# #############################################################################
+# ########## Globals ###############
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+PROFILE_JSON_NAME: bytes = b"profile.json"
+
+# #############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def _remove_empty_parents(file_path: Path, root_path: Path) -> None:
+    """Remove the parent folders of a deleted file which became empty, up to the
+        working tree root.
+
+    Args:
+        file_path (Path): deleted file path
+        root_path (Path): working tree root
+    """
+    for parent in file_path.parents:
+        if parent == root_path or not parent.is_relative_to(root_path):
+            break
+        try:
+            parent.rmdir()
+        except OSError:
+            break
+
+
+def get_head_tree_id(repo: Repo) -> bytes | None:
+    """Get the tree of the commit checked out in a repository.
+
+    Args:
+        repo (Repo): repository
+
+    Returns:
+        bytes | None: tree id or None if HEAD doesn't point to an available commit
+    """
+    try:
+        return repo[repo.head()].tree
+    except KeyError:
+        return None
+
+
+def update_working_tree(
+    repo: Repo,
+    old_tree_id: bytes | None,
+    new_tree_id: bytes,
+    include_path: Callable[[bytes], bool] | None = None,
+) -> tuple[str, ...] | None:
+    """Move the working tree and the index of a repository to a tree. The index tells
+        what is currently checked out: only paths whose content or mode differ are
+        written and paths no longer wanted are deleted, so untouched files keep their
+        modification time.
+
+    Args:
+        repo (Repo): repository with a working tree
+        old_tree_id (bytes | None): tree currently checked out, None if unknown
+        new_tree_id (bytes): tree to check out
+        include_path (Callable[[bytes], bool] | None, optional): predicate on tree
+            paths to check out only a part of the tree (sparse checkout). If None,
+            every path is checked out. Defaults to None.
+
+    Returns:
+        tuple[str, ...] | None: paths (relative to the working tree, POSIX style)
+            which changed, None if there was no previous tree
+    """
+    root_path = Path(repo.path).resolve()
+    honor_filemode = repo.get_config().get_boolean(
+        b"core", b"filemode", os.name != "nt"
+    )
+    index = repo.open_index()
+    changed_paths: list[str] = []
+
+    wanted_entries = {
+        entry.path: entry
+        for entry in iter_tree_contents(repo.object_store, new_tree_id)
+        if validate_path(entry.path)
+        and not S_ISGITLINK(entry.mode)
+        and (include_path is None or include_path(entry.path))
+    }
+
+    # remove paths which are no longer wanted
+    for indexed_path in list(index):
+        if indexed_path in wanted_entries or S_ISGITLINK(index[indexed_path].mode):
+            continue
+        old_file_path = root_path.joinpath(indexed_path.decode())
+        if old_file_path.is_file() or old_file_path.is_symlink():
+            old_file_path.unlink()
+        del index[indexed_path]
+        _remove_empty_parents(file_path=old_file_path, root_path=root_path)
+        changed_paths.append(indexed_path.decode())
+
+    # write new and modified paths
+    for tree_path, entry in wanted_entries.items():
+        new_file_path = root_path.joinpath(tree_path.decode())
+        if tree_path in index:
+            indexed_entry = index[tree_path]
+            if (
+                indexed_entry.sha == entry.sha
+                and indexed_entry.mode == entry.mode
+                and (new_file_path.exists() or new_file_path.is_symlink())
+            ):
+                continue
+
+        if new_file_path.is_dir() and not new_file_path.is_symlink():
+            rmtree(new_file_path)
+        new_file_path.parent.mkdir(parents=True, exist_ok=True)
+        if new_file_path.is_symlink():
+            new_file_path.unlink()
+
+        file_stat = build_file_from_blob(
+            repo.object_store[entry.sha],
+            entry.mode,
+            os.fsencode(new_file_path),
+            honor_filemode=honor_filemode,
+        )
+        index[tree_path] = index_entry_from_stat(file_stat, entry.sha, mode=entry.mode)
+        changed_paths.append(tree_path.decode())
+
+    index.write()
+
+    logger.debug(
+        f"{len(changed_paths)} path(s) updated in the working tree {root_path}."
+    )
+    if old_tree_id is None:
+        return None
+    return tuple(changed_paths)
+
+
+def read_profiles_json_from_tree(
+    object_store: BaseObjectStore, tree_id: bytes
+) -> dict[str, bytes]:
+    """Read every profile.json of a tree straight from the object store, without
+        checking anything out.
+
+    Args:
+        object_store (BaseObjectStore): repository object store
+        tree_id (bytes): tree to look into
+
+    Returns:
+        dict[str, bytes]: profile.json content by profile folder (relative to the tree
+            root, POSIX style, empty string for the root itself)
+    """
+    return {
+        entry.path.rpartition(b"/")[0].decode(): object_store[entry.sha].data
+        for entry in iter_tree_contents(object_store, tree_id)
+        if entry.path == PROFILE_JSON_NAME
+        or entry.path.endswith(b"/" + PROFILE_JSON_NAME)
+    }
+
+
+def build_profiles_paths_filter(
+    object_store: BaseObjectStore,
+    tree_id: bytes,
+    profiles_selector: Callable[[dict[str, bytes]], set[str]] | None,
+    profiles_observer: Callable[[dict[str, bytes]], None] | None = None,
+) -> Callable[[bytes], bool] | None:
+    """Build the predicate restricting a checkout to the profiles folders picked by
+        a selector from the profile.json files of the tree. The profile.json files are
+        also handed to the observer, if any, before anything is checked out.
+
+    Args:
+        object_store (BaseObjectStore): repository object store
+        tree_id (bytes): tree to check out
+        profiles_selector (Callable[[dict[str, bytes]], set[str]] | None): function
+            receiving profile.json contents by profile folder and returning the
+            folders to check out. If None, everything is checked out.
+        profiles_observer (Callable[[dict[str, bytes]], None] | None, optional):
+            function receiving profile.json contents by profile folder, without
+            restricting the checkout. Defaults to None.
+
+    Returns:
+        Callable[[bytes], bool] | None: predicate on tree paths, None to check out
+            everything
+    """
+    if profiles_selector is None and profiles_observer is None:
+        return None
+
+    profiles_json = read_profiles_json_from_tree(
+        object_store=object_store, tree_id=tree_id
+    )
+    if profiles_observer is not None:
+        profiles_observer(profiles_json)
+    if profiles_selector is None:
+        return None
+
+    selected_folders = profiles_selector(profiles_json)
+    logger.info(
+        f"{len(selected_folders)}/{len(profiles_json)} profiles selected for checkout: "
+        f"{', '.join(sorted(selected_folders))}"
+    )
+    # a profile at the repository root means the whole tree
+    if "" in selected_folders:
+        return None
+
+    selected_prefixes = tuple(f"{folder}/".encode() for folder in selected_folders)
+    return lambda tree_path: tree_path.startswith(selected_prefixes)
+
+
+# #############################################################################
+# ##### Stand alone program ########
+# ##################################
+
+if __name__ == "__main__":
+    """Standalone execution."""
+    pass
@@ -0,0 +1,421 @@
+#! python3  # noqa: E265
+
+"""
+    Handle profiles published in a plain folder, typically on a network share (SMB,
+    NFS).
+
+    Author: Julien Moura (https://github.com/guts).
+"""
+
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import hashlib
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path, PurePosixPath
+from typing import NamedTuple
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+# project
+from qgis_deployment_toolbelt.__about__ import __title_clean__
+from qgis_deployment_toolbelt.profiles.profiles_handler_base import (
+    RemoteProfilesHandlerBase,
+)
+from qgis_deployment_toolbelt.utils.shared_cache import (
+    MTIME_TOLERANCE_NS,
+    copy_file_atomically,
+)
+
+# #############################################################################
+# ########## Globals ###############
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+# entries neither synchronized nor removed: git metadata and QDT bookkeeping files
+# (e.g. staging folders of plugins installations) stored into the destination folder
+IGNORED_ENTRIES_NAMES: tuple[str, ...] = (".git",)
+IGNORED_ENTRIES_PREFIX: str = ".qdt"
+
+# size of the chunks read to compute checksums
+CHECKSUM_CHUNK_SIZE: int = 1024**2
+
+# #############################################################################
+# ########## Functions #############
+# ##################################
+
+
+class FileState(NamedTuple):
+    """Size and modification time of a file, as listed in its folder."""
+
+    size: int
+    mtime_ns: int
+
+
+def _scan_directory(
+    root_path: Path, relative_folder: str
+) -> tuple[dict[str, FileState], list[str]]:
+    """List a single directory. os.scandir gets the whole listing in batched requests
+        and, on Windows, the file attributes come with it, without a stat request per
+        file. Git metadata and QDT bookkeeping entries are skipped.
+
+    Args:
+        root_path (Path): root of the scanned tree
+        relative_folder (str): directory to list, relative to the root (POSIX style)
+
+    Returns:
+        tuple[dict[str, FileState], list[str]]: files states by relative path and
+            relative paths of subfolders
+    """
+    files: dict[str, FileState] = {}
+    subfolders: list[str] = []
+
+    with os.scandir(root_path.joinpath(relative_folder)) as entries:
+        for entry in entries:
+            if entry.name in IGNORED_ENTRIES_NAMES or entry.name.startswith(
+                IGNORED_ENTRIES_PREFIX
+            ):
+                continue
+            relative_path = f"{relative_folder}/{entry.name}".lstrip("/")
+            # symbolic links to folders are not followed to avoid loops
+            if entry.is_dir(follow_symlinks=False):
+                subfolders.append(relative_path)
+            elif entry.is_file():
+                entry_stat = entry.stat()
+                files[relative_path] = FileState(
+                    size=entry_stat.st_size, mtime_ns=entry_stat.st_mtime_ns
+                )
+
+    return files, subfolders
+
+
+def scan_folder_files(root_path: Path, max_workers: int = 8) -> dict[str, FileState]:
+    """List every file of a folder tree with its size and modification time. Folders
+        of a same depth are listed in parallel, hiding the latency of network
+        filesystems.
+
+    Args:
+        root_path (Path): folder to scan
+        max_workers (int, optional): maximum number of folders listed at the same
+            time. Defaults to 8.
+
+    Returns:
+        dict[str, FileState]: files states by path relative to the root (POSIX style)
+    """
+    files: dict[str, FileState] = {}
+    pending_folders: list[str] = [""]
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix=f"{__title_clean__}_folder_scan_"
+    ) as executor:
+        while pending_folders:
+            next_folders: list[str] = []
+            for folder_files, subfolders in executor.map(
+                lambda relative_folder: _scan_directory(
+                    root_path=root_path, relative_folder=relative_folder
+                ),
+                pending_folders,
+            ):
+                files.update(folder_files)
+                next_folders.extend(subfolders)
+            pending_folders = next_folders
+
+    return files
+
+
+def file_uri_to_path(file_uri: str) -> Path:
+    """Convert a file URI to a local path. A host part is turned into a UNC path:
+        'file://server/share/profiles' becomes '//server/share/profiles'.
+
+    Args:
+        file_uri (str): URI starting with 'file://'
+
+    Returns:
+        Path: local path
+    """
+    parsed_uri = urlparse(file_uri)
+    if parsed_uri.netloc and parsed_uri.netloc != "localhost":
+        return Path(url2pathname(f"//{parsed_uri.netloc}{parsed_uri.path}"))
+    return Path(url2pathname(parsed_uri.path))
+
+
+def _file_checksum(file_path: Path) -> str:
+    """Compute the SHA-256 checksum of a file.
+
+    Args:
+        file_path (Path): file to hash
+
+    Returns:
+        str: hexadecimal digest
+    """
+    file_hash = hashlib.sha256()
+    with file_path.open("rb") as file_object:
+        while chunk := file_object.read(CHECKSUM_CHUNK_SIZE):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class LocalFolderHandler(RemoteProfilesHandlerBase):
+    """Handle profiles stored in a plain folder, without git.
+
+    It's designed to handle thoses cases:
+
+    - the source is a folder on a local drive or a network share (SMB, NFS)
+    - the local repository (destination) is on a local network or drive
+
+    Only files whose size or modification time changed are copied. Optionally, files
+    with the same size but another modification time are compared on their checksum
+    before being copied.
+    """
+
+    def __init__(
+        self,
+        source_repository_path_or_uri: str | Path,
+        source_repository_type: str = "folder",
+        compare_checksums: bool = False,
+        max_workers: int = 8,
+    ) -> None:
+        """Constructor.
+
+        Args:
+            source_repository_path_or_uri (str | Path): path or 'file://' URI to the
+                source folder
+            source_repository_type (str, optional): type of source. Defaults to
+                "folder".
+            compare_checksums (bool, optional): compare checksums of files with the
+                same size but a different modification time, instead of copying them
+                straight away. Defaults to False.
+            max_workers (int, optional): maximum number of folders listed or files
+                copied at the same time. Defaults to 8.
+        """
+        super().__init__(source_repository_type=source_repository_type)
+
+        if isinstance(
+            source_repository_path_or_uri, str
+        ) and source_repository_path_or_uri.startswith("file://"):
+            source_repository_path_or_uri = file_uri_to_path(
+                source_repository_path_or_uri
+            )
+            logger.debug(
+                f"URI cleaning: 'file://' URI converted to path. Result: "
+                f"{source_repository_path_or_uri}"
+            )
+
+        self.SOURCE_REPOSITORY_PATH_OR_URL = Path(source_repository_path_or_uri)
+        self.compare_checksums = compare_checksums
+        self.max_workers = max_workers
+
+    def download(self, destination_local_path: Path) -> None:
+        """Synchronize the destination folder from the source folder: changed files
+            are copied, files removed from the source are deleted.
+
+        Args:
+            destination_local_path (Path): path to the local folder where to download
+
+        Raises:
+            FileNotFoundError: if the source folder doesn't exist
+        """
+        source_path: Path = self.SOURCE_REPOSITORY_PATH_OR_URL
+        logger.info(
+            f"Start synchronizing from {source_path} to {destination_local_path}"
+        )
+        self.CHANGED_PATHS = None
+
+        if not source_path.is_dir():
+            logger.critical(f"Source folder {source_path} doesn't exist.")
+            raise FileNotFoundError(f"Source folder {source_path} doesn't exist.")
+
+        source_files = scan_folder_files(
+            root_path=source_path, max_workers=self.max_workers
+        )
+        if self.PROFILES_SELECTOR is not None:
+            source_files = self.filter_files_on_selected_profiles(
+                source_files=source_files
+            )
+
+        first_sync = not destination_local_path.is_dir()
+        destination_local_path.mkdir(parents=True, exist_ok=True)
+        destination_files = scan_folder_files(
+            root_path=destination_local_path, max_workers=self.max_workers
+        )
+
+        # remove files which are no longer in the source
+        removed_paths = sorted(set(destination_files) - set(source_files))
+        for removed_path in removed_paths:
+            destination_local_path.joinpath(removed_path).unlink(missing_ok=True)
+        self.remove_empty_folders(root_path=destination_local_path)
+
+        files_to_copy = [
+            relative_path
+            for relative_path, source_state in source_files.items()
+            if self.is_file_changed(
+                relative_path=relative_path,
+                source_state=source_state,
+                destination_state=destination_files.get(relative_path),
+                destination_local_path=destination_local_path,
+            )
+        ]
+        logger.info(
+            f"{len(files_to_copy)}/{len(source_files)} files to copy, "
+            f"{len(removed_paths)} to remove."
+        )
+
+        copied_paths, fails = self.copy_files_to_local(
+            li_files_to_copy=files_to_copy, target_folder=destination_local_path
+        )
+        if len(fails):
+            logger.error(f"{len(fails)} copy failed. Check the above log messages.")
+
+        if not first_sync:
+            self.CHANGED_PATHS = tuple(sorted([*copied_paths, *removed_paths]))
+
+    def is_file_changed(
+        self,
+        relative_path: str,
+        source_state: FileState,
+        destination_state: FileState | None,
+        destination_local_path: Path,
+    ) -> bool:
+        """Determine if a file has to be copied, comparing its size and modification
+            time and, if enabled, its checksum.
+
+        Args:
+            relative_path (str): file path relative to source and destination
+            source_state (FileState): file state in the source
+            destination_state (FileState | None): file state in the destination, None
+                if missing
+            destination_local_path (Path): destination folder
+
+        Returns:
+            bool: True if the file has to be copied
+        """
+        if destination_state is None or destination_state.size != source_state.size:
+            return True
+        if abs(destination_state.mtime_ns - source_state.mtime_ns) < MTIME_TOLERANCE_NS:
+            return False
+        if not self.compare_checksums:
+            return True
+
+        source_file = self.SOURCE_REPOSITORY_PATH_OR_URL.joinpath(relative_path)
+        destination_file = destination_local_path.joinpath(relative_path)
+        try:
+            if _file_checksum(source_file) != _file_checksum(destination_file):
+                return True
+        except OSError as err:
+            logger.warning(f"Comparing checksums of {relative_path} failed: {err}")
+            return True
+
+        # same content: align the modification time to skip hashing next time
+        os.utime(destination_file, ns=(source_state.mtime_ns, source_state.mtime_ns))
+        return False
+
+    def copy_files_to_local(
+        self, li_files_to_copy: list[str], target_folder: Path
+    ) -> tuple[list[str], list[str]]:
+        """Copy files from the source folder in parallel. Each file is written through
+            a temporary file, so an interrupted copy never leaves a truncated file.
+
+        Args:
+            li_files_to_copy (list[str]): files paths relative to the source
+            target_folder (Path): destination folder
+
+        Returns:
+            tuple[list[str], list[str]]: copied and failed files paths
+        """
+        copied: list[str] = []
+        fails: list[str] = []
+        if not li_files_to_copy:
+            return copied, fails
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix=f"{__title_clean__}_folder_copy_",
+        ) as executor:
+            future_to_path = {
+                executor.submit(
+                    copy_file_atomically,
+                    source_path=self.SOURCE_REPOSITORY_PATH_OR_URL.joinpath(file_path),
+                    destination_path=target_folder.joinpath(file_path),
+                ): file_path
+                for file_path in li_files_to_copy
+            }
+            for future in as_completed(future_to_path):
+                file_path = future_to_path[future]
+                try:
+                    future.result()
+                    copied.append(file_path)
+                except OSError as err:
+                    logger.error(f"Copying {file_path} failed: {err}")
+                    fails.append(file_path)
+
+        return copied, fails
+
+    def filter_files_on_selected_profiles(
+        self, source_files: dict[str, FileState]
+    ) -> dict[str, FileState]:
+        """Let PROFILES_SELECTOR pick the profiles to deploy from their profile.json
+            and keep only the files under their folders.
+
+        Args:
+            source_files (dict[str, FileState]): files of the source folder
+
+        Returns:
+            dict[str, FileState]: files of the selected profiles
+        """
+        profiles_json: dict[str, bytes] = {}
+        for relative_path in source_files:
+            if PurePosixPath(relative_path).name != "profile.json":
+                continue
+            profile_folder = relative_path.rpartition("/")[0]
+            try:
+                profiles_json[profile_folder] = (
+                    self.SOURCE_REPOSITORY_PATH_OR_URL.joinpath(
+                        relative_path
+                    ).read_bytes()
+                )
+            except OSError as err:
+                logger.error(f"{relative_path} can't be read: {err}")
+
+        selected_folders = self.PROFILES_SELECTOR(profiles_json)
+        logger.info(
+            f"{len(selected_folders)}/{len(profiles_json)} profiles selected for "
+            f"synchronization: {', '.join(sorted(selected_folders))}"
+        )
+        # a profile at the root of the source means every file
+        if "" in selected_folders:
+            return source_files
+
+        selected_prefixes = tuple(f"{folder}/" for folder in selected_folders)
+        return {
+            relative_path: file_state
+            for relative_path, file_state in source_files.items()
+            if relative_path.startswith(selected_prefixes)
+        }
+
+    @staticmethod
+    def remove_empty_folders(root_path: Path) -> None:
+        """Remove empty subfolders of a folder, deepest first.
+
+        Args:
+            root_path (Path): folder to clean up
+        """
+        for folder_path, subfolders, files in os.walk(root_path, topdown=False):
+            if Path(folder_path) == root_path or files:
+                continue
+            try:
+                os.rmdir(folder_path)
+            except OSError:
+                # not empty: a subfolder is still there
+                continue
@@ -0,0 +1,83 @@
+#! python3  # noqa: E265
+
+"""
+    Find profile.json files in the known layout of profiles folders, without walking
+    through plugins, logs or git internals.
+
+    Author: Julien Moura (https://github.com/guts)
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import logging
+import os
+from collections.abc import Iterable
+from pathlib import Path
+
+# #############################################################################
+# ########## Globals ###############
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+# deepest layout, from the QDT working folder:
+# repositories/{scenario}/{source}/{folder in repository}/profiles/{profile}/profile.json
+PROFILES_MAX_DEPTH: int = 6
+
+# folders which never hold a profile: plugins archives or code, logs, git internals
+PROFILES_EXCLUDED_FOLDERS: frozenset[str] = frozenset(
+    (".git", "git_mirrors", "logs", "plugins", "python")
+)
+
+# #############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def find_profiles_json(
+    start_parent_folder: Path,
+    max_depth: int = PROFILES_MAX_DEPTH,
+    excluded_folders: Iterable[str] = PROFILES_EXCLUDED_FOLDERS,
+) -> list[Path]:
+    """List profile.json files under a folder, breadth-first with os.scandir. Only
+        folder names are compared while walking, so excluded trees are never listed.
+
+    Args:
+        start_parent_folder (Path): folder to start searching from
+        max_depth (int, optional): maximum number of folders between the start folder
+            and a profile.json. Defaults to PROFILES_MAX_DEPTH.
+        excluded_folders (Iterable[str], optional): names of folders not to walk
+            through, whatever their depth. Defaults to PROFILES_EXCLUDED_FOLDERS.
+
+    Returns:
+        list[Path]: paths to profile.json files
+    """
+    excluded_folders = frozenset(excluded_folders)
+    profiles_json: list[Path] = []
+    current_folders: list[str] = [os.fspath(start_parent_folder)]
+
+    for depth in range(max_depth + 1):
+        next_folders: list[str] = []
+        for folder in current_folders:
+            try:
+                with os.scandir(folder) as entries:
+                    for entry in entries:
+                        if entry.name == "profile.json" and entry.is_file():
+                            profiles_json.append(Path(entry.path))
+                        elif (
+                            depth < max_depth
+                            and entry.name not in excluded_folders
+                            and entry.is_dir(follow_symlinks=False)
+                        ):
+                            next_folders.append(entry.path)
+            except OSError as err:
+                logger.warning(f"Folder {folder} can't be listed. Trace: {err}")
+        if not next_folders:
+            break
+        current_folders = next_folders
+
+    return profiles_json
@@ -15,12 +15,15 @@
 
 # Standard library
 import logging
+from collections.abc import Callable
+from os import getenv
 from pathlib import Path
 from shutil import rmtree
 from typing import Literal
 
 # 3rd party
 from dulwich import porcelain
+from dulwich.client import default_user_agent_string, get_transport_and_path
 from dulwich.errors import GitProtocolError, NotGitRepository
 from dulwich.repo import Repo
 from giturlparse import GitUrlParsed
@@ -28,8 +31,16 @@ from giturlparse import parse as git_parse
 from giturlparse import validate as git_validate
 
 # project
-from qgis_deployment_toolbelt.utils import proxies
+from qgis_deployment_toolbelt.profiles.git_mirror import GitMirror
+from qgis_deployment_toolbelt.profiles.git_worktree import (
+    build_profiles_paths_filter,
+    get_head_tree_id,
+    read_profiles_json_from_tree,
+    update_working_tree,
+)
 from qgis_deployment_toolbelt.utils.check_path import check_folder_is_empty
+from qgis_deployment_toolbelt.utils.proxies import get_urllib3_pool_manager
+from qgis_deployment_toolbelt.utils.str2bool import str2bool
 
 # #############################################################################
 # ########## Globals ###############
@@ -55,16 +66,25 @@ class RemoteProfilesHandlerBase:
     SOURCE_REPOSITORY_ACTIVE_BRANCH: str | None = None
     SOURCE_REPOSITORY_PATH_OR_URL: Path | str | None = None
     SOURCE_REPOSITORY_TYPE: (
-        Literal["git_local", "git_remote", "http", "local", "remote"] | None
+        Literal["folder", "git_local", "git_remote", "http", "local", "remote"] | None
     ) = None
 
     DESTINATION_PATH: Path | None = None
     DESTINATION_BRANCH_TO_USE: str | None = None
+    # paths changed by the last download, relative to the destination. None if
+    # unknown, i.e. after a fresh clone.
+    CHANGED_PATHS: tuple[str, ...] | None = None
+    # function picking the profiles folders to check out from their profile.json
+    # contents, read from the git object store. If None, everything is checked out.
+    PROFILES_SELECTOR: Callable[[dict[str, bytes]], set[str]] | None = None
+    # function receiving the profile.json contents read from the git object store
+    # before the checkout, which it doesn't restrict. Ignored by non-git handlers.
+    PROFILES_OBSERVER: Callable[[dict[str, bytes]], None] | None = None
 
     def __init__(
         self,
         source_repository_type: Literal[
-            "git_local", "git_remote", "http", "local", "remote"
+            "folder", "git_local", "git_remote", "http", "local", "remote"
         ],
         branch_to_use: str | None = None,
     ) -> None:
@@ -87,6 +107,27 @@ class RemoteProfilesHandlerBase:
         """
         return git_parse(remote_git_url)
 
+    def git_transport_options(self, location: Path | str) -> dict:
+        """Options passed to dulwich transport for a repository location. For HTTP(S)
+            remotes, it carries a pool manager configured with the proxy to use, so
+            that no environment variable has to be set around git operations.
+
+        Args:
+            location (Path | str): path or URL of the repository
+
+        Returns:
+            dict: keyword arguments for dulwich porcelain functions
+        """
+        if not str(location).startswith(("http://", "https://")):
+            return {}
+
+        return {
+            "pool_manager": get_urllib3_pool_manager(
+                url=str(location),
+                headers={"User-agent": default_user_agent_string()},
+            )
+        }
+
     def is_valid_git_repository(
         self,
         source_repository_path_or_url: Path | str | None = None,
@@ -224,7 +265,6 @@ class RemoteProfilesHandlerBase:
             )
             return False
 
-    @proxies.os_env_proxy
     def get_active_branch_from_local_repository(
         self, local_git_repository_path: Path | None = None
     ) -> str:
@@ -304,7 +344,6 @@ class RemoteProfilesHandlerBase:
             )
         ]
 
-    @proxies.os_env_proxy
     def list_remote_branches(
         self, source_repository_path_or_url: Path | str | None = None
     ) -> tuple[str]:
@@ -339,7 +378,8 @@ class RemoteProfilesHandlerBase:
             )
 
         ls_remote_refs: dict = porcelain.ls_remote(
-            remote=f"{source_repository_path_or_url}"
+            remote=f"{source_repository_path_or_url}",
+            **self.git_transport_options(source_repository_path_or_url),
         )
         if isinstance(ls_remote_refs, dict):
             source_repository_branches: list[str] = [
@@ -354,7 +394,6 @@ class RemoteProfilesHandlerBase:
         else:
             return ("",)
 
-    @proxies.os_env_proxy
     def download(self, destination_local_path: Path) -> Repo:
         """Generic wrapper around the specific logic of this handler.
 
@@ -367,9 +406,25 @@ class RemoteProfilesHandlerBase:
         if isinstance(destination_local_path, Path):
             destination_local_path = destination_local_path.resolve()
 
-        local_git_repository = self.clone_or_pull(
-            to_local_destination_path=destination_local_path
-        )
+        self.CHANGED_PATHS = None
+        local_git_repository = None
+        if self.SOURCE_REPOSITORY_TYPE in ("git_remote", "remote") and str2bool(
+            getenv("QDT_GIT_MIRROR", True)
+        ):
+            try:
+                local_git_repository = self.download_through_mirror(
+                    destination_local_path=destination_local_path
+                )
+            except Exception as err:
+                logger.warning(
+                    f"Using the git mirror of {self.SOURCE_REPOSITORY_PATH_OR_URL} "
+                    f"failed. Falling back to a standalone clone. Trace: {err}"
+                )
+
+        if local_git_repository is None:
+            local_git_repository = self.clone_or_pull(
+                to_local_destination_path=destination_local_path
+            )
 
         if isinstance(local_git_repository, Repo):
             self.DESTINATION_BRANCH_TO_USE = porcelain.active_branch(
@@ -378,6 +433,32 @@ class RemoteProfilesHandlerBase:
 
         return local_git_repository
 
+    def download_through_mirror(self, destination_local_path: Path) -> Repo:
+        """Update the local mirror of the remote repository, shared by every scenario,
+            then check out the branch to use into the destination, borrowing objects
+            from the mirror.
+
+        Args:
+            destination_local_path (Path): path to the local folder where to download
+
+        Returns:
+            Repo: the local repository object
+        """
+        git_mirror = GitMirror(remote_url=self.SOURCE_REPOSITORY_PATH_OR_URL)
+        git_mirror.update(
+            transport_options=self.git_transport_options(
+                self.SOURCE_REPOSITORY_PATH_OR_URL
+            )
+        )
+        local_git_repository = git_mirror.checkout(
+            local_path=destination_local_path,
+            branch=self.DESTINATION_BRANCH_TO_USE,
+            profiles_selector=self.PROFILES_SELECTOR,
+            profiles_observer=self.PROFILES_OBSERVER,
+        )
+        self.CHANGED_PATHS = git_mirror.changed_paths
+        return local_git_repository
+
     def clone_or_pull(self, to_local_destination_path: Path, attempt: int = 1) -> Repo:
         """Clone or fetch/pull remote repository to local path. If this one doesn't exist,
         it's created. If fetch or pull action fail, it removes the existing folder and
@@ -475,7 +556,6 @@ class RemoteProfilesHandlerBase:
             )
             return None
 
-    @proxies.os_env_proxy
     def _clone(self, local_path: Path) -> Repo:
         """Clone the remote repository to local path.
 
@@ -499,6 +579,9 @@ class RemoteProfilesHandlerBase:
         else:
             branch = None
 
+        # profile.json files are read from the objects before anything is checked out
+        checkout = self.PROFILES_SELECTOR is None and self.PROFILES_OBSERVER is None
+
         logger.debug(
             f"Cloning repository {self.SOURCE_REPOSITORY_PATH_OR_URL} ({branch=}) to {local_path}"
         )
@@ -511,7 +594,7 @@ class RemoteProfilesHandlerBase:
                     target_path=f"{local_path.resolve()}",
                     branch=branch,
                     mkdir=False,
-                    checkout=True,
+                    checkout=checkout,
                     progress=None,
                 )
         elif self.SOURCE_REPOSITORY_TYPE in ("git_remote", "remote"):
@@ -519,10 +602,28 @@ class RemoteProfilesHandlerBase:
                 source=self.SOURCE_REPOSITORY_PATH_OR_URL,
                 target=f"{local_path.resolve()}",
                 branch=branch,
+                checkout=checkout,
+                **self.git_transport_options(self.SOURCE_REPOSITORY_PATH_OR_URL),
             )
         else:
             raise NotImplementedError(f"{self.SOURCE_REPOSITORY_TYPE} is not supported")
 
+        # sparse checkout (only the selected profiles) or full checkout once observed
+        if not checkout:
+            with Repo(root=f"{local_path.resolve()}") as cloned_repo:
+                new_tree = cloned_repo[cloned_repo.head()].tree
+                update_working_tree(
+                    repo=cloned_repo,
+                    old_tree_id=None,
+                    new_tree_id=new_tree,
+                    include_path=build_profiles_paths_filter(
+                        object_store=cloned_repo.object_store,
+                        tree_id=new_tree,
+                        profiles_selector=self.PROFILES_SELECTOR,
+                        profiles_observer=self.PROFILES_OBSERVER,
+                    ),
+                )
+
         gobj = repo_obj.get_object(repo_obj.head())
         logger.debug(
             f"Active branch: {porcelain.active_branch(repo_obj)}. "
@@ -531,7 +632,6 @@ class RemoteProfilesHandlerBase:
         )
         return repo_obj
 
-    @proxies.os_env_proxy
     def _fetch(self, local_path: Path) -> Repo:
         """Fetch the remote repository from the existing local repository.
 
@@ -559,6 +659,7 @@ class RemoteProfilesHandlerBase:
             force=True,
             prune=True,
             prune_tags=True,
+            **self.git_transport_options(source_repository),
         )
         destination_local_repository.close()
 
@@ -570,7 +671,6 @@ class RemoteProfilesHandlerBase:
 
         return destination_local_repository
 
-    @proxies.os_env_proxy
     def _pull(self, local_path: Path) -> Repo:
         """Pull the remote repository from the existing local repository.
 
@@ -589,11 +689,50 @@ class RemoteProfilesHandlerBase:
         logger.info(f"Pulling repository {source_repository} to {local_path}")
 
         destination_local_repository = Repo(root=f"{local_path.resolve()}")
-        porcelain.pull(
-            repo=local_path,
-            remote_location=source_repository,
-            force=True,
+        old_tree = get_head_tree_id(repo=destination_local_repository)
+
+        client, remote_path = get_transport_and_path(
+            source_repository, **self.git_transport_options(source_repository)
         )
+        fetch_result = client.fetch(remote_path, destination_local_repository)
+
+        # follow the local active branch, or the remote default one if it's gone
+        branch_ref = destination_local_repository.refs.follow(b"HEAD")[0][-1]
+        remote_sha = fetch_result.refs.get(branch_ref) or fetch_result.refs.get(b"HEAD")
+        if remote_sha is None:
+            destination_local_repository.close()
+            raise GitProtocolError(
+                f"Neither {branch_ref.decode()} nor HEAD found in {source_repository}."
+            )
+
+        # with a sparse checkout, the selection can change even if the remote didn't
+        if (
+            remote_sha == destination_local_repository.refs[branch_ref]
+            and self.PROFILES_SELECTOR is None
+        ):
+            self.CHANGED_PATHS = ()
+            if self.PROFILES_OBSERVER is not None:
+                self.PROFILES_OBSERVER(
+                    read_profiles_json_from_tree(
+                        object_store=destination_local_repository.object_store,
+                        tree_id=destination_local_repository[remote_sha].tree,
+                    )
+                )
+        else:
+            destination_local_repository.refs[branch_ref] = remote_sha
+            new_tree = destination_local_repository[remote_sha].tree
+            self.CHANGED_PATHS = update_working_tree(
+                repo=destination_local_repository,
+                old_tree_id=old_tree,
+                new_tree_id=new_tree,
+                include_path=build_profiles_paths_filter(
+                    object_store=destination_local_repository.object_store,
+                    tree_id=new_tree,
+                    profiles_selector=self.PROFILES_SELECTOR,
+                    profiles_observer=self.PROFILES_OBSERVER,
+                ),
+            )
+
         gobj = destination_local_repository.get_object(
             destination_local_repository.head()
         )
@@ -601,7 +740,8 @@ class RemoteProfilesHandlerBase:
             f"Repository {local_path.resolve()} has been pulled. "
             f"Local active branch: {porcelain.active_branch(destination_local_repository)}. "
             f"Latest commit cloned: {gobj.sha().hexdigest()} by {gobj.author}"
-            f" at {gobj.commit_time}"
+            f" at {gobj.commit_time}. "
+            f"Changed paths: {'unknown' if self.CHANGED_PATHS is None else len(self.CHANGED_PATHS)}."
         )
 
         destination_local_repository.close()
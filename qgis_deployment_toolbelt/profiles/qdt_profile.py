@@ -18,12 +18,11 @@ from __future__ import annotations
 import json
 import logging
 import tempfile
+from functools import lru_cache
+from os import getenv
 from pathlib import Path
 from shutil import copy2, copytree
-from typing import Literal
-
-# 3rd party
-from packaging.version import InvalidVersion, Version
+from typing import Literal, NamedTuple
 
 # Package
 from qgis_deployment_toolbelt.constants import (
@@ -33,6 +32,7 @@ from qgis_deployment_toolbelt.constants import (
 from qgis_deployment_toolbelt.plugins.plugin import QgisPlugin
 from qgis_deployment_toolbelt.profiles.qgis_ini_handler import QgisIniHelper
 from qgis_deployment_toolbelt.utils.check_path import check_path
+from qgis_deployment_toolbelt.utils.versions import parse_version
 
 # #############################################################################
 # ########## Globals ###############
@@ -41,12 +41,88 @@ from qgis_deployment_toolbelt.utils.check_path import check_path
 # logs
 logger = logging.getLogger(__name__)
 
+# environment variables the working folder and the OS configuration depend on
+PROFILES_ENVIRONMENT_VARIABLES: tuple[str, ...] = (
+    "APPDATA",
+    "HOME",
+    "QDT_LOCAL_WORK_DIR",
+    "QGIS_CUSTOM_CONFIG_PATH",
+    "USERPROFILE",
+)
+
+
+# #############################################################################
+# ########## Functions #############
+# ##################################
+
+
+class ProfilesEnvironment(NamedTuple):
+    """Working folder and operating system configuration shared by profiles."""
+
+    qdt_working_folder: Path
+    os_config: OSConfiguration
+
+
+@lru_cache(maxsize=16)
+def _build_profiles_environment(*environment_values: str | None) -> ProfilesEnvironment:
+    """Build the environment shared by profiles. Cached on the values of the
+        environment variables it depends on.
+
+    Returns:
+        ProfilesEnvironment: working folder and operating system configuration
+    """
+    return ProfilesEnvironment(
+        qdt_working_folder=get_qdt_working_directory(),
+        os_config=OSConfiguration.from_opersys(),
+    )
+
+
+def get_profiles_environment() -> ProfilesEnvironment:
+    """Get the working folder and operating system configuration shared by every
+        profile object. They are built again only if one of the environment variables
+        they depend on changed.
+
+    Returns:
+        ProfilesEnvironment: working folder and operating system configuration
+    """
+    return _build_profiles_environment(
+        *(getenv(var_name) for var_name in PROFILES_ENVIRONMENT_VARIABLES)
+    )
+
 
 # #############################################################################
 # ########## Classes ###############
 # ##################################
 class QdtProfile:
-    """Object definition for QGIS Profile handled by QDT."""
+    """Object definition for QGIS Profile handled by QDT.
+
+    Attributes are stored in slots and set once at init: assigning one afterwards
+    raises an AttributeError. Resolved paths are computed on first access then reused.
+    """
+
+    __slots__ = (
+        "_alias",
+        "_author",
+        "_description",
+        "_email",
+        "_folder",
+        "_folder_resolved",
+        "_frozen",
+        "_icon",
+        "_json_ref_path",
+        "_json_ref_path_resolved",
+        "_name",
+        "_path_in_qgis",
+        "_plugins",
+        "_qgis_maximum_version",
+        "_qgis_minimum_version",
+        "_rules",
+        "_splash",
+        "_version",
+        "loaded_from_json",
+        "os_config",
+        "qdt_working_folder",
+    )
 
     # optional mapping on attributes names.
     # {attribute_name_in_output_object: attribute_name_from_input_file}  # noqa: E800
@@ -79,10 +155,8 @@ class QdtProfile:
         :param str name: name of the shortcut that will be created
         :param str author: profile author name
         """
-        # store QDT working folder
-        self.qdt_working_folder = get_qdt_working_directory()
-        # retrieve operating system specific configuration
-        self.os_config = OSConfiguration.from_opersys()
+        # QDT working folder and operating system configuration, shared by profiles
+        self.qdt_working_folder, self.os_config = get_profiles_environment()
 
         # default values for immutable attributes
         self.loaded_from_json = loaded_from_json
@@ -93,9 +167,12 @@ class QdtProfile:
         self._description = None
         self._email = None
         self._folder = None
+        self._folder_resolved = None
         self._icon = None
         self._json_ref_path = None
+        self._json_ref_path_resolved = None
         self._name = None
+        self._path_in_qgis = None
         self._splash = None
         self._plugins = None
         self._qgis_maximum_version = None
@@ -134,6 +211,26 @@ class QdtProfile:
         if version:
             self._version = version
 
+        # from now on, attributes are read-only
+        self._frozen = True
+
+    def __setattr__(self, name: str, value) -> None:
+        """Prevent attributes from being assigned once the profile is initialized, so
+            that cached resolved paths can't go stale.
+
+        Args:
+            name (str): attribute name
+            value: attribute value
+
+        Raises:
+            AttributeError: if the profile is already initialized
+        """
+        if getattr(self, "_frozen", False):
+            raise AttributeError(
+                f"{self.__class__.__name__} is immutable: '{name}' can't be set."
+            )
+        super().__setattr__(name, value)
+
     @classmethod
     def from_json(
         cls, profile_json_path: Path, profile_folder: Path | None = None
@@ -176,6 +273,34 @@ class QdtProfile:
         with profile_json_path.open(mode="r", encoding="utf8") as in_profile_json:
             profile_data = json.load(in_profile_json)
 
+        return cls.from_dict(
+            profile_data=profile_data,
+            profile_folder=profile_folder,
+            json_ref_path=profile_json_path,
+        )
+
+    @classmethod
+    def from_dict(
+        cls,
+        profile_data: dict,
+        profile_folder: Path | None = None,
+        json_ref_path: Path | None = None,
+    ) -> QdtProfile:
+        """Load profile from the content of a profile.json file, i.e. read from a git
+            object store without being written to disk.
+
+        Args:
+            profile_data (dict): profile.json content
+            profile_folder (Path | None, optional): path to the profile folder.
+                Defaults to None.
+            json_ref_path (Path | None, optional): path to the profile json file.
+                Defaults to None.
+
+        Returns:
+            QdtProfile: QdtProfile object with attributes filled from JSON.
+        """
+        profile_data = dict(profile_data)
+
         # map attributes names
         for k, v in cls.ATTR_MAP.items():
             profile_data[k] = profile_data.pop(v, None)
@@ -183,7 +308,7 @@ class QdtProfile:
         # return new instance with loaded object
         return cls(
             folder=profile_folder,
-            json_ref_path=profile_json_path,
+            json_ref_path=json_ref_path,
             loaded_from_json=True,
             **profile_data,
         )
@@ -204,7 +329,9 @@ class QdtProfile:
             Path: profile folder path
         """
         if isinstance(self._folder, Path):
-            return self._folder.resolve()
+            if self._folder_resolved is None:
+                object.__setattr__(self, "_folder_resolved", self._folder.resolve())
+            return self._folder_resolved
         else:
             return self._folder
 
@@ -240,7 +367,11 @@ class QdtProfile:
 
         :return Path: profile json_ref_path path
         """
-        return self._json_ref_path.resolve()
+        if self._json_ref_path_resolved is None:
+            object.__setattr__(
+                self, "_json_ref_path_resolved", self._json_ref_path.resolve()
+            )
+        return self._json_ref_path_resolved
 
     @property
     def name(self) -> str | None:
@@ -264,7 +395,13 @@ class QdtProfile:
         Returns:
             Path: path to the installed (i.e. in QGIS) profile folder
         """
-        return self.os_config.qgis_profiles_path.joinpath(self.name)
+        if self._path_in_qgis is None:
+            object.__setattr__(
+                self,
+                "_path_in_qgis",
+                self.os_config.qgis_profiles_path.joinpath(self.name),
+            )
+        return self._path_in_qgis
 
     @property
     def plugins(self) -> list[QgisPlugin]:
@@ -338,33 +475,28 @@ class QdtProfile:
             # store the version string
             version_to_compare = version_to_compare.version
 
-        # load object version as packaging.Version object
-        try:
-            profile_version = Version(self.version)
-        except InvalidVersion as err:
+        # parse versions as packaging.Version objects (memoized)
+        profile_version = parse_version(self.version)
+        if profile_version is None:
             logger.error(
                 f"Profile {self.name} uses an incompatible versioning scheme: {self.version}."
                 "It's not Semver (even prefixed by 'v'), nor Calver or any of "
-                "supported specification. See https://peps.python.org/pep-0440/. "
-                f"Trace: {err}"
+                "supported specification. See https://peps.python.org/pep-0440/."
             )
             return None
 
-        # load version to compare as packaging.Version object
-        try:
-            version_to_compare = Version(version_to_compare)
-        except InvalidVersion as err:
+        compared_version = parse_version(version_to_compare)
+        if compared_version is None:
             logger.error(
-                f"Version to compare uses an incompatible versioning scheme: {self.version}."
+                f"Version to compare uses an incompatible versioning scheme: {version_to_compare}."
                 "It's not Semver (even prefixed by 'v'), nor Calver or any of "
-                "supported specification. See https://peps.python.org/pep-0440/. "
-                f"Trace: {err}"
+                "supported specification. See https://peps.python.org/pep-0440/."
             )
             return None
 
-        logger.debug(f"Comparing versions: {profile_version} and {version_to_compare}")
+        logger.debug(f"Comparing versions: {profile_version} and {compared_version}")
 
-        return profile_version < version_to_compare
+        return profile_version < compared_version
 
     def status(self) -> Literal["downloaded", "installed", "unknown"]:
         """Determine current profile status: downloaded (in QDT working folder),
@@ -14,24 +14,32 @@
 
 # Standard library
 import logging
+import tarfile
+import tempfile
+import zipfile
+from collections.abc import Iterator
 from concurrent.futures import ThreadPoolExecutor
 from os import getenv
-from pathlib import Path
-from shutil import rmtree
-
-# 3rd party
-import requests
+from pathlib import Path, PurePosixPath
+from shutil import copyfileobj, rmtree
 
 # project
 from qgis_deployment_toolbelt.__about__ import __title_clean__, __version__
 from qgis_deployment_toolbelt.profiles.profiles_handler_base import (
     RemoteProfilesHandlerBase,
 )
-from qgis_deployment_toolbelt.utils.file_downloader import download_remote_file_to_local
+from qgis_deployment_toolbelt.utils.file_downloader import (
+    build_http_session,
+    download_remote_file_to_local,
+)
 from qgis_deployment_toolbelt.utils.formatters import url_ensure_trailing_slash
+from qgis_deployment_toolbelt.utils.network_scheduler import request_with_retries
 from qgis_deployment_toolbelt.utils.proxies import get_proxy_settings
 from qgis_deployment_toolbelt.utils.str2bool import str2bool
-from qgis_deployment_toolbelt.utils.tree_files_reader import tree_to_download_list
+from qgis_deployment_toolbelt.utils.tree_files_reader import (
+    tree_to_download_list,
+    tree_to_files_sizes,
+)
 
 # #############################################################################
 # ########## Globals ###############
@@ -59,6 +67,9 @@ class HttpHandler(RemoteProfilesHandlerBase):
         "User-Agent": f"{__title_clean__}/{__version__}",
     }
 
+    # single-archive bundles optionally published next to qdt-files.json, by priority
+    BUNDLE_FILENAMES: tuple[str, ...] = ("qdt-bundle.tar.gz", "qdt-bundle.zip")
+
     def __init__(
         self,
         source_repository_path_or_uri: str,
@@ -89,7 +100,7 @@ class HttpHandler(RemoteProfilesHandlerBase):
         try:
             logger.debug("Retrieve qdt-files.json ")
             # get qdt-files.json
-            req = requests.get(
+            req = request_with_retries(
                 url=f"{self.SOURCE_REPOSITORY_PATH_OR_URL}qdt-files.json",
                 headers=self.HTTP_HEADERS,
                 proxies=get_proxy_settings(
@@ -117,6 +128,45 @@ class HttpHandler(RemoteProfilesHandlerBase):
             destination_local_path.mkdir(parents=True)
 
         li_files_to_download = tree_to_download_list(tree_array=qdt_tree)
+
+        # download only the files of the profiles picked from their profile.json
+        if self.PROFILES_SELECTOR is not None:
+            li_files_to_download = self.filter_files_on_selected_profiles(
+                li_files_to_download=li_files_to_download,
+                destination_local_path=destination_local_path,
+            )
+            if not li_files_to_download:
+                logger.info("No other file to download for the selected profiles.")
+                return
+
+        # try the single-archive bundle first, then complete it file by file. A bundle
+        # holds every profile but only the files of the selected ones are extracted.
+        if str2bool(getenv("QDT_PROFILES_HTTP_BUNDLE", True)) and self.download_bundle(
+            destination_local_path=destination_local_path,
+            expected_files={
+                file_path: file_size
+                for file_path, file_size in tree_to_files_sizes(
+                    tree_array=qdt_tree
+                ).items()
+                if file_path in li_files_to_download
+            },
+        ):
+            li_files_to_download = [
+                file_to_download
+                for file_to_download in li_files_to_download
+                if not destination_local_path.joinpath(file_to_download).is_file()
+            ]
+            if not li_files_to_download:
+                logger.info(
+                    "Every file listed in qdt-files.json has been extracted from the "
+                    "bundle."
+                )
+                return
+            logger.warning(
+                f"{len(li_files_to_download)} files listed in qdt-files.json are "
+                "missing from the bundle. They will be downloaded one by one."
+            )
+
         logger.info(f"{len(li_files_to_download)} files to download")
 
         success, fails = self.download_files_to_local(
@@ -130,6 +180,263 @@ class HttpHandler(RemoteProfilesHandlerBase):
                 f"{len(fails)} download failed. Check the above log messages."
             )
 
+    def filter_files_on_selected_profiles(
+        self, li_files_to_download: list[str], destination_local_path: Path
+    ) -> list[str]:
+        """Download the profile.json files first, let PROFILES_SELECTOR pick the
+            profiles to deploy, then keep only the other files under their folders.
+            profile.json files of profiles not selected are removed.
+
+        Args:
+            li_files_to_download (list[str]): files listed in qdt-files.json
+            destination_local_path (Path): path to the local folder where to download
+
+        Returns:
+            list[str]: remaining files to download
+        """
+        profiles_json_files = [
+            file_path
+            for file_path in li_files_to_download
+            if PurePosixPath(file_path).name == "profile.json"
+        ]
+        self.download_files_to_local(
+            li_files_to_download=profiles_json_files,
+            target_folder=destination_local_path,
+        )
+
+        profiles_json: dict[str, bytes] = {}
+        for profile_json_file in profiles_json_files:
+            # listed paths start with "./": the root folder becomes an empty string
+            profile_folder = PurePosixPath(profile_json_file).parent.as_posix()
+            if profile_folder == ".":
+                profile_folder = ""
+            try:
+                profiles_json[profile_folder] = destination_local_path.joinpath(
+                    profile_json_file
+                ).read_bytes()
+            except OSError as err:
+                logger.error(f"Downloaded {profile_json_file} can't be read: {err}")
+
+        selected_folders = self.PROFILES_SELECTOR(profiles_json)
+        logger.info(
+            f"{len(selected_folders)}/{len(profiles_json)} profiles selected for "
+            f"download: {', '.join(sorted(selected_folders))}"
+        )
+
+        def is_selected(file_path: str) -> bool:
+            # a profile at the root of the source means every file
+            if "" in selected_folders:
+                return True
+            return (
+                PurePosixPath(file_path)
+                .as_posix()
+                .startswith(tuple(f"{folder}/" for folder in selected_folders))
+            )
+
+        for profile_json_file in profiles_json_files:
+            if not is_selected(profile_json_file):
+                destination_local_path.joinpath(profile_json_file).unlink(
+                    missing_ok=True
+                )
+
+        return [
+            file_path
+            for file_path in li_files_to_download
+            if file_path not in profiles_json_files and is_selected(file_path)
+        ]
+
+    def download_bundle(
+        self, destination_local_path: Path, expected_files: dict[str, int | None]
+    ) -> bool:
+        """Download the single-archive bundle published next to qdt-files.json, if
+            any, and extract it into the destination folder. A tar.gz bundle is
+            extracted while it's downloaded; a zip bundle is downloaded to a temporary
+            file first since its index is stored at the end of the archive.
+
+        qdt-files.json is the manifest of the bundle: only the expected members (those
+        it lists, restricted to the selected profiles if any) are extracted and those
+        whose size differs from the listed one are removed, so they are downloaded one
+        by one afterwards.
+
+        Args:
+            destination_local_path (Path): path to the local folder where to extract
+            expected_files (dict[str, int | None]): files listed in qdt-files.json,
+                with their size if known
+
+        Returns:
+            bool: True if a bundle has been extracted
+        """
+        expected_members = {
+            PurePosixPath(file_path).as_posix(): file_size
+            for file_path, file_size in expected_files.items()
+        }
+        for bundle_filename in self.BUNDLE_FILENAMES:
+            bundle_url = f"{self.SOURCE_REPOSITORY_PATH_OR_URL}{bundle_filename}"
+            try:
+                with build_http_session(url=bundle_url) as session:
+                    with request_with_retries(
+                        url=bundle_url, session=session, stream=True, timeout=(30, 800)
+                    ) as response:
+                        if response.status_code in (403, 404, 410):
+                            logger.debug(
+                                f"No bundle found at {bundle_url} "
+                                f"(HTTP {response.status_code})."
+                            )
+                            continue
+                        response.raise_for_status()
+                        # get the archive as published, even if compressed in transit
+                        response.raw.decode_content = True
+
+                        if bundle_filename.endswith(".tar.gz"):
+                            self._extract_tar_stream(
+                                stream=response.raw,
+                                target_folder=destination_local_path,
+                                expected_members=expected_members,
+                            )
+                        else:
+                            self._extract_zip_stream(
+                                stream=response.raw,
+                                target_folder=destination_local_path,
+                                expected_members=expected_members,
+                            )
+            except Exception as err:
+                logger.error(
+                    f"Downloading or extracting bundle {bundle_url} failed. Falling "
+                    f"back to files download. Trace: {err}"
+                )
+                # don't leave a partial extraction, but keep the files downloaded
+                # before (profile.json of the selected profiles)
+                for member_path in expected_members:
+                    destination_local_path.joinpath(member_path).unlink(missing_ok=True)
+                return False
+
+            logger.info(f"Bundle {bundle_url} extracted to {destination_local_path}.")
+            self.remove_unexpected_sizes(
+                target_folder=destination_local_path,
+                expected_members=expected_members,
+            )
+            return True
+
+        return False
+
+    @staticmethod
+    def remove_unexpected_sizes(
+        target_folder: Path, expected_members: dict[str, int | None]
+    ) -> int:
+        """Remove extracted files whose size differs from the one listed in
+            qdt-files.json.
+
+        Args:
+            target_folder (Path): folder where the bundle has been extracted
+            expected_members (dict[str, int | None]): expected size by member path
+
+        Returns:
+            int: number of removed files
+        """
+        count_removed = 0
+        for member_path, expected_size in expected_members.items():
+            if expected_size is None:
+                continue
+            extracted_file = target_folder.joinpath(member_path)
+            try:
+                extracted_size = extracted_file.stat().st_size
+            except OSError:
+                continue
+            if extracted_size != expected_size:
+                logger.warning(
+                    f"Bundle member {member_path} size ({extracted_size}) differs "
+                    f"from qdt-files.json ({expected_size}). It will be downloaded."
+                )
+                extracted_file.unlink(missing_ok=True)
+                count_removed += 1
+
+        return count_removed
+
+    @staticmethod
+    def _safe_tar_members(
+        tar: tarfile.TarFile, expected_members: dict[str, int | None]
+    ) -> Iterator[tarfile.TarInfo]:
+        """Yield regular files of a tar archive listed in qdt-files.json, skipping
+            anything which could be written outside the target folder.
+
+        Args:
+            tar (tarfile.TarFile): opened tar archive
+            expected_members (dict[str, int | None]): expected size by member path
+
+        Yields:
+            Iterator[tarfile.TarInfo]: safe members
+        """
+        for member in tar:
+            member_path = PurePosixPath(member.name)
+            if (
+                member_path.is_absolute()
+                or ".." in member_path.parts
+                or not (member.isfile() or member.isdir())
+            ):
+                logger.warning(f"Bundle member ignored (unsafe): {member.name}")
+                continue
+            if member.isfile() and member_path.as_posix() not in expected_members:
+                logger.debug(
+                    f"Bundle member ignored (not in qdt-files.json): {member.name}"
+                )
+                continue
+            if member.isfile():
+                yield member
+
+    def _extract_tar_stream(
+        self, stream, target_folder: Path, expected_members: dict[str, int | None]
+    ) -> None:
+        """Extract the expected members of a tar.gz archive from a non-seekable
+            stream.
+
+        Args:
+            stream (IO[bytes]): archive stream
+            target_folder (Path): folder where to extract
+            expected_members (dict[str, int | None]): expected size by member path
+        """
+        with tarfile.open(fileobj=stream, mode="r|gz") as tar:
+            extract_options = {}
+            if hasattr(tarfile, "data_filter"):
+                extract_options["filter"] = "data"
+            tar.extractall(
+                path=target_folder,
+                members=self._safe_tar_members(
+                    tar=tar, expected_members=expected_members
+                ),
+                **extract_options,
+            )
+
+    @staticmethod
+    def _extract_zip_stream(
+        stream, target_folder: Path, expected_members: dict[str, int | None]
+    ) -> None:
+        """Extract the expected members of a zip archive from a stream, through a
+            temporary file.
+
+        Args:
+            stream (IO[bytes]): archive stream
+            target_folder (Path): folder where to extract
+            expected_members (dict[str, int | None]): expected size by member path
+        """
+        with tempfile.TemporaryFile(prefix=f"{__title_clean__}_bundle_") as tmp_zip:
+            copyfileobj(stream, tmp_zip)
+            tmp_zip.seek(0)
+            with zipfile.ZipFile(tmp_zip) as zf:
+                for member in zf.infolist():
+                    if member.is_dir():
+                        continue
+                    if (
+                        PurePosixPath(member.filename).as_posix()
+                        not in expected_members
+                    ):
+                        logger.debug(
+                            "Bundle member ignored (not in qdt-files.json): "
+                            f"{member.filename}"
+                        )
+                        continue
+                    # zipfile sanitizes absolute paths and '..' components
+                    zf.extract(member=member, path=target_folder)
+
     def download_files_to_local(
         self, li_files_to_download: list[str], target_folder: Path
     ) -> tuple[list[tuple[str, Path]], list[tuple[str, str]]]:
@@ -0,0 +1,457 @@
+#! python3  # noqa: E265
+
+"""
+    Keep the local QDT cache (plugins archives, downloaded repositories, git mirrors
+    and remote scenarios) within a size budget, evicting the least recently
+    referenced entries first.
+
+    Author: Julien Moura (https://github.com/guts)
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import logging
+import os
+import re
+import time
+from pathlib import Path
+from shutil import rmtree
+from threading import Lock
+from typing import NamedTuple
+
+# package
+from qgis_deployment_toolbelt.constants import get_qdt_working_directory
+from qgis_deployment_toolbelt.utils.formatters import convert_octets
+from qgis_deployment_toolbelt.utils.json_files import (
+    load_json_file,
+    write_json_atomically,
+)
+
+# #############################################################################
+# ########## Globals ###############
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+# file storing when cache entries were last referenced, in the working directory
+CACHE_USAGE_FILENAME: str = "cache_usage.json"
+
+# size units accepted in a budget, binary multiples
+_SIZE_UNITS: dict[str, int] = {
+    "": 1,
+    "B": 1,
+    "K": 1024,
+    "M": 1024**2,
+    "G": 1024**3,
+    "T": 1024**4,
+}
+_regex_size = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(?:I?B|O)?\s*$", re.I)
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class CacheEntry(NamedTuple):
+    """Unit of eviction of the QDT cache."""
+
+    path: Path
+    kind: str
+    size: int
+    last_used: float
+
+
+class CacheUsageJournal:
+    """Thread-safe registry of the cache entries referenced during a run, i.e. the
+    plugins archives listed in profiles or the repositories of the running scenario.
+    Entries referenced during the run are never evicted by that run."""
+
+    def __init__(self) -> None:
+        """Object instanciation."""
+        self._lock = Lock()
+        self._referenced: dict[str, float] = {}
+
+    def touch(self, path: Path) -> None:
+        """Record a reference to a cache entry.
+
+        Args:
+            path (Path): path to the cache entry
+        """
+        with self._lock:
+            self._referenced[os.path.realpath(path)] = time.time()
+
+    def snapshot(self) -> dict[str, float]:
+        """Get a copy of the references recorded during the run.
+
+        Returns:
+            dict[str, float]: timestamp of the last reference by real path
+        """
+        with self._lock:
+            return dict(self._referenced)
+
+    def reset(self) -> None:
+        """Forget every reference, i.e. at the start of a new run."""
+        with self._lock:
+            self._referenced.clear()
+
+
+class QdtCacheManager:
+    """List and evict entries of the QDT cache:
+
+    - plugin: a plugin archive in `plugins`
+    - repository: the downloaded profiles of a scenario in `repositories`
+    - git_mirror: a bare repository in `git_mirrors`
+    - remote_scenario: a scenario file in `remote_scenarios`, next to the working
+        directory
+
+    Entries are sorted on their last reference, recorded by the deployments, or on
+    their modification time if never recorded. A git mirror is not evicted while a
+    repository kept in the cache borrows its objects.
+    """
+
+    def __init__(self, working_directory: Path | None = None) -> None:
+        """Object instanciation.
+
+        Args:
+            working_directory (Path | None, optional): QDT working directory. If None,
+                the current one is used. Defaults to None.
+        """
+        if working_directory is None:
+            working_directory = get_qdt_working_directory()
+        self.working_directory = Path(os.path.realpath(working_directory))
+        self.usage_path = self.working_directory.joinpath(CACHE_USAGE_FILENAME)
+        self.last_used: dict[str, float] = {}
+
+        self.load_usage()
+
+    # -- I/O -----------------------------------------------------------------
+    def load_usage(self) -> bool:
+        """Load the last references of cache entries, if stored.
+
+        Returns:
+            bool: True if the usage file has been loaded
+        """
+        # without usage file, modification times are used instead
+        usage_data = load_json_file(file_path=self.usage_path)
+        if usage_data is None:
+            return False
+
+        self.last_used = usage_data.get("last_used", {})
+        return True
+
+    def save_usage(self, references: dict[str, float] | None = None) -> Path:
+        """Merge references recorded during a run into the usage file, forgetting
+            entries which no longer exist, and write it atomically.
+
+        Args:
+            references (dict[str, float] | None, optional): last reference timestamp
+                by real path. Defaults to None.
+
+        Returns:
+            Path: path to the usage file
+        """
+        if references:
+            self.last_used.update(references)
+        self.last_used = {
+            entry_path: last_used
+            for entry_path, last_used in self.last_used.items()
+            if os.path.exists(entry_path)
+        }
+
+        return write_json_atomically(
+            json_data={"last_used": self.last_used}, file_path=self.usage_path
+        )
+
+    # -- Entries -------------------------------------------------------------
+    @property
+    def cache_areas(self) -> dict[str, tuple[Path, bool]]:
+        """Folders holding cache entries, by kind of entry.
+
+        Returns:
+            dict[str, tuple[Path, bool]]: folder and whether its entries are
+                subfolders (True) or files (False)
+        """
+        return {
+            "plugin": (self.working_directory.joinpath("plugins"), False),
+            "repository": (self.working_directory.joinpath("repositories"), True),
+            "git_mirror": (self.working_directory.joinpath("git_mirrors"), True),
+            "quarantined_plugin": (
+                self.working_directory.joinpath("plugins_quarantine"),
+                False,
+            ),
+            "remote_scenario": (
+                self.working_directory.parent.joinpath("remote_scenarios"),
+                False,
+            ),
+        }
+
+    def list_entries(self) -> list[CacheEntry]:
+        """List cache entries with their size and last reference.
+
+        Returns:
+            list[CacheEntry]: cache entries, least recently used first
+        """
+        entries: list[CacheEntry] = []
+        for kind, (area_folder, entries_are_folders) in self.cache_areas.items():
+            if not area_folder.is_dir():
+                continue
+
+            if entries_are_folders:
+                with os.scandir(area_folder) as area_entries:
+                    for area_entry in area_entries:
+                        if not area_entry.is_dir(follow_symlinks=False):
+                            continue
+                        entries.append(
+                            self._build_entry(
+                                path=Path(area_entry.path),
+                                kind=kind,
+                                size=get_folder_size(area_entry.path),
+                                mtime=area_entry.stat().st_mtime,
+                            )
+                        )
+            else:
+                for folder_path, _, file_names in os.walk(area_folder):
+                    for file_name in file_names:
+                        file_path = Path(folder_path, file_name)
+                        if kind == "plugin" and file_path.suffix != ".zip":
+                            continue
+                        file_stat = file_path.stat()
+                        entries.append(
+                            self._build_entry(
+                                path=file_path,
+                                kind=kind,
+                                size=file_stat.st_size,
+                                mtime=file_stat.st_mtime,
+                            )
+                        )
+
+        return sorted(entries, key=lambda entry: entry.last_used)
+
+    def _build_entry(
+        self, path: Path, kind: str, size: int, mtime: float
+    ) -> CacheEntry:
+        """Build a cache entry, using the last recorded reference if any.
+
+        Args:
+            path (Path): entry path
+            kind (str): kind of entry
+            size (int): entry size in bytes
+            mtime (float): modification time, used if no reference is recorded
+
+        Returns:
+            CacheEntry: cache entry
+        """
+        return CacheEntry(
+            path=path,
+            kind=kind,
+            size=size,
+            last_used=self.last_used.get(os.fspath(path), mtime),
+        )
+
+    # -- Eviction ------------------------------------------------------------
+    def prune(
+        self,
+        max_size: int,
+        protected: dict[str, float] | None = None,
+        dry_run: bool = False,
+    ) -> tuple[list[CacheEntry], int]:
+        """Evict the least recently used entries until the cache fits the budget.
+
+        Args:
+            max_size (int): cache budget, in bytes
+            protected (dict[str, float] | None, optional): entries which must not be
+                evicted, typically those referenced during the running deployment,
+                by real path. Defaults to None.
+            dry_run (bool, optional): only list the entries which would be evicted.
+                Defaults to False.
+
+        Returns:
+            tuple[list[CacheEntry], int]: evicted entries and remaining cache size
+        """
+        protected = protected or {}
+        entries = self.list_entries()
+        cache_size = sum(entry.size for entry in entries)
+        logger.info(
+            f"QDT cache size: {convert_octets(cache_size)} in {len(entries)} entries. "
+            f"Budget: {convert_octets(max_size)}."
+        )
+        if cache_size <= max_size:
+            return [], cache_size
+
+        # repositories borrowing objects from git mirrors
+        mirrors_borrowers: dict[str, set[str]] = {}
+        for entry in entries:
+            if entry.kind == "repository":
+                for mirror_path in find_borrowed_git_mirrors(entry.path):
+                    mirrors_borrowers.setdefault(mirror_path, set()).add(
+                        os.fspath(entry.path)
+                    )
+
+        evicted: list[CacheEntry] = []
+        evicted_paths: set[str] = set()
+        failed_paths: set[str] = set()
+        candidates = [
+            entry for entry in entries if os.fspath(entry.path) not in protected
+        ]
+        # mirrors are freed once their borrowers are evicted: loop until stable
+        progress = True
+        while cache_size > max_size and progress:
+            progress = False
+            for entry in candidates:
+                if cache_size <= max_size:
+                    break
+                entry_path = os.fspath(entry.path)
+                if entry_path in evicted_paths or entry_path in failed_paths:
+                    continue
+                if entry.kind == "git_mirror" and (
+                    mirrors_borrowers.get(entry_path, set()) - evicted_paths
+                ):
+                    continue
+
+                if not dry_run and not self.remove_entry(entry=entry):
+                    failed_paths.add(entry_path)
+                    continue
+                evicted.append(entry)
+                evicted_paths.add(entry_path)
+                cache_size -= entry.size
+                progress = True
+
+        logger.info(
+            f"{len(evicted)} cache entries {'to evict' if dry_run else 'evicted'} "
+            f"({convert_octets(sum(entry.size for entry in evicted))}). Remaining "
+            f"cache size: {convert_octets(cache_size)}."
+        )
+        if cache_size > max_size:
+            logger.warning(
+                "QDT cache still exceeds its budget: remaining entries are in use by "
+                "the current deployment or by a kept repository."
+            )
+
+        if not dry_run:
+            self.save_usage()
+
+        return evicted, cache_size
+
+    @staticmethod
+    def remove_entry(entry: CacheEntry) -> bool:
+        """Remove a cache entry from the disk.
+
+        Args:
+            entry (CacheEntry): entry to remove
+
+        Returns:
+            bool: True if the entry has been removed
+        """
+        try:
+            if entry.path.is_dir():
+                rmtree(entry.path)
+            else:
+                entry.path.unlink(missing_ok=True)
+        except OSError as err:
+            logger.error(f"Cache entry {entry.path} can't be removed. Trace: {err}")
+            return False
+
+        logger.debug(
+            f"Cache entry evicted ({entry.kind}, {convert_octets(entry.size)}): "
+            f"{entry.path}"
+        )
+        return True
+
+
+# #############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def get_folder_size(folder_path: str | Path) -> int:
+    """Compute the size of a folder tree, without following symbolic links.
+
+    Args:
+        folder_path (str | Path): folder to measure
+
+    Returns:
+        int: size in bytes
+    """
+    total_size = 0
+    pending_folders = [os.fspath(folder_path)]
+    while pending_folders:
+        try:
+            with os.scandir(pending_folders.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending_folders.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        total_size += entry.stat(follow_symlinks=False).st_size
+        except OSError as err:
+            logger.debug(f"Folder can't be measured: {err}")
+
+    return total_size
+
+
+def find_borrowed_git_mirrors(repository_path: Path, max_depth: int = 3) -> set[str]:
+    """List git mirrors whose objects are borrowed, through git alternates, by the
+        working trees of a downloaded repository.
+
+    Args:
+        repository_path (Path): downloaded repository folder
+        max_depth (int, optional): maximum depth of working trees in the folder.
+            Defaults to 3.
+
+    Returns:
+        set[str]: real paths to the borrowed git mirrors
+    """
+    mirrors: set[str] = set()
+    current_folders = [repository_path]
+    for _ in range(max_depth + 1):
+        next_folders: list[Path] = []
+        for folder in current_folders:
+            alternates_path = folder.joinpath(".git", "objects", "info", "alternates")
+            if alternates_path.is_file():
+                for line in alternates_path.read_text(encoding="UTF-8").splitlines():
+                    if line.strip() and not line.startswith("#"):
+                        mirrors.add(os.path.realpath(Path(line.strip()).parent))
+            try:
+                next_folders.extend(
+                    Path(entry.path)
+                    for entry in os.scandir(folder)
+                    if entry.name != ".git" and entry.is_dir(follow_symlinks=False)
+                )
+            except OSError:
+                continue
+        current_folders = next_folders
+
+    return mirrors
+
+
+def parse_size(size: str | int) -> int:
+    """Convert a size to bytes. Units are binary multiples, case insensitive, with or
+        without 'B' or 'o' suffix: '500M', '1.5 GB', '2Go' or a number of bytes.
+
+    Args:
+        size (str | int): size to convert
+
+    Raises:
+        ValueError: if the size can't be parsed
+
+    Returns:
+        int: size in bytes
+    """
+    if isinstance(size, int):
+        return size
+
+    size_match = _regex_size.match(str(size))
+    if not size_match:
+        raise ValueError(
+            f"Invalid size: {size}. Expected a number of bytes or a number followed "
+            "by a unit: K, M, G or T (i.e. 500M, 2GB)."
+        )
+    value, unit = size_match.groups()
+    return int(float(value) * _SIZE_UNITS[unit.upper()])
+
+
+# run-scoped references to cache entries
+CACHE_USAGE = CacheUsageJournal()
@@ -0,0 +1,188 @@
+#! python3  # noqa: E265
+
+"""
+    LAN cache peers: other QDT machines exposing their plugins archives through
+    `qdt cache-serve`, tried before the origin servers.
+
+    Author: Julien Moura (https://github.com/guts)
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import logging
+import os
+from os import getenv
+from pathlib import Path, PurePosixPath
+from urllib.parse import quote
+from uuid import uuid4
+
+# 3rd party
+from requests import Session
+from requests.exceptions import RequestException
+
+# package
+from qgis_deployment_toolbelt.__about__ import __title_clean__, __version__
+from qgis_deployment_toolbelt.constants import get_qdt_working_directory
+
+# #############################################################################
+# ########## Globals ###############
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+# peers are on the LAN: they must answer quickly or be skipped
+PEER_TIMEOUT: tuple[int, int] = (3, 60)
+
+# only files named after their content are served: a copy can't be stale
+SERVED_FILES_SUFFIX: str = ".zip"
+
+# #############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def get_cache_served_folders(working_directory: Path | None = None) -> dict[str, Path]:
+    """Folders of the QDT working directory exposed to the LAN, by URL prefix. Shared
+        between the cache server and its clients, so that a local file path maps to
+        the same URL path on every machine.
+
+    Only plugins archives are shared: they are named after the plugin version, so a
+    peer can't serve a stale copy, whereas profiles and scenarios change under the
+    same name and downloaded repositories may hold credentials (i.e. .git/config).
+
+    Args:
+        working_directory (Path | None, optional): QDT working directory. If None,
+            the current one is used. Defaults to None.
+
+    Returns:
+        dict[str, Path]: URL prefix and matching local folder
+    """
+    if working_directory is None:
+        working_directory = get_qdt_working_directory()
+
+    return {"plugins": working_directory / "plugins"}
+
+
+def is_servable_path(relative_path: PurePosixPath) -> bool:
+    """Tell if a path, relative to a served folder, may be shared with peers: a
+        plugin archive named after a version (not 'latest') outside of any hidden
+        folder (.git, temporary files...).
+
+    Args:
+        relative_path (PurePosixPath): path relative to a served folder
+
+    Returns:
+        bool: True if the path may be served
+    """
+    return (
+        bool(relative_path.parts)
+        and relative_path.suffix.lower() == SERVED_FILES_SUFFIX
+        and not relative_path.stem.lower().endswith("_latest")
+        and not any(part.startswith(".") for part in relative_path.parts)
+    )
+
+
+def get_cache_peers() -> list[str]:
+    """List cache peers base URLs set through QDT_CACHE_PEERS (comma separated).
+
+    Returns:
+        list[str]: peers base URLs, without trailing slash
+    """
+    raw_peers = getenv("QDT_CACHE_PEERS", "")
+    return [
+        peer.strip().rstrip("/")
+        for peer in raw_peers.replace(";", ",").split(",")
+        if peer.strip()
+    ]
+
+
+def get_peer_relative_path(
+    local_file_path: Path, served_folders: dict[str, Path] | None = None
+) -> str | None:
+    """Get the URL path under which a local file is served by cache peers.
+
+    Args:
+        local_file_path (Path): local file path
+        served_folders (dict[str, Path] | None, optional): served folders. If None,
+            get_cache_served_folders is used. Defaults to None.
+
+    Returns:
+        str | None: URL path (quoted, relative to peer base URL) or None if the file is
+            not in a served folder
+    """
+    if served_folders is None:
+        served_folders = get_cache_served_folders()
+
+    local_file_path = Path(os.path.abspath(local_file_path))
+    for prefix, served_folder in served_folders.items():
+        try:
+            relative_path = local_file_path.relative_to(os.path.abspath(served_folder))
+        except ValueError:
+            continue
+        if not is_servable_path(PurePosixPath(*relative_path.parts)):
+            return None
+        return quote(str(PurePosixPath(prefix, *relative_path.parts)))
+
+    return None
+
+
+def download_from_cache_peers(
+    local_file_path: Path, chunk_size: int = 8192
+) -> Path | None:
+    """Try to download a file from LAN cache peers, in the order they are listed.
+
+    Args:
+        local_file_path (Path): local path where the file is expected
+        chunk_size (int, optional): size of each chunk to read and write in bytes.
+            Defaults to 8192.
+
+    Returns:
+        Path | None: local file path or None if no peer could serve the file
+    """
+    peers = get_cache_peers()
+    if not peers:
+        return None
+
+    relative_path = get_peer_relative_path(local_file_path=local_file_path)
+    if relative_path is None:
+        return None
+
+    local_file_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file_path = local_file_path.with_name(
+        f".{local_file_path.name}.{uuid4().hex}.tmp"
+    )
+
+    with Session() as peer_session:
+        # peers are reached directly, never through a proxy
+        peer_session.trust_env = False
+        peer_session.headers["User-Agent"] = f"{__title_clean__}/{__version__}"
+
+        for peer in peers:
+            peer_url = f"{peer}/{relative_path}"
+            try:
+                with peer_session.get(
+                    peer_url, stream=True, timeout=PEER_TIMEOUT
+                ) as response:
+                    if response.status_code != 200:
+                        logger.debug(
+                            f"Cache peer {peer} can't serve {relative_path}: "
+                            f"HTTP {response.status_code}"
+                        )
+                        continue
+                    with tmp_file_path.open(mode="wb") as buffile:
+                        for chunk in response.iter_content(chunk_size=chunk_size):
+                            buffile.write(chunk)
+                os.replace(tmp_file_path, local_file_path)
+            except (OSError, RequestException) as err:
+                logger.debug(f"Cache peer {peer} is not usable. Trace: {err}")
+                tmp_file_path.unlink(missing_ok=True)
+                continue
+
+            logger.info(f"{local_file_path.name} downloaded from cache peer {peer}.")
+            return local_file_path
+
+    return None
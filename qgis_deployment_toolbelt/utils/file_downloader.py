@@ -9,8 +9,9 @@
 import logging
 import ssl
 import warnings
-from os import getenv
+from os import getenv, link
 from pathlib import Path
+from shutil import copy2
 
 # 3rd party
 import truststore
@@ -22,9 +23,13 @@ from urllib3.exceptions import InsecureRequestWarning
 
 # package
 from qgis_deployment_toolbelt.__about__ import __title_clean__, __version__
+from qgis_deployment_toolbelt.utils.cache_peers import download_from_cache_peers
 from qgis_deployment_toolbelt.utils.formatters import convert_octets
+from qgis_deployment_toolbelt.utils.network_scheduler import request_with_retries
 from qgis_deployment_toolbelt.utils.proxies import get_proxy_settings
+from qgis_deployment_toolbelt.utils.single_flight import SingleFlight
 from qgis_deployment_toolbelt.utils.str2bool import str2bool
+from qgis_deployment_toolbelt.utils.url_helpers import normalize_url
 
 # ############################################################################
 # ########## GLOBALS #############
@@ -42,6 +47,9 @@ if not str2bool(getenv("QDT_SSL_VERIFY", True)):
         "See: https://urllib3.readthedocs.io/en/latest/advanced-usage.html#tls-warnings"
     )
 
+# run-scoped registry of downloads, keyed by normalized URL
+DOWNLOADS_REGISTRY = SingleFlight()
+
 
 # ############################################################################
 # ########## CLASSES #############
@@ -75,6 +83,41 @@ class TruststoreAdapter(HTTPAdapter):
 # ################################
 
 
+def build_http_session(
+    url: str,
+    user_agent: str = f"{__title_clean__}/{__version__}",
+    content_type: str | None = None,
+) -> Session:
+    """Prepare an HTTP session configured as QDT expects it: headers, proxies and
+        SSL settings (verification and system certificates stores).
+
+    Args:
+        url (str): URL to request, used to determine proxies settings
+        user_agent (str, optional): user agent to use to perform the request. Defaults \
+            to f"{__title_clean__}/{__version__}".
+        content_type (str | None, optional): HTTP content-type. Defaults to None.
+
+    Returns:
+        Session: configured session, to be used as context manager
+    """
+    # headers
+    headers = {"User-Agent": user_agent}
+    if content_type:
+        headers["Accept"] = content_type
+
+    dl_session = Session()
+    dl_session.headers.update(headers)
+    dl_session.proxies.update(get_proxy_settings(url=requote_uri(url)))
+    dl_session.verify = str2bool(getenv("QDT_SSL_VERIFY", True))
+
+    # handle local system certificates store
+    if str2bool(getenv("QDT_SSL_USE_SYSTEM_STORES", False)):
+        logger.debug("Option to use native system certificates stores is enabled.")
+        dl_session.mount("https://", TruststoreAdapter())
+
+    return dl_session
+
+
 def download_remote_file_to_local(
     remote_url_to_download: str,
     local_file_path: Path,
@@ -83,6 +126,107 @@ def download_remote_file_to_local(
     chunk_size: int = 8192,
     timeout: tuple[int, int] = (800, 800),
     use_stream: bool = True,
+) -> Path:
+    """Download a remote file to a local path, sharing the transfer with any other
+        request for the same URL during the run (single-flight). If the same resource
+        has been (or is being) downloaded to another local path, the file is linked
+        (or copied if links are not supported) instead of being downloaded again.
+
+    Args:
+        remote_url_to_download (str): remote URL of the file to download
+        local_file_path (Path): local path where to store the file
+        user_agent (str, optional): user agent to use to perform the request. Defaults \
+            to f"{__title_clean__}/{__version__}".
+        content_type (str | None, optional): HTTP content-type. Defaults to None.
+        chunk_size (int, optional): size of each chunk to read and write in bytes. \
+            Defaults to 8192.
+        timeout (tuple[int, int], optional): custom timeout (request, response). \
+            Defaults to (800, 800).
+        use_stream (bool, optional): Option to enable/disable streaming download. \
+            Defaults to True.
+
+    Returns:
+        Path: path to the local file (should be the same as local_file_path)
+    """
+    flight_key = normalize_url(remote_url_to_download)
+    downloaded_file_path, is_shared = DOWNLOADS_REGISTRY.do(
+        flight_key,
+        _download_remote_file_to_local,
+        remote_url_to_download=remote_url_to_download,
+        local_file_path=local_file_path,
+        user_agent=user_agent,
+        content_type=content_type,
+        chunk_size=chunk_size,
+        timeout=timeout,
+        use_stream=use_stream,
+    )
+
+    if not is_shared:
+        return downloaded_file_path
+
+    # the file downloaded by another request may have been removed since then
+    if not downloaded_file_path.is_file():
+        logger.debug(
+            f"File previously downloaded from {remote_url_to_download} is gone "
+            f"({downloaded_file_path}). Downloading it again."
+        )
+        DOWNLOADS_REGISTRY.forget(flight_key)
+        return download_remote_file_to_local(
+            remote_url_to_download=remote_url_to_download,
+            local_file_path=local_file_path,
+            user_agent=user_agent,
+            content_type=content_type,
+            chunk_size=chunk_size,
+            timeout=timeout,
+            use_stream=use_stream,
+        )
+
+    return share_local_file(
+        source_file_path=downloaded_file_path, target_file_path=local_file_path
+    )
+
+
+def share_local_file(source_file_path: Path, target_file_path: Path) -> Path:
+    """Make a local file available at another path, using a hard link to keep only
+        one file on disk and falling back to a copy if links are not supported (i.e.
+        different file systems).
+
+    Args:
+        source_file_path (Path): existing file
+        target_file_path (Path): path where the file must be available
+
+    Returns:
+        Path: target file path
+    """
+    if target_file_path.exists():
+        if target_file_path.samefile(source_file_path):
+            return target_file_path
+        target_file_path.unlink()
+
+    target_file_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        link(source_file_path, target_file_path)
+        logger.debug(
+            f"{target_file_path} linked to already downloaded {source_file_path}."
+        )
+    except OSError as err:
+        logger.debug(
+            f"Linking {target_file_path} to {source_file_path} failed ({err}). "
+            "Copying it instead."
+        )
+        copy2(source_file_path, target_file_path)
+
+    return target_file_path
+
+
+def _download_remote_file_to_local(
+    remote_url_to_download: str,
+    local_file_path: Path,
+    user_agent: str = f"{__title_clean__}/{__version__}",
+    content_type: str | None = None,
+    chunk_size: int = 8192,
+    timeout: tuple[int, int] = (800, 800),
+    use_stream: bool = True,
 ) -> Path:
     """Check if the local index file exists. If not, download the search index from \
         remote URL. If it does exist, check if it has been modified.
@@ -100,6 +244,12 @@ def download_remote_file_to_local(
         use_stream (bool, optional): Option to enable/disable streaming download. \
             Defaults to True.
 
+    Note:
+        Requests answered with 429 or 503 are retried honouring the Retry-After
+        header. See `network_scheduler.request_with_retries`.
+        If QDT_CACHE_PEERS is set and the local path is in a folder served by
+        `qdt cache-serve`, peers are tried before the remote URL.
+
     Returns:
         Path: path to the local file (should be the same as local_file_path)
     """
@@ -111,28 +261,21 @@ def download_remote_file_to_local(
     # make sure parents folder exist
     local_file_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # headers
-    headers = {"User-Agent": user_agent}
-    if content_type:
-        headers["Accept"] = content_type
+    # LAN cache peers first, if any
+    if download_from_cache_peers(
+        local_file_path=local_file_path, chunk_size=chunk_size
+    ):
+        return local_file_path
 
     try:
-        with Session() as dl_session:
-            dl_session.headers.update(headers)
-            dl_session.proxies.update(
-                get_proxy_settings(url=requote_uri(remote_url_to_download))
-            )
-            dl_session.verify = str2bool(getenv("QDT_SSL_VERIFY", True))
-
-            # handle local system certificates store
-            if str2bool(getenv("QDT_SSL_USE_SYSTEM_STORES", False)):
-                logger.debug(
-                    "Option to use native system certificates stores is enabled."
-                )
-                dl_session.mount("https://", TruststoreAdapter())
-
-            with dl_session.get(
+        with build_http_session(
+            url=remote_url_to_download,
+            user_agent=user_agent,
+            content_type=content_type,
+        ) as dl_session:
+            with request_with_retries(
                 url=requote_uri(remote_url_to_download),
+                session=dl_session,
                 stream=use_stream,
                 timeout=timeout,
             ) as req:
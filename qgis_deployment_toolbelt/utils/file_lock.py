@@ -0,0 +1,129 @@
+#! python3  # noqa: E265
+
+"""
+    Inter-process (and inter-machine, through network shares) file lock, based on the
+    exclusive creation of a lock file.
+
+    Author: Julien Moura (https://github.com/guts)
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import logging
+import os
+import socket
+import time
+from pathlib import Path
+
+# #############################################################################
+# ########## Globals ###############
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class FileLockTimeout(TimeoutError):
+    """Raised when the lock can't be acquired in time."""
+
+
+class FileLock:
+    """Lock based on a lock file created exclusively (O_EXCL), which works on local
+    file systems and on network shares (SMB, NFS) where fcntl/msvcrt locks are not
+    reliable. A lock file older than stale_after seconds is considered left over by a
+    crashed process and is removed.
+
+    .. code-block:: python
+
+        with FileLock(Path("/shared/cache/plugin.zip.lock")):
+            ...
+    """
+
+    def __init__(
+        self,
+        lock_path: Path,
+        timeout: float = 300,
+        stale_after: float = 600,
+        poll_interval: float = 0.5,
+    ) -> None:
+        """Object instanciation.
+
+        Args:
+            lock_path (Path): path to the lock file
+            timeout (float, optional): maximum time to wait for the lock, in seconds.
+                Defaults to 300.
+            stale_after (float, optional): age of a lock file after which it's
+                considered stale, in seconds. Defaults to 600.
+            poll_interval (float, optional): delay between two attempts, in seconds.
+                Defaults to 0.5.
+        """
+        self.lock_path = Path(lock_path)
+        self.timeout = timeout
+        self.stale_after = stale_after
+        self.poll_interval = poll_interval
+        self.is_locked: bool = False
+
+    def acquire(self) -> None:
+        """Acquire the lock, waiting for it if needed.
+
+        Raises:
+            FileLockTimeout: if the lock is not acquired within the timeout
+        """
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                self._remove_if_stale()
+                if time.monotonic() >= deadline:
+                    raise FileLockTimeout(
+                        f"Lock {self.lock_path} not acquired within {self.timeout}s."
+                    )
+                time.sleep(self.poll_interval)
+                continue
+
+            with os.fdopen(fd, "w", encoding="UTF-8") as lock_file:
+                lock_file.write(f"{socket.gethostname()}:{os.getpid()}")
+            self.is_locked = True
+            logger.debug(f"Lock acquired: {self.lock_path}")
+            return
+
+    def release(self) -> None:
+        """Release the lock."""
+        if not self.is_locked:
+            return
+        try:
+            self.lock_path.unlink(missing_ok=True)
+        except OSError as err:
+            logger.warning(f"Unable to remove lock file {self.lock_path}. Trace: {err}")
+        self.is_locked = False
+        logger.debug(f"Lock released: {self.lock_path}")
+
+    def _remove_if_stale(self) -> None:
+        """Remove the lock file if it's older than the stale delay."""
+        try:
+            lock_age = time.time() - self.lock_path.stat().st_mtime
+        except FileNotFoundError:
+            return
+
+        if lock_age > self.stale_after:
+            logger.warning(
+                f"Removing stale lock file {self.lock_path} ({int(lock_age)}s old)."
+            )
+            self.lock_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "FileLock":
+        """Acquire the lock when entering the context."""
+        self.acquire()
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Release the lock when leaving the context."""
+        self.release()
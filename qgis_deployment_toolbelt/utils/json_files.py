@@ -0,0 +1,78 @@
+#! python3  # noqa: E265
+
+"""
+    Read and write the JSON files QDT keeps between runs (indexes, inventories, usage),
+    atomically so that a concurrent reader never gets a partially written file.
+
+    Author: Julien Moura (https://github.com/guts)
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import json
+import logging
+import os
+from pathlib import Path
+from uuid import uuid4
+
+# #############################################################################
+# ########## Globals ###############
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+# #############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def load_json_file(file_path: Path) -> dict | None:
+    """Load a JSON file storing an object.
+
+    Args:
+        file_path (Path): path to the JSON file
+
+    Returns:
+        dict | None: file content or None if the file doesn't exist or can't be read
+    """
+    if not file_path.is_file():
+        return None
+
+    try:
+        with file_path.open(mode="r", encoding="UTF-8") as in_json:
+            json_data = json.load(in_json)
+        if not isinstance(json_data, dict):
+            raise ValueError(f"a JSON object is expected, not {type(json_data)}")
+    except (OSError, ValueError) as err:
+        logger.warning(f"JSON file {file_path} can't be read. Trace: {err}")
+        return None
+
+    return json_data
+
+
+def write_json_atomically(json_data: dict, file_path: Path) -> Path:
+    """Write an object into a JSON file through a temporary file renamed once complete.
+        The temporary file name is unique, so threads and processes writing the same
+        file don't collide: the last rename wins.
+
+    Args:
+        json_data (dict): object to write
+        file_path (Path): path to the JSON file
+
+    Returns:
+        Path: path to the JSON file
+    """
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = file_path.with_name(f".{file_path.name}.{uuid4().hex}.tmp")
+    try:
+        with tmp_path.open(mode="w", encoding="UTF-8") as out_json:
+            json.dump(json_data, out_json, separators=(",", ":"))
+        os.replace(tmp_path, file_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+    return file_path
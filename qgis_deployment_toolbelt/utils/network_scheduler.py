@@ -0,0 +1,253 @@
+#! python3  # noqa: E265
+
+"""
+    Fleet-friendly scheduling of network operations: deterministic start jitter per
+    host and retries honouring the Retry-After header on overloaded servers.
+
+    Author: Julien Moura (https://github.com/guts)
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import logging
+import socket
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from hashlib import sha256
+from os import getenv
+from threading import Lock
+
+# 3rd party
+import requests
+from requests import Response, Session
+
+# #############################################################################
+# ########## Globals ###############
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+# HTTP status codes meaning "come back later"
+RETRYABLE_STATUS_CODES: tuple[int, ...] = (429, 503)
+
+# defaults
+DEFAULT_HTTP_RETRIES: int = 3
+DEFAULT_HTTP_BACKOFF_BASE: float = 1.0
+DEFAULT_HTTP_BACKOFF_MAX: float = 60.0
+
+# jitter is applied only once per run, before the first network phase
+_jitter_lock = Lock()
+_jitter_applied: bool = False
+
+
+# #############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def _getenv_float(env_var_name: str, default: float) -> float:
+    """Read a positive float from an environment variable, falling back to the
+        default value if unset or invalid.
+
+    Args:
+        env_var_name (str): name of the environment variable
+        default (float): value to use if unset or invalid
+
+    Returns:
+        float: value read from environment or default
+    """
+    raw_value = getenv(env_var_name)
+    if raw_value is None or raw_value == "":
+        return default
+    try:
+        value = float(raw_value)
+    except ValueError:
+        logger.warning(
+            f"Invalid value for {env_var_name}: {raw_value}. Must be a number. "
+            f"Fallback to default: {default}"
+        )
+        return default
+    if value < 0:
+        logger.warning(
+            f"Negative value for {env_var_name}: {raw_value}. "
+            f"Fallback to default: {default}"
+        )
+        return default
+    return value
+
+
+def get_host_jitter_delay(max_delay: float, hostname: str | None = None) -> float:
+    """Compute a deterministic delay for the given host, spread uniformly between 0 and
+        max_delay. The same host always gets the same delay, so a fleet of workstations
+        scheduled at the same time spreads itself out without any coordination.
+
+    Args:
+        max_delay (float): upper bound of the delay, in seconds
+        hostname (str | None, optional): host name to hash. If None, the local host
+            name is used. Defaults to None.
+
+    Returns:
+        float: delay in seconds
+    """
+    if max_delay <= 0:
+        return 0.0
+
+    if hostname is None:
+        hostname = socket.gethostname()
+
+    digest = sha256(hostname.lower().encode("UTF-8")).digest()
+    ratio = int.from_bytes(digest[:8], byteorder="big") / float(1 << 64)
+
+    return round(ratio * max_delay, 3)
+
+
+def apply_host_jitter(phase_name: str = "network") -> float:
+    """Wait for the deterministic host delay before the first network phase of the run.
+        Disabled unless QDT_NETWORK_JITTER_MAX is set to a positive number of seconds.
+        Subsequent calls during the same run return immediately.
+
+    Args:
+        phase_name (str, optional): label of the network phase, used in logs.
+            Defaults to "network".
+
+    Returns:
+        float: applied delay in seconds (0 if disabled or already applied)
+    """
+    global _jitter_applied
+
+    max_delay = _getenv_float("QDT_NETWORK_JITTER_MAX", 0.0)
+    if max_delay <= 0:
+        return 0.0
+
+    with _jitter_lock:
+        if _jitter_applied:
+            return 0.0
+        _jitter_applied = True
+
+    delay = get_host_jitter_delay(max_delay=max_delay)
+    logger.info(
+        f"Waiting {delay}s (host jitter, max {max_delay}s) before {phase_name} phase."
+    )
+    time.sleep(delay)
+
+    return delay
+
+
+def reset_host_jitter() -> None:
+    """Allow the host jitter to be applied again, i.e. for a new run."""
+    global _jitter_applied
+    with _jitter_lock:
+        _jitter_applied = False
+
+
+def parse_retry_after(retry_after_value: str | None) -> float | None:
+    """Parse the value of an HTTP Retry-After header.
+
+    Args:
+        retry_after_value (str | None): header value: either a number of seconds or
+            an HTTP-date.
+
+    Returns:
+        float | None: number of seconds to wait or None if the value is missing or
+            not understood
+    """
+    if not retry_after_value:
+        return None
+
+    retry_after_value = retry_after_value.strip()
+    if retry_after_value.isdigit():
+        return float(retry_after_value)
+
+    try:
+        retry_date = parsedate_to_datetime(retry_after_value)
+    except (TypeError, ValueError):
+        logger.debug(f"Unable to parse Retry-After header: {retry_after_value}")
+        return None
+
+    if retry_date.tzinfo is None:
+        retry_date = retry_date.replace(tzinfo=timezone.utc)
+
+    return max(0.0, (retry_date - datetime.now(tz=timezone.utc)).total_seconds())
+
+
+def compute_backoff_delay(
+    attempt: int,
+    retry_after: float | None = None,
+    base_delay: float = DEFAULT_HTTP_BACKOFF_BASE,
+    max_delay: float = DEFAULT_HTTP_BACKOFF_MAX,
+) -> float:
+    """Compute the delay before the next attempt: the server's Retry-After if given,
+        else an exponential backoff. In both cases, the delay is capped.
+
+    Args:
+        attempt (int): number of the attempt which just failed (starting at 1)
+        retry_after (float | None, optional): delay asked by the server through the
+            Retry-After header. Defaults to None.
+        base_delay (float, optional): delay of the first backoff, in seconds.
+            Defaults to DEFAULT_HTTP_BACKOFF_BASE.
+        max_delay (float, optional): maximum delay, in seconds. Defaults to
+            DEFAULT_HTTP_BACKOFF_MAX.
+
+    Returns:
+        float: delay in seconds
+    """
+    if retry_after is not None:
+        return min(retry_after, max_delay)
+
+    return min(base_delay * (2 ** (attempt - 1)), max_delay)
+
+
+def request_with_retries(
+    url: str,
+    method: str = "GET",
+    session: Session | None = None,
+    max_retries: int | None = None,
+    **kwargs,
+) -> Response:
+    """Perform an HTTP request, retrying when the server answers it's overloaded
+        (429 or 503), honouring the Retry-After header with a capped exponential
+        backoff.
+
+    The number of retries and the maximum delay can be set through QDT_HTTP_RETRIES and
+    QDT_HTTP_BACKOFF_MAX environment variables.
+
+    Args:
+        url (str): URL to request
+        method (str, optional): HTTP method. Defaults to "GET".
+        session (Session | None, optional): session to use. If None, a one-shot
+            request is performed. Defaults to None.
+        max_retries (int | None, optional): number of retries. If None, the value of
+            QDT_HTTP_RETRIES is used. Defaults to None.
+        kwargs: parameters passed to the request (headers, stream, timeout...)
+
+    Returns:
+        Response: last response received. It's up to the caller to raise for status.
+    """
+    if max_retries is None:
+        max_retries = int(_getenv_float("QDT_HTTP_RETRIES", DEFAULT_HTTP_RETRIES))
+    max_delay = _getenv_float("QDT_HTTP_BACKOFF_MAX", DEFAULT_HTTP_BACKOFF_MAX)
+    requester = session if session is not None else requests
+
+    attempt = 1
+    while True:
+        response: Response = requester.request(method=method, url=url, **kwargs)
+        if response.status_code not in RETRYABLE_STATUS_CODES or attempt > max_retries:
+            return response
+
+        delay = compute_backoff_delay(
+            attempt=attempt,
+            retry_after=parse_retry_after(response.headers.get("Retry-After")),
+            max_delay=max_delay,
+        )
+        logger.warning(
+            f"{url} answered {response.status_code} (attempt {attempt}/"
+            f"{max_retries + 1}). Retrying in {delay}s."
+        )
+        response.close()
+        time.sleep(delay)
+        attempt += 1
@@ -12,16 +12,22 @@
 
 # Standard library
 import logging
-import os
 from functools import lru_cache
-from os import environ
-from urllib.request import getproxies
+from os import environ, getenv
+from threading import Lock
+from urllib.parse import unquote, urlsplit
+from urllib.request import getproxies, proxy_bypass_environment
 
 # 3rd party
-from pypac import get_pac, pac_context_for_url
+import urllib3
+from dulwich.client import check_for_proxy_bypass, default_urllib3_manager
+from dulwich.config import Config, StackedConfig
+from pypac import get_pac
 from pypac.parser import PACFile
+from pypac.resolver import ProxyConfigExhaustedError, ProxyResolver
 
 # package
+from qgis_deployment_toolbelt.utils.run_metrics import RUN_METRICS
 from qgis_deployment_toolbelt.utils.url_helpers import check_str_is_url
 
 # #############################################################################
@@ -31,19 +37,61 @@ from qgis_deployment_toolbelt.utils.url_helpers import check_str_is_url
 # logs
 logger = logging.getLogger(__name__)
 
+# PAC files are evaluated by a JavaScript engine which is not meant to be shared
+# between threads
+_pac_evaluation_lock = Lock()
+
 
 # #############################################################################
 # ########## Functions #############
 # ##################################
-@lru_cache
+def _proxy_cache_key(url: str | None) -> str:
+    """Reduce an URL to the scheme and host, which drive the proxy decision.
+
+    Args:
+        url (str | None): URL to reduce
+
+    Returns:
+        str: scheme://host/ or an empty string if no URL is given
+    """
+    if not url:
+        return ""
+
+    url_parts = urlsplit(url)
+    if not url_parts.hostname:
+        return url
+
+    return f"{url_parts.scheme.lower()}://{url_parts.hostname.lower()}/"
+
+
 def get_proxy_settings(url: str | None = None) -> dict:
     """Retrieves network proxy settings from operating system configuration or
     environment variables.
+
+    Decisions are cached per scheme and host: every file of a same server uses the
+    same proxy, without evaluating the PAC file again. Use
+    `clear_proxy_caches()` to reset caches after changing the settings.
+
     Args:
         url (str, optional): url for request in case of PAC file use
     Returns:
         dict: proxy settings with protocl as key and URL as value
     """
+    return dict(_get_proxy_settings_for_host(_proxy_cache_key(url)))
+
+
+@lru_cache
+def _get_proxy_settings_for_host(host_url: str) -> dict:
+    """Retrieves network proxy settings for a scheme and host. See get_proxy_settings.
+
+    Args:
+        host_url (str): scheme://host/ or an empty string
+
+    Returns:
+        dict: proxy settings with protocl as key and URL as value
+    """
+    url = host_url or None
+    RUN_METRICS.increment("proxy.decisions")
 
     proxy_settings = {}
     if environ.get("QDT_PROXY_HTTP"):
@@ -56,7 +104,7 @@ def get_proxy_settings(url: str | None = None) -> dict:
             f"{proxy_settings}"
         )
     elif qdt_pac_file := environ.get("QDT_PAC_FILE"):
-        if pac := load_pac_file_from_environment_variable(qdt_pac_file=qdt_pac_file):
+        if pac := get_pac_from_environment_variable(qdt_pac_file=qdt_pac_file):
             proxy_settings = get_proxy_settings_from_pac_file(url=url, pac=pac)
             logger.info(
                 f"Proxies settings from environment vars PAC file: {environ.get('QDT_PAC_FILE')}"
@@ -66,7 +114,7 @@ def get_proxy_settings(url: str | None = None) -> dict:
             logger.warning(
                 f"Invalid PAC file from environment vars PAC file : {environ.get('QDT_PAC_FILE')}. No proxy use."
             )
-    elif pac := get_pac():
+    elif pac := get_system_pac():
         proxy_settings = get_proxy_settings_from_pac_file(url=url, pac=pac)
         logger.info("Proxies settings from system PAC file: " f"{proxy_settings}")
     elif getproxies():
@@ -115,6 +163,63 @@ def get_proxy_settings(url: str | None = None) -> dict:
     return proxy_settings
 
 
+def clear_proxy_caches() -> None:
+    """Forget proxy decisions and loaded PAC files, i.e. after settings changed."""
+    _get_proxy_settings_for_host.cache_clear()
+    get_pac_from_environment_variable.cache_clear()
+    get_system_pac.cache_clear()
+    _get_pac_resolver.cache_clear()
+
+
+@lru_cache
+def get_pac_from_environment_variable(qdt_pac_file: str) -> PACFile | None:
+    """Load (and compile) the PAC file set in QDT_PAC_FILE, only once per process.
+
+    Args:
+        qdt_pac_file (str): path or URL to PAC file
+
+    Returns:
+        PACFile | None: loaded PAC file, None if value is invalid
+    """
+    RUN_METRICS.increment("proxy.pac_loads")
+    return load_pac_file_from_environment_variable(qdt_pac_file=qdt_pac_file)
+
+
+@lru_cache
+def get_system_pac() -> PACFile | None:
+    """Look for a PAC file from the OS settings and through WPAD discovery, only once
+        per process and only when needed. Each discovery request is bounded by
+        QDT_WPAD_TIMEOUT seconds (2 by default).
+
+    Returns:
+        PACFile | None: PAC file found or None
+    """
+    try:
+        wpad_timeout = float(getenv("QDT_WPAD_TIMEOUT", 2))
+    except ValueError:
+        wpad_timeout = 2
+
+    RUN_METRICS.increment("proxy.pac_discoveries")
+    try:
+        return get_pac(timeout=wpad_timeout)
+    except Exception as err:
+        logger.warning(f"PAC file discovery (WPAD) failed. Trace: {err}")
+        return None
+
+
+@lru_cache
+def _get_pac_resolver(pac: PACFile) -> ProxyResolver:
+    """Get the resolver of a PAC file, kept for the process lifetime.
+
+    Args:
+        pac (PACFile): PAC file
+
+    Returns:
+        ProxyResolver: PAC resolver
+    """
+    return ProxyResolver(pac)
+
+
 def load_pac_file_from_environment_variable(qdt_pac_file: str) -> PACFile | None:
     """Load PAC file with PyPAC from a environment variable
 
@@ -151,57 +256,95 @@ def get_proxy_settings_from_pac_file(
         dict[str, str]: _description_
     """
 
-    proxy_settings = {}
-    with pac_context_for_url(url=url, pac=pac):
-        if environ.get("HTTP_PROXY"):
-            proxy_settings["http"] = environ.get("HTTP_PROXY")
-        if environ.get("HTTPS_PROXY"):
-            proxy_settings["https"] = environ.get("HTTPS_PROXY")
-    return proxy_settings
+    with _pac_evaluation_lock:
+        RUN_METRICS.increment("proxy.pac_evaluations")
+        try:
+            proxies = _get_pac_resolver(pac).get_proxy_for_requests(url or "")
+        except ProxyConfigExhaustedError as err:
+            # every proxy returned by the PAC file has been marked as failed
+            logger.error(
+                f"No proxy returned by the PAC file is available for {url}: "
+                f"falling back to a direct connection. Trace: {err}"
+            )
+            return {}
+
+    # DIRECT is returned as None values
+    return {scheme: proxy for scheme, proxy in proxies.items() if proxy}
 
 
-def os_env_proxy(func):
-    def wrapper(*args, **kwargs):
-        """Decorator wrapper to define environment variable for proxy use.
-
-        If a proxy settings is available for https or http we:
-        - backup current environment value
-        - define environment value with proxy settings
-        - run function
-        - restore environment value if available
-
-
-        Returns:
-            _type_: function result
-        """
-        # Get proxy settings
-        proxy_settings = get_proxy_settings()
-
-        # Update environment variable and keep current value
-        prev_http_proxy = None
-        if "http" in proxy_settings:
-            prev_http_proxy = environ.get("HTTP_PROXY")
-            os.environ["HTTP_PROXY"] = proxy_settings["http"]
-        prev_https_proxy = None
-        if "https" in proxy_settings:
-            prev_https_proxy = environ.get("HTTPS_PROXY")
-            os.environ["HTTPS_PROXY"] = proxy_settings["https"]
-
-        # Run function
-        result = func(*args, **kwargs)
-
-        # Restore environment variable if available or remove it
-        if prev_http_proxy:
-            os.environ["HTTP_PROXY"] = prev_http_proxy
-        elif "HTTP_PROXY" in os.environ:
-            del os.environ["HTTP_PROXY"]
-        if prev_https_proxy:
-            os.environ["HTTPS_PROXY"] = prev_https_proxy
-        elif "HTTPS_PROXY" in os.environ:
-            del os.environ["HTTPS_PROXY"]
-        return result
-
-    return wrapper
+def is_proxy_bypassed(url: str) -> bool:
+    """Tell if an URL must be reached directly, as listed in the no_proxy (or
+        NO_PROXY) environment variable.
+
+    Args:
+        url (str): URL to check
+
+    Returns:
+        bool: True if the proxy must not be used for this URL
+    """
+    if check_for_proxy_bypass(url):
+        return True
+
+    # dulwich only reads the lowercase variable
+    hostname = urlsplit(url).hostname
+    return bool(hostname) and bool(
+        proxy_bypass_environment(hostname, proxies={"no": getenv("NO_PROXY", "")})
+    )
+
+
+def get_urllib3_pool_manager(
+    url: str, headers: dict[str, str] | None = None, config: Config | None = None
+) -> urllib3.PoolManager:
+    """Build an urllib3 pool manager configured with the proxy to use for an URL. It's
+        meant to be passed explicitly to clients which would otherwise read proxies
+        from environment variables (i.e. dulwich), so that nothing process-wide is
+        modified and downloads can safely run concurrently.
+
+    The pool manager is built by dulwich, so that the git configuration (http.proxy,
+    http.sslVerify, http.sslCAInfo, http.useragent) is applied as usual. The proxy
+    set through QDT settings then replaces the one from the git configuration, unless
+    the URL is listed in no_proxy.
+
+    Args:
+        url (str): URL which will be requested through the pool manager
+        headers (dict[str, str] | None, optional): default headers. Defaults to None.
+        config (Config | None, optional): git configuration. If None, the user and
+            system ones are used. Defaults to None.
+
+    Returns:
+        urllib3.PoolManager: pool manager, a ProxyManager if a proxy is needed
+    """
+    if config is None:
+        config = StackedConfig.default()
+    git_pool_manager = default_urllib3_manager(config, base_url=url)
+    pool_options = dict(git_pool_manager.connection_pool_kw)
+    pool_options["headers"] = {**git_pool_manager.headers, **(headers or {})}
+
+    if is_proxy_bypassed(url):
+        logger.debug(f"Proxy bypassed for {url} (no_proxy).")
+        return urllib3.PoolManager(**pool_options)
+
+    proxy_url = get_proxy_settings(url=url).get(urlsplit(url).scheme.lower())
+    if not proxy_url:
+        if isinstance(git_pool_manager, urllib3.ProxyManager):
+            # proxy set in the git configuration
+            return urllib3.ProxyManager(
+                git_pool_manager.proxy.url,
+                proxy_headers=git_pool_manager.proxy_headers,
+                **pool_options,
+            )
+        return urllib3.PoolManager(**pool_options)
+
+    proxy_url_parts = urlsplit(proxy_url)
+    proxy_headers = {}
+    if proxy_url_parts.username is not None:
+        proxy_headers = urllib3.make_headers(
+            proxy_basic_auth=f"{unquote(proxy_url_parts.username)}:"
+            f"{unquote(proxy_url_parts.password or '')}"
+        )
+    logger.debug(f"Using proxy {proxy_url_parts.hostname} for {url}")
+
+    return urllib3.ProxyManager(proxy_url, proxy_headers=proxy_headers, **pool_options)
 
 
 # #############################################################################
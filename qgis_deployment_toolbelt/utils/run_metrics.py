@@ -0,0 +1,89 @@
+#! python3  # noqa: E265
+
+"""
+    Lightweight counters collected during a run and logged at its end.
+
+    Author: Julien Moura (https://github.com/guts)
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import logging
+from collections import Counter
+from threading import Lock
+
+# #############################################################################
+# ########## Globals ###############
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class RunMetrics:
+    """Thread-safe named counters, i.e. 'proxy.pac_evaluations'."""
+
+    def __init__(self) -> None:
+        """Object instanciation."""
+        self._lock = Lock()
+        self._counters: Counter = Counter()
+
+    def increment(self, name: str, value: int | float = 1) -> None:
+        """Increment a counter.
+
+        Args:
+            name (str): counter name
+            value (int | float, optional): value to add. Defaults to 1.
+        """
+        with self._lock:
+            self._counters[name] += value
+
+    def get(self, name: str) -> int | float:
+        """Get the value of a counter.
+
+        Args:
+            name (str): counter name
+
+        Returns:
+            int | float: counter value, 0 if never incremented
+        """
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def snapshot(self) -> dict[str, int | float]:
+        """Get a copy of every counter, sorted by name.
+
+        Returns:
+            dict[str, int | float]: counters
+        """
+        with self._lock:
+            return dict(sorted(self._counters.items()))
+
+    def reset(self) -> None:
+        """Reset every counter, i.e. at the start of a new run."""
+        with self._lock:
+            self._counters.clear()
+
+    def log_summary(self, level: int = logging.INFO) -> None:
+        """Log counters values.
+
+        Args:
+            level (int, optional): log level. Defaults to logging.INFO.
+        """
+        if counters := self.snapshot():
+            logger.log(
+                level,
+                "Run metrics: "
+                + ", ".join(f"{name}={value}" for name, value in counters.items()),
+            )
+
+
+# run-scoped metrics
+RUN_METRICS = RunMetrics()
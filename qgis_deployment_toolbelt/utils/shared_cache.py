@@ -0,0 +1,211 @@
+#! python3  # noqa: E265
+
+"""
+    Read-through cache of files shared between machines, typically stored on a network
+    share: files are fetched from the shared location when available and stored into it
+    after being downloaded otherwise.
+
+    Author: Julien Moura (https://github.com/guts)
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import logging
+import os
+from collections.abc import Callable
+from pathlib import Path
+from shutil import copy2
+from uuid import uuid4
+
+# package
+from qgis_deployment_toolbelt.utils.file_lock import FileLock
+
+# #############################################################################
+# ########## Globals ###############
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+# network filesystems (and FAT volumes behind them) store modification times with a
+# resolution down to 2 seconds
+MTIME_TOLERANCE_NS: int = 2_000_000_000
+
+# #############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def copy_file_atomically(source_path: Path, destination_path: Path) -> Path:
+    """Copy a file through a temporary file renamed once complete, so that the
+        destination is never seen partially written.
+
+    Args:
+        source_path (Path): file to copy
+        destination_path (Path): destination file path
+
+    Returns:
+        Path: destination file path
+    """
+    destination_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = destination_path.with_name(f".{destination_path.name}.{uuid4().hex}.tmp")
+    try:
+        copy2(source_path, tmp_path)
+        os.replace(tmp_path, destination_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+    return destination_path
+
+
+def copy_file_if_changed(source_path: Path, destination_path: Path) -> bool:
+    """Copy a file atomically unless the destination already has the same size and
+        modification time, so that an unchanged source costs a single stat request.
+
+    Args:
+        source_path (Path): file to copy
+        destination_path (Path): destination file path
+
+    Raises:
+        FileNotFoundError: if the source file doesn't exist
+
+    Returns:
+        bool: True if the file has been copied, False if it was unchanged
+    """
+    source_stat = source_path.stat()
+    try:
+        destination_stat = destination_path.stat()
+    except FileNotFoundError:
+        destination_stat = None
+
+    if (
+        destination_stat is not None
+        and destination_stat.st_size == source_stat.st_size
+        and abs(destination_stat.st_mtime_ns - source_stat.st_mtime_ns)
+        < MTIME_TOLERANCE_NS
+    ):
+        return False
+
+    copy_file_atomically(source_path=source_path, destination_path=destination_path)
+    return True
+
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class SharedFileCache:
+    """Read-through cache stored in a folder shared between machines.
+
+    Concurrent populations of the same entry, from threads or other machines, are
+    serialized with a lock file so that each file is downloaded only once per site.
+    """
+
+    def __init__(self, cache_folder: Path, lock_timeout: float = 300) -> None:
+        """Object instanciation.
+
+        Args:
+            cache_folder (Path): shared folder
+            lock_timeout (float, optional): maximum time to wait for another machine
+                populating the same entry, in seconds. Defaults to 300.
+        """
+        self.cache_folder = Path(cache_folder)
+        self.lock_timeout = lock_timeout
+
+    def get(self, file_name: str, local_file_path: Path) -> Path | None:
+        """Copy an entry from the shared cache to a local path, if it exists.
+
+        Args:
+            file_name (str): name of the entry in the shared cache
+            local_file_path (Path): where to copy the entry
+
+        Returns:
+            Path | None: local file path or None if the entry is not in the cache
+        """
+        cached_file_path = self.cache_folder / file_name
+        try:
+            if not cached_file_path.is_file():
+                return None
+            copy_file_atomically(cached_file_path, local_file_path)
+        except OSError as err:
+            logger.warning(
+                f"Reading {file_name} from shared cache {self.cache_folder} failed. "
+                f"Trace: {err}"
+            )
+            return None
+
+        logger.info(f"{file_name} retrieved from shared cache {self.cache_folder}.")
+        return local_file_path
+
+    def put(self, local_file_path: Path, file_name: str) -> Path | None:
+        """Store a local file into the shared cache.
+
+        Args:
+            local_file_path (Path): file to store
+            file_name (str): name of the entry in the shared cache
+
+        Returns:
+            Path | None: cached file path or None if it can't be stored
+        """
+        try:
+            return copy_file_atomically(local_file_path, self.cache_folder / file_name)
+        except OSError as err:
+            logger.warning(
+                f"Storing {file_name} into shared cache {self.cache_folder} failed. "
+                f"Trace: {err}"
+            )
+            return None
+
+    def fetch(
+        self,
+        file_name: str,
+        local_file_path: Path,
+        populate: Callable[[Path], Path],
+    ) -> Path:
+        """Get an entry from the shared cache or populate it on miss.
+
+        Args:
+            file_name (str): name of the entry in the shared cache
+            local_file_path (Path): where the file is expected locally
+            populate (Callable[[Path], Path]): function retrieving the file to the
+                local path given as argument (typically, downloading it)
+
+        Returns:
+            Path: local file path
+        """
+        if self.get(file_name=file_name, local_file_path=local_file_path):
+            return local_file_path
+
+        try:
+            self.cache_folder.mkdir(parents=True, exist_ok=True)
+            lock = FileLock(
+                lock_path=self.cache_folder / f"{file_name}.lock",
+                timeout=self.lock_timeout,
+            )
+            lock.acquire()
+        except OSError as err:
+            # covers lock timeout too: the shared cache must never block the run
+            logger.warning(
+                f"Shared cache {self.cache_folder} can't be used for {file_name}. "
+                f"Trace: {err}"
+            )
+            return populate(local_file_path)
+
+        try:
+            # another machine may have populated the entry while we were waiting
+            if self.get(file_name=file_name, local_file_path=local_file_path):
+                return local_file_path
+
+            populate(local_file_path)
+            if self.put(local_file_path=local_file_path, file_name=file_name):
+                logger.debug(
+                    f"{file_name} stored into shared cache {self.cache_folder}"
+                )
+        finally:
+            lock.release()
+
+        return local_file_path
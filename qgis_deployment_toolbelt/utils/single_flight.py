@@ -0,0 +1,121 @@
+#! python3  # noqa: E265
+
+"""
+    Single-flight registry: concurrent calls sharing the same key are collapsed into
+    only one execution whose result is shared by every caller.
+
+    Author: Julien Moura (https://github.com/guts)
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import logging
+from collections.abc import Callable, Hashable
+from threading import Event, Lock
+from typing import Any
+
+# #############################################################################
+# ########## Globals ###############
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class _Flight:
+    """A call in progress or done."""
+
+    __slots__ = ("done", "error", "result")
+
+    def __init__(self) -> None:
+        """Object instanciation."""
+        self.done = Event()
+        self.error: BaseException | None = None
+        self.result: Any = None
+
+
+class SingleFlight:
+    """Thread-safe registry deduplicating calls by key.
+
+    The first caller for a key runs the function, callers arriving meanwhile wait for
+    it and get the same result (or the same exception). Successful results are kept
+    until the registry is cleared, so that later callers reuse them too. Failed calls
+    are forgotten so that they can be tried again.
+    """
+
+    def __init__(self) -> None:
+        """Object instanciation."""
+        self._lock = Lock()
+        self._flights: dict[Hashable, _Flight] = {}
+
+    def do(
+        self, key: Hashable, func: Callable[..., Any], *args, **kwargs
+    ) -> tuple[Any, bool]:
+        """Run the function once per key.
+
+        Args:
+            key (Hashable): key identifying the call
+            func (Callable[..., Any]): function to run if no call is in flight for key
+            args: positional arguments passed to the function
+            kwargs: keyword arguments passed to the function
+
+        Returns:
+            tuple[Any, bool]: result of the function and a flag telling if the result
+                is shared, i.e. it comes from another call
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = _Flight()
+                self._flights[key] = flight
+
+        if not is_leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = func(*args, **kwargs)
+        except BaseException as err:
+            flight.error = err
+            self.forget(key)
+            raise
+        finally:
+            flight.done.set()
+
+        return flight.result, False
+
+    def forget(self, key: Hashable) -> None:
+        """Remove the stored result for key, if any.
+
+        Args:
+            key (Hashable): key identifying the call
+        """
+        with self._lock:
+            self._flights.pop(key, None)
+
+    def clear(self) -> None:
+        """Forget every stored result, i.e. at the start of a new run."""
+        with self._lock:
+            self._flights.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Tell if a call for key is in flight or done.
+
+        Args:
+            key (Hashable): key identifying the call
+
+        Returns:
+            bool: True if a call has been registered for key
+        """
+        with self._lock:
+            return key in self._flights
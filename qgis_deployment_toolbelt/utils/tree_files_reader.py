@@ -69,3 +69,42 @@ def tree_to_download_list(tree_array: list[Treeitem], rel_path: str = "") -> lis
             logger.debug(f"Unsupported item type: {item.get('type')}")
 
     return li_files
+
+
+def tree_to_files_sizes(
+    tree_array: list[Treeitem], rel_path: str = ""
+) -> dict[str, int | None]:
+    """Parse tree structure and return the size of the listed files, by relative path
+        to the base URL (as returned by tree_to_download_list). Sizes are listed only
+        if the tree has been generated with the '-s' option.
+
+    Args:
+        tree_array (list[TreeItem]): input array from tree JSON structure.
+        rel_path (str, optional): relative path to resolve from. Defaults to "".
+
+    Returns:
+        dict[str, int | None]: files sizes in bytes (None if not listed) by path
+    """
+    files_sizes = {}
+
+    if not isinstance(tree_array, (list, tuple)):
+        return files_sizes
+
+    for item in tree_array:
+        if item.get("type") == "directory":
+            if item.get("name") != ".":
+                new_rel_path = f"{rel_path}/{item.get('name')}"
+            else:
+                new_rel_path = f"{item.get('name')}"
+
+        if "contents" in item:
+            files_sizes.update(
+                tree_to_files_sizes(
+                    tree_array=item.get("contents"),
+                    rel_path=new_rel_path,
+                )
+            )
+        elif item.get("type") == "file":
+            files_sizes[f"{rel_path}/{item.get('name')}"] = item.get("size")
+
+    return files_sizes
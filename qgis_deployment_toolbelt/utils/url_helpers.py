@@ -12,7 +12,11 @@
 
 # Standard library
 import logging
-from urllib.parse import urlparse
+from functools import lru_cache
+from urllib.parse import urlparse, urlsplit, urlunsplit
+
+# 3rd party
+from requests.utils import requote_uri
 
 # #############################################################################
 # ########## Globals ###############
@@ -77,6 +81,43 @@ def check_str_is_url(
         return False
 
 
+@lru_cache(maxsize=2048)
+def normalize_url(input_url: str) -> str:
+    """Normalize an URL so that different spellings of the same resource give the
+        same string: scheme and host are lowercased, default ports and fragment are
+        removed and the path is consistently quoted.
+
+    Args:
+        input_url (str): URL to normalize
+
+    Returns:
+        str: normalized URL
+
+    Example:
+
+    .. code-block:: python
+
+        >>> normalize_url("HTTPS://Plugins.QGIS.org:443/plugins/qtribu/#top")
+        'https://plugins.qgis.org/plugins/qtribu/'
+    """
+    url_parts = urlsplit(requote_uri(input_url.strip()))
+    scheme = url_parts.scheme.lower()
+
+    netloc = (url_parts.hostname or "").lower()
+    if url_parts.username:
+        credentials = url_parts.username
+        if url_parts.password:
+            credentials += f":{url_parts.password}"
+        netloc = f"{credentials}@{netloc}"
+    if url_parts.port and (scheme, url_parts.port) not in (
+        ("http", 80),
+        ("https", 443),
+    ):
+        netloc = f"{netloc}:{url_parts.port}"
+
+    return urlunsplit((scheme, netloc, url_parts.path or "/", url_parts.query, ""))
+
+
 # ############################################################################
 # ##### Stand alone program ########
 # ##################################
@@ -0,0 +1,78 @@
+#! python3  # noqa: E265
+
+"""
+    Parse, compare and sort versions (profiles, plugins, QGIS), with parsed versions
+    memoized since the same strings are compared many times.
+
+    Author: Julien Moura (https://github.com/guts)
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import logging
+from collections.abc import Iterable
+from functools import lru_cache
+
+# 3rd party
+from packaging.version import InvalidVersion, Version
+
+# #############################################################################
+# ########## Globals ###############
+# ##################################
+
+# logs
+logger = logging.getLogger(__name__)
+
+# #############################################################################
+# ########## Functions #############
+# ##################################
+
+
+@lru_cache(maxsize=4096)
+def parse_version(version_str: str | None) -> Version | None:
+    """Parse a version string, following PEP 440 (Semver, even prefixed by 'v', and
+        Calver are supported).
+
+    Args:
+        version_str (str | None): version to parse
+
+    Returns:
+        Version | None: parsed version or None if the string is not a valid version
+    """
+    try:
+        return Version(version_str)
+    except (InvalidVersion, TypeError):
+        return None
+
+
+@lru_cache(maxsize=4096)
+def version_key(version_str: str | None) -> tuple[int, Version | str]:
+    """Sorting key for version strings. Versions are compared on their release
+        segments ("3.9" is older than "3.34") and invalid versions are sorted before
+        valid ones, between themselves in alphabetical order.
+
+    Args:
+        version_str (str | None): version to parse
+
+    Returns:
+        tuple[int, Version | str]: sorting key
+    """
+    if (parsed_version := parse_version(version_str)) is not None:
+        return 1, parsed_version
+    return 0, str(version_str)
+
+
+def sort_versions(versions: Iterable[str], reverse: bool = False) -> list[str]:
+    """Sort version strings on their parsed value.
+
+    Args:
+        versions (Iterable[str]): versions to sort
+        reverse (bool, optional): newest first. Defaults to False.
+
+    Returns:
+        list[str]: sorted versions
+    """
+    return sorted(versions, key=version_key, reverse=reverse)
@@ -0,0 +1,55 @@
+#! python3  # noqa: E265
+
+"""Compare profile.json discovery with a recursive glob and with the depth-limited
+os.scandir walk, on a synthetic QDT working folder with installed plugins.
+
+    python tests/dev/dev_profiles_discovery_benchmark.py
+"""
+
+# standard
+import tempfile
+import timeit
+from pathlib import Path
+
+# project
+from qgis_deployment_toolbelt.profiles.profiles_finder import find_profiles_json
+
+PROFILES_COUNT = 10
+PLUGINS_PER_PROFILE = 30
+FILES_PER_PLUGIN = 60
+
+with tempfile.TemporaryDirectory(prefix="qdt_dev_profiles_discovery_") as tmpdirname:
+    working_folder = Path(tmpdirname)
+    for profile_index in range(PROFILES_COUNT):
+        profile_folder = working_folder.joinpath(
+            "repositories", "scenario", "source", "profiles", f"profile_{profile_index}"
+        )
+        profile_folder.mkdir(parents=True)
+        profile_folder.joinpath("profile.json").write_text("{}")
+        for plugin_index in range(PLUGINS_PER_PROFILE):
+            plugin_folder = profile_folder.joinpath(
+                "python", "plugins", f"plugin_{plugin_index}"
+            )
+            plugin_folder.mkdir(parents=True)
+            for file_index in range(FILES_PER_PLUGIN):
+                plugin_folder.joinpath(f"module_{file_index}.py").touch()
+    for log_index in range(500):
+        working_folder.joinpath("logs").mkdir(exist_ok=True)
+        working_folder.joinpath("logs", f"{log_index}.log").touch()
+
+    assert len(list(working_folder.glob("**/profile.json"))) == len(
+        find_profiles_json(working_folder)
+    )
+
+    glob_time = timeit.timeit(
+        lambda: list(working_folder.glob("**/profile.json")), number=10
+    )
+    scandir_time = timeit.timeit(lambda: find_profiles_json(working_folder), number=10)
+
+    print(
+        f"{PROFILES_COUNT} profiles, "
+        f"{PROFILES_COUNT * PLUGINS_PER_PROFILE * FILES_PER_PLUGIN} plugins files"
+    )
+    print(f"glob('**/profile.json'): {glob_time / 10 * 1000:.1f} ms")
+    print(f"find_profiles_json: {scandir_time / 10 * 1000:.1f} ms")
+    print(f"speedup: x{glob_time / scandir_time:.1f}")
@@ -0,0 +1,203 @@
+#! python3  # noqa E265
+
+"""Usage from the repo root folder:
+
+    .. code-block:: python
+
+        # for whole test
+        python -m unittest tests.test_git_worktree
+        # for specific
+        python -m unittest tests.test_git_worktree.TestGitWorktree.test_pull_updates_changed_paths_only
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import tempfile
+import unittest
+from pathlib import Path
+
+# 3rd party
+from dulwich import porcelain
+from dulwich.repo import Repo
+
+# package
+from qgis_deployment_toolbelt.profiles.local_git_handler import LocalGitHandler
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class TestGitWorktree(unittest.TestCase):
+    """Test module."""
+
+    # -- Standard methods --------------------------------------------------------
+    def setUp(self):
+        """Fixtures prepared before each test."""
+        self.tmp_dir = tempfile.TemporaryDirectory(prefix="qdt_test_git_worktree_")
+        self.source_path = Path(self.tmp_dir.name, "source")
+        self.source_path.mkdir()
+        self.source_repo = Repo.init(f"{self.source_path}")
+
+    def tearDown(self):
+        """Executed after each test."""
+        self.source_repo.close()
+        self.tmp_dir.cleanup()
+
+    def commit_files(self, files: dict[str, str], removed: tuple[str] = ()) -> None:
+        """Write, stage and commit files in the source repository."""
+        for relative_path, content in files.items():
+            file_path = self.source_path.joinpath(relative_path)
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.write_text(content, encoding="UTF-8")
+        for relative_path in removed:
+            porcelain.remove(
+                self.source_repo, paths=[f"{self.source_path}/{relative_path}"]
+            )
+        porcelain.add(
+            self.source_repo,
+            paths=[f"{self.source_path.joinpath(path)}" for path in files],
+        )
+        porcelain.commit(
+            self.source_repo,
+            message=b"update profiles",
+            author=b"QDT <qdt@example.org>",
+            committer=b"QDT <qdt@example.org>",
+        )
+
+    # -- TESTS ---------------------------------------------------------
+    def test_pull_updates_changed_paths_only(self):
+        """Test pulling writes only changed paths and reports them."""
+        self.commit_files(
+            {
+                "profile_a/profile.json": "{}",
+                "profile_a/obsolete.txt": "old",
+                "profile_b/profile.json": "{}",
+            }
+        )
+        destination = Path(self.tmp_dir.name, "destination")
+        git_handler = LocalGitHandler(
+            source_repository_path_or_uri=self.source_path.resolve(),
+            branch_to_use=porcelain.active_branch(self.source_repo).decode(),
+        )
+
+        # fresh clone: changes are unknown
+        git_handler.download(destination_local_path=destination)
+        self.assertIsNone(git_handler.CHANGED_PATHS)
+        unchanged_file = destination.joinpath("profile_b/profile.json")
+        unchanged_mtime = unchanged_file.stat().st_mtime_ns
+
+        self.commit_files(
+            {"profile_a/profile.json": '{"version": "2"}'},
+            removed=("profile_a/obsolete.txt",),
+        )
+        git_handler.download(destination_local_path=destination)
+        self.assertEqual(
+            set(git_handler.CHANGED_PATHS),
+            {"profile_a/profile.json", "profile_a/obsolete.txt"},
+        )
+        self.assertEqual(unchanged_file.stat().st_mtime_ns, unchanged_mtime)
+        self.assertFalse(destination.joinpath("profile_a/obsolete.txt").exists())
+        self.assertIn(
+            "2",
+            destination.joinpath("profile_a/profile.json").read_text(encoding="UTF-8"),
+        )
+
+        # nothing new
+        git_handler.download(destination_local_path=destination)
+        self.assertEqual(git_handler.CHANGED_PATHS, ())
+
+    def test_sparse_checkout_selected_profiles(self):
+        """Test only profiles picked from their profile.json are checked out."""
+        self.commit_files(
+            {
+                "README.md": "profiles",
+                "profiles/wanted/profile.json": '{"name": "wanted"}',
+                "profiles/wanted/QGIS/QGIS3.ini": "[General]",
+                "profiles/unwanted/profile.json": '{"name": "unwanted"}',
+                "profiles/unwanted/QGIS/QGIS3.ini": "[General]",
+            }
+        )
+        destination = Path(self.tmp_dir.name, "destination")
+        git_handler = LocalGitHandler(
+            source_repository_path_or_uri=self.source_path.resolve(),
+            branch_to_use=porcelain.active_branch(self.source_repo).decode(),
+        )
+        read_profiles = {}
+
+        def select_wanted(profiles_json: dict[str, bytes]) -> set[str]:
+            read_profiles.update(profiles_json)
+            return {
+                folder
+                for folder, content in profiles_json.items()
+                if b"unwanted" not in content
+            }
+
+        git_handler.PROFILES_SELECTOR = select_wanted
+
+        git_handler.download(destination_local_path=destination)
+        self.assertEqual(set(read_profiles), {"profiles/wanted", "profiles/unwanted"})
+        self.assertTrue(
+            destination.joinpath("profiles/wanted/QGIS/QGIS3.ini").is_file()
+        )
+        self.assertFalse(destination.joinpath("profiles/unwanted").exists())
+        self.assertFalse(destination.joinpath("README.md").exists())
+
+        # the selection changes: the unwanted profile is now wanted, and conversely
+        git_handler.PROFILES_SELECTOR = lambda profiles_json: {"profiles/unwanted"}
+        git_handler.download(destination_local_path=destination)
+        self.assertFalse(destination.joinpath("profiles/wanted").exists())
+        self.assertTrue(
+            destination.joinpath("profiles/unwanted/profile.json").is_file()
+        )
+
+    def test_profiles_observer_before_checkout(self):
+        """Test profile.json files are handed to the observer before a whole checkout."""
+        self.commit_files(
+            {
+                "README.md": "profiles",
+                "profiles/wanted/profile.json": '{"name": "wanted"}',
+                "profiles/wanted/QGIS/QGIS3.ini": "[General]",
+            }
+        )
+        destination = Path(self.tmp_dir.name, "destination")
+        git_handler = LocalGitHandler(
+            source_repository_path_or_uri=self.source_path.resolve(),
+            branch_to_use=porcelain.active_branch(self.source_repo).decode(),
+        )
+        observed_profiles = []
+
+        def observe(profiles_json: dict[str, bytes]) -> None:
+            observed_profiles.append(
+                (
+                    profiles_json,
+                    destination.joinpath("profiles/wanted/profile.json").exists(),
+                )
+            )
+
+        git_handler.PROFILES_OBSERVER = observe
+
+        git_handler.download(destination_local_path=destination)
+        self.assertEqual(
+            observed_profiles, [({"profiles/wanted": b'{"name": "wanted"}'}, False)]
+        )
+        # the whole tree is checked out
+        self.assertTrue(destination.joinpath("README.md").is_file())
+        self.assertTrue(
+            destination.joinpath("profiles/wanted/QGIS/QGIS3.ini").is_file()
+        )
+
+        # nothing new: profiles are observed all the same
+        git_handler.download(destination_local_path=destination)
+        self.assertEqual(git_handler.CHANGED_PATHS, ())
+        self.assertEqual(len(observed_profiles), 2)
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
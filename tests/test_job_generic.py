@@ -145,3 +145,79 @@ class TestJobGeneric(unittest.TestCase):
 
         with self.assertRaises(JobOptionBadValueType):
             self.generic_job.validate_options(bad_options)
+
+    def test_changed_paths_manifest(self):
+        """Test tracking of paths changed in downloaded repositories."""
+        fixtures_profiles_folder = Path("tests/fixtures/profiles")
+        generic_job = GenericJob()
+        with tempfile.TemporaryDirectory(
+            prefix="QDT_test_changed_paths_",
+            ignore_cleanup_errors=True,
+        ) as tmpdirname:
+            downloaded_repositories = Path(tmpdirname, "repositories")
+            generic_job.qdt_downloaded_repositories = downloaded_repositories
+            for profile_name in ("profile_a", "profile_b"):
+                dest_file = downloaded_repositories.joinpath(
+                    "repo", profile_name, "profile.json"
+                )
+                dest_file.parent.mkdir(parents=True, exist_ok=True)
+                dest_file.write_text(
+                    fixtures_profiles_folder.joinpath(
+                        "good_profile_minimal.json"
+                    ).read_text(encoding="UTF-8"),
+                    encoding="UTF-8",
+                )
+            downloaded_profiles = generic_job.list_downloaded_profiles()
+
+            # unknown until a first synchronization
+            self.assertIsNone(generic_job.list_changed_paths())
+            generic_job.record_changed_paths(
+                destination=downloaded_repositories.joinpath("repo"),
+                changed_paths=("profile_a/profile.json",),
+            )
+            self.assertIsNone(
+                generic_job.list_changed_downloaded_profiles(downloaded_profiles)
+            )
+
+            # synchronized: nothing changed
+            generic_job.write_changed_paths(changed_paths=set())
+            self.assertEqual(
+                generic_job.list_changed_downloaded_profiles(downloaded_profiles), ()
+            )
+
+            # changes are accumulated until the next synchronization
+            generic_job.record_changed_paths(
+                destination=downloaded_repositories.joinpath("repo"),
+                changed_paths=("profile_a/profile.json",),
+            )
+            generic_job.record_changed_paths(
+                destination=downloaded_repositories.joinpath("repo"),
+                changed_paths=("README.md",),
+            )
+            self.assertEqual(
+                generic_job.list_changed_paths(),
+                {"repo/profile_a/profile.json", "repo/README.md"},
+            )
+            changed_profiles = generic_job.list_changed_downloaded_profiles(
+                downloaded_profiles
+            )
+            self.assertEqual(
+                [profile.folder.name for profile in changed_profiles], ["profile_a"]
+            )
+
+            # the manifest is not stored into the downloaded repositories
+            self.assertEqual(
+                generic_job.changed_paths_manifest_path.parent, Path(tmpdirname)
+            )
+            self.assertFalse(
+                any(
+                    path.name.startswith(".qdt")
+                    for path in downloaded_repositories.iterdir()
+                )
+            )
+
+            # a fresh clone makes changes unknown again
+            generic_job.record_changed_paths(
+                destination=downloaded_repositories.joinpath("repo"), changed_paths=None
+            )
+            self.assertIsNone(generic_job.list_changed_paths())
@@ -0,0 +1,142 @@
+#! python3  # noqa E265
+
+"""Usage from the repo root folder:
+
+    .. code-block:: python
+
+        # for whole test
+        python -m unittest tests.test_job_plugins_downloader
+        # for specific
+        python -m unittest tests.test_job_plugins_downloader.TestJobPluginsDownloader.test_copy_plugins
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import tempfile
+import unittest
+from os import environ
+from pathlib import Path
+from unittest.mock import patch
+
+# package
+from qgis_deployment_toolbelt.jobs.job_plugins_downloader import JobPluginsDownloader
+from qgis_deployment_toolbelt.plugins.plugin import QgisPlugin
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class TestJobPluginsDownloader(unittest.TestCase):
+    """Test module."""
+
+    # -- Standard methods --------------------------------------------------------
+    def setUp(self):
+        """Fixtures prepared before each test."""
+        self.tmp_dir = tempfile.TemporaryDirectory(prefix="qdt_test_plugins_dl_")
+        self.env_patcher = patch.dict(
+            environ,
+            {
+                "QDT_LOCAL_WORK_DIR": self.tmp_dir.name,
+                "QDT_TMP_RUNNING_SCENARIO_ID": "test_plugins_downloader",
+            },
+        )
+        self.env_patcher.start()
+        environ.pop("QDT_PLUGINS_SHARED_CACHE", None)
+
+    def tearDown(self):
+        """Executed after each test."""
+        self.env_patcher.stop()
+        self.tmp_dir.cleanup()
+
+    # -- TESTS ---------------------------------------------------------
+    def test_copy_plugins(self):
+        """Test local plugins are copied by the download workers, to their final
+        name."""
+        share_folder = Path(self.tmp_dir.name, "share")
+        share_folder.mkdir()
+        plugins: list[QgisPlugin] = []
+        for plugin_name in ("first plugin", "second plugin"):
+            plugin_path = share_folder.joinpath(f"{plugin_name}.zip")
+            plugin_path.write_bytes(plugin_name.encode())
+            plugins.append(
+                QgisPlugin.from_dict(
+                    {
+                        "name": plugin_name,
+                        "version": "1.0.0",
+                        "location": "local",
+                        "url": f"{plugin_path}",
+                    }
+                )
+            )
+        missing_plugin = QgisPlugin.from_dict(
+            {
+                "name": "missing plugin",
+                "version": "1.0.0",
+                "location": "local",
+                "url": f"{share_folder.joinpath('missing.zip')}",
+            }
+        )
+
+        job = JobPluginsDownloader(options={"threads": 2})
+        copied_plugins, failed_plugins = job.download_remote_plugins(
+            plugins_to_download=[*plugins, missing_plugin],
+            destination_parent_folder=job.qdt_plugins_folder,
+            threads=2,
+        )
+
+        self.assertEqual(
+            {plugin.name for plugin in copied_plugins},
+            {"first plugin", "second plugin"},
+        )
+        self.assertEqual(failed_plugins, [missing_plugin])
+        for plugin in plugins:
+            self.assertEqual(
+                job.qdt_plugins_folder.joinpath(
+                    f"{plugin.id_with_version}.zip"
+                ).read_bytes(),
+                plugin.name.encode(),
+            )
+        self.assertEqual(len(list(job.qdt_plugins_folder.iterdir())), 2)
+
+    def test_force_copies_local_plugins(self):
+        """Test local plugins are fetched with remote ones even when forced."""
+        local_plugin = QgisPlugin.from_dict(
+            {
+                "name": "local plugin",
+                "version": "1.0.0",
+                "location": "local",
+                "url": f"{Path(self.tmp_dir.name, 'local_plugin.zip')}",
+            }
+        )
+        remote_plugin = QgisPlugin.from_dict(
+            {
+                "name": "remote plugin",
+                "version": "1.0.0",
+                "url": "https://plugins.example.org/remote_plugin.zip",
+            }
+        )
+
+        job = JobPluginsDownloader(options={"force": True})
+        with patch.object(
+            JobPluginsDownloader,
+            "list_referenced_plugins",
+            return_value=[local_plugin, remote_plugin],
+        ), patch.object(JobPluginsDownloader, "copy_plugin") as mock_copy, patch.object(
+            JobPluginsDownloader, "download_plugin"
+        ) as mock_download:
+            job.run()
+
+        # local archive copied, only if changed, by the same pool as downloads
+        self.assertEqual(mock_copy.call_args.kwargs["plugin"], local_plugin)
+        self.assertEqual(mock_download.call_args.kwargs["plugin"], remote_plugin)
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,309 @@
+#! python3  # noqa E265
+
+"""Usage from the repo root folder:
+
+    .. code-block:: python
+
+        # for whole test
+        python -m unittest tests.test_job_profiles_downloader
+        # for specific
+        python -m unittest tests.test_job_profiles_downloader.TestJobProfilesDownloader.test_download_sources_concurrently
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import tempfile
+import threading
+import unittest
+from os import environ
+from pathlib import Path
+from shutil import copy2
+from unittest.mock import MagicMock, patch
+
+# package
+from qgis_deployment_toolbelt.jobs.job_profiles_downloader import JobProfilesDownloader
+from qgis_deployment_toolbelt.profiles.local_folder_handler import LocalFolderHandler
+from qgis_deployment_toolbelt.profiles.local_git_handler import LocalGitHandler
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class FakeDownloader:
+    """Downloader writing a profile.json into the destination, waiting for the
+    other downloads to start before returning to prove they run concurrently."""
+
+    def __init__(self, profile_name: str, barrier: threading.Barrier | None = None):
+        self.profile_name = profile_name
+        self.barrier = barrier
+
+    def download(self, destination_local_path: Path) -> None:
+        if self.barrier is not None:
+            self.barrier.wait(timeout=5)
+        if self.profile_name is None:
+            raise ConnectionError("source unreachable")
+        profile_folder = destination_local_path.joinpath(self.profile_name)
+        profile_folder.mkdir(parents=True, exist_ok=True)
+        copy2(
+            Path("tests/fixtures/profiles/good_profile_minimal.json"),
+            profile_folder.joinpath("profile.json"),
+        )
+
+
+class TestJobProfilesDownloader(unittest.TestCase):
+    """Test module."""
+
+    # -- Standard methods --------------------------------------------------------
+    def setUp(self):
+        """Fixtures prepared before each test."""
+        self.tmp_dir = tempfile.TemporaryDirectory(prefix="qdt_test_profiles_dl_")
+        self.env_patcher = patch.dict(
+            environ,
+            {
+                "QDT_LOCAL_WORK_DIR": self.tmp_dir.name,
+                "QDT_TMP_RUNNING_SCENARIO_ID": "test_profiles_downloader",
+            },
+        )
+        self.env_patcher.start()
+
+    def tearDown(self):
+        """Executed after each test."""
+        self.env_patcher.stop()
+        self.tmp_dir.cleanup()
+
+    # -- TESTS ---------------------------------------------------------
+    def test_list_sources_options(self):
+        """Test sources options are completed with job level options."""
+        job = JobProfilesDownloader(
+            options={
+                "branch": "main",
+                "protocol": "git_remote",
+                "source": "https://gitlab.com/Oslandia/qgis/profils_qgis_fr.git",
+                "sources": [
+                    "https://github.com/geotribu/profils-qgis.git",
+                    {
+                        "source": "file:///srv/git/profiles.git",
+                        "protocol": "git_local",
+                        "branch": "dev",
+                    },
+                ],
+            }
+        )
+
+        sources_options = job.list_sources_options()
+        self.assertEqual(len(sources_options), 3)
+        self.assertEqual(
+            sources_options[0].get("source"),
+            "https://gitlab.com/Oslandia/qgis/profils_qgis_fr.git",
+        )
+        self.assertEqual(sources_options[1].get("branch"), "main")
+        self.assertEqual(sources_options[2].get("protocol"), "git_local")
+        self.assertEqual(sources_options[2].get("branch"), "dev")
+
+        # each source has its own destination
+        destinations = {
+            job.get_source_destination(source_options.get("source"))
+            for source_options in sources_options
+        }
+        self.assertEqual(len(destinations), 3)
+        for destination in destinations:
+            self.assertEqual(destination.parent, job.qdt_downloaded_repositories)
+
+        # invalid protocol in a source
+        job.options["sources"] = [{"source": "https://a.b/c", "protocol": "ftp"}]
+        with self.assertRaises(ValueError):
+            job.list_sources_options()
+
+    def test_get_downloader_folder(self):
+        """Test folder protocol is handled by the local folder handler."""
+        job = JobProfilesDownloader(
+            options={
+                "protocol": "folder",
+                "source": f"{Path(self.tmp_dir.name).as_uri()}",
+                "compare_checksums": True,
+            }
+        )
+        downloader = job.get_downloader(source_options=job.options)
+        self.assertIsInstance(downloader, LocalFolderHandler)
+        self.assertTrue(downloader.compare_checksums)
+        self.assertEqual(
+            downloader.SOURCE_REPOSITORY_PATH_OR_URL, Path(self.tmp_dir.name)
+        )
+
+    def test_select_profiles_folders(self):
+        """Test profiles to check out are picked on their deployment rules."""
+        job = JobProfilesDownloader(
+            options={
+                "protocol": "git_remote",
+                "source": "https://git.example.org/corporate/profiles.git",
+                "sparse_checkout": True,
+            }
+        )
+        fixtures_folder = Path("tests/fixtures/profiles")
+        selected_folders = job.select_profiles_folders(
+            profiles_json={
+                "profiles/minimal": fixtures_folder.joinpath(
+                    "good_profile_minimal.json"
+                ).read_bytes(),
+                "profiles/never": fixtures_folder.joinpath(
+                    "good_profile_rules_never_deployed.json"
+                ).read_bytes(),
+                "profiles/broken": b"{not json",
+            }
+        )
+        self.assertEqual(selected_folders, {"profiles/minimal", "profiles/broken"})
+
+        # plugins of selected profiles are prefetched right away
+        job.plugins_prefetcher = MagicMock()
+        job.select_profiles_folders(
+            profiles_json={
+                "profiles/minimal": fixtures_folder.joinpath(
+                    "good_profile_minimal.json"
+                ).read_bytes()
+            }
+        )
+        enqueued_profiles = job.plugins_prefetcher.enqueue_profiles.call_args.args[0]
+        self.assertEqual(len(enqueued_profiles), 1)
+
+    def test_prefetch_profiles_plugins_from_git_objects(self):
+        """Test git handlers without sparse checkout hand profile.json to prefetch."""
+        job = JobProfilesDownloader(
+            options={
+                "protocol": "git_local",
+                "source": "file://tests/fixtures/",
+            }
+        )
+        job.plugins_prefetcher = MagicMock()
+        with patch.object(JobProfilesDownloader, "_get_downloader") as get_downloader:
+            get_downloader.return_value = MagicMock(
+                spec=LocalGitHandler, PROFILES_SELECTOR=None, PROFILES_OBSERVER=None
+            )
+            downloader = job.get_downloader(source_options=job.options)
+        self.assertIsNone(downloader.PROFILES_SELECTOR)
+        self.assertEqual(downloader.PROFILES_OBSERVER, job.prefetch_profiles_plugins)
+
+        fixtures_folder = Path("tests/fixtures/profiles")
+        downloader.PROFILES_OBSERVER(
+            {
+                "profiles/minimal": fixtures_folder.joinpath(
+                    "good_profile_minimal.json"
+                ).read_bytes(),
+                "profiles/never": fixtures_folder.joinpath(
+                    "good_profile_rules_never_deployed.json"
+                ).read_bytes(),
+                "profiles/broken": b"{not json",
+            }
+        )
+        enqueued_profiles = job.plugins_prefetcher.enqueue_profiles.call_args.args[0]
+        self.assertEqual(len(enqueued_profiles), 1)
+
+        # already enqueued: not again once downloaded
+        job.prefetch_downloaded_plugins(
+            downloader=downloader, destination=job.qdt_downloaded_repositories
+        )
+        self.assertEqual(job.plugins_prefetcher.enqueue_profiles.call_count, 1)
+
+    def test_download_sources_concurrently(self):
+        """Test sources are downloaded concurrently and failures are aggregated."""
+        job = JobProfilesDownloader(
+            options={
+                "protocol": "git_remote",
+                "sources": [
+                    "https://git.example.org/corporate/profiles.git",
+                    "https://git.example.org/department/profiles.git",
+                    "https://git.example.org/broken/profiles.git",
+                ],
+            }
+        )
+        barrier = threading.Barrier(3)
+        downloaders = {
+            "https://git.example.org/corporate/profiles.git": FakeDownloader(
+                "corporate", barrier
+            ),
+            "https://git.example.org/department/profiles.git": FakeDownloader(
+                "department", barrier
+            ),
+            "https://git.example.org/broken/profiles.git": FakeDownloader(
+                None, barrier
+            ),
+        }
+
+        with patch.object(
+            JobProfilesDownloader,
+            "get_downloader",
+            side_effect=lambda source_options: downloaders.get(
+                source_options.get("source")
+            ),
+        ):
+            job.plugins_prefetcher = MagicMock()
+            failed_sources = job.download_sources(
+                sources_options=job.list_sources_options()
+            )
+            # plugins of each downloaded source are prefetched
+            self.assertEqual(job.plugins_prefetcher.enqueue_profiles.call_count, 2)
+            job.run()
+
+        self.assertEqual(len(failed_sources), 1)
+        self.assertEqual(
+            failed_sources[0].get("source"),
+            "https://git.example.org/broken/profiles.git",
+        )
+        self.assertEqual(len(job.PROFILES_NAMES_DOWNLOADED), 2)
+
+    def test_download_sources_unreachable_handler(self):
+        """Test a source whose handler can't be built does not abort the others."""
+        job = JobProfilesDownloader(
+            options={
+                "protocol": "git_remote",
+                "sources": [
+                    "https://git.example.org/corporate/profiles.git",
+                    "https://git.example.org/broken/profiles.git",
+                ],
+            }
+        )
+
+        def get_downloader(source_options: dict) -> FakeDownloader:
+            if "broken" in source_options.get("source"):
+                # like RemoteGitHandler, which lists the remote refs on init
+                raise ConnectionError("source unreachable")
+            return FakeDownloader("corporate")
+
+        with patch.object(
+            JobProfilesDownloader, "get_downloader", side_effect=get_downloader
+        ):
+            job.plugins_prefetcher = MagicMock()
+            failed_sources = job.download_sources(
+                sources_options=job.list_sources_options()
+            )
+
+        self.assertEqual(
+            [source.get("source") for source in failed_sources],
+            ["https://git.example.org/broken/profiles.git"],
+        )
+        self.assertEqual(job.plugins_prefetcher.enqueue_profiles.call_count, 1)
+
+    def test_download_sources_all_failed(self):
+        """Test an error is raised when no source could be downloaded."""
+        job = JobProfilesDownloader(
+            options={
+                "protocol": "git_remote",
+                "sources": ["https://git.example.org/broken/profiles.git"],
+            }
+        )
+        with patch.object(
+            JobProfilesDownloader,
+            "get_downloader",
+            return_value=FakeDownloader(None),
+        ), self.assertRaises(RuntimeError):
+            job.run()
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -58,6 +58,13 @@ class TestJobQgisInstallationFinder(unittest.TestCase):
             ),
             "4.0.1",
         )
+        # release segments are compared as numbers
+        self.assertEqual(
+            JobQgisInstallationFinder._get_latest_version_from_list(
+                ["3.9.2", "3.34.1", "3.28.10"]
+            ),
+            "3.34.1",
+        )
 
     def test_get_latest_matching_version_path(self):
         """Test definition of latest version from a list of version"""
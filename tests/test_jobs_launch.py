@@ -17,9 +17,12 @@
 # Standard library
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
 # package
 from qgis_deployment_toolbelt.jobs import JobsOrchestrator
+from qgis_deployment_toolbelt.jobs.run_context import RunContext
+from qgis_deployment_toolbelt.profiles.rules_context import QdtRulesContext
 from qgis_deployment_toolbelt.scenarios.scenario_reader import ScenarioReader
 
 # #############################################################################
@@ -57,3 +60,31 @@ class TestJobsLaunch(unittest.TestCase):
                 job_id=step.get("uses"), options=step.get("with")
             )
             self.assertIsNotNone(job)
+
+    def test_jobs_share_run_context(self):
+        """Test jobs built with the same run context share its environment."""
+        orchestrator = JobsOrchestrator()
+        run_context = RunContext()
+
+        job_splash = orchestrator.init_job_class_from_id(
+            job_id="splash-screen-manager",
+            options={"action": "create_or_restore"},
+            run_context=run_context,
+        )
+        job_shortcuts = orchestrator.init_job_class_from_id(
+            job_id="shortcuts-manager",
+            options={"include": []},
+            run_context=run_context,
+        )
+        self.assertIs(job_splash.run_context, run_context)
+        self.assertIs(job_splash.os_config, job_shortcuts.os_config)
+        self.assertIs(job_splash.qdt_rules_context, job_shortcuts.qdt_rules_context)
+        self.assertTrue(run_context.qdt_working_folder.is_dir())
+
+        # rules context is built once for the whole run
+        with patch.object(
+            QdtRulesContext, "to_dict", return_value={"date": {}}
+        ) as mock_to_dict:
+            self.assertEqual(job_splash.run_context.rules_context_dict, {"date": {}})
+            self.assertEqual(job_shortcuts.run_context.rules_context_dict, {"date": {}})
+        mock_to_dict.assert_called_once()
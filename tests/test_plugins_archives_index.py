@@ -0,0 +1,127 @@
+#! python3  # noqa E265
+
+"""Usage from the repo root folder:
+
+    .. code-block:: python
+
+        # for whole test
+        python -m unittest tests.test_plugins_archives_index
+        # for specific
+        python -m unittest tests.test_plugins_archives_index.TestPluginsArchivesIndex.test_update_incremental
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import os
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+# package
+from qgis_deployment_toolbelt.plugins.archives_index import PluginsArchivesIndex
+from qgis_deployment_toolbelt.plugins.plugin import QgisPlugin
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class TestPluginsArchivesIndex(unittest.TestCase):
+    """Test module."""
+
+    def test_update_incremental(self):
+        """Test only new or changed archives are read."""
+        with tempfile.TemporaryDirectory(
+            prefix="qdt_test_archives_index_", ignore_cleanup_errors=True
+        ) as tmpdirname:
+            plugins_folder = Path(tmpdirname)
+            for folder_name, version in (("first", "1.0.0"), ("second", "2.0.0")):
+                with zipfile.ZipFile(
+                    plugins_folder.joinpath(
+                        f"{folder_name}_{version.replace('.', '-')}.zip"
+                    ),
+                    mode="w",
+                ) as zf:
+                    zf.writestr(f"{folder_name}/__init__.py", "")
+                    zf.writestr(
+                        f"{folder_name}/metadata.txt",
+                        "[general]\n"
+                        f"name=Plugin {folder_name}\n"
+                        f"version={version}\n"
+                        "qgisMinimumVersion=3.28\n"
+                        "plugin_dependencies=QuickOSM\n"
+                        "description=100% test\n",
+                    )
+            plugins_folder.joinpath("broken.zip").write_text("<html>proxy</html>")
+
+            archives_index = PluginsArchivesIndex(plugins_folder=plugins_folder)
+            self.assertTrue(archives_index.update())
+            self.assertTrue(archives_index.index_path.is_file())
+            self.assertEqual(
+                archives_index.archives["first_1-0-0.zip"]["metadata"],
+                {
+                    "name": "Plugin first",
+                    "version": "1.0.0",
+                    "folder_name": "first",
+                    "qgis_minimum_version": "3.28",
+                    "plugin_dependencies": "QuickOSM",
+                },
+            )
+            self.assertIsNone(archives_index.archives["broken.zip"]["metadata"])
+            self.assertIn("error", archives_index.archives["broken.zip"])
+
+            # a new index object reads nothing if archives did not change
+            with patch.object(QgisPlugin, "read_zip_metadata") as mock_read:
+                reloaded_index = PluginsArchivesIndex(plugins_folder=plugins_folder)
+                self.assertFalse(reloaded_index.update())
+                mock_read.assert_not_called()
+
+            # changed and removed archives
+            second_zip = plugins_folder.joinpath("second_2-0-0.zip")
+            with zipfile.ZipFile(second_zip, mode="w") as zf:
+                zf.writestr("second/metadata.txt", "[general]\nversion=2.0.1\n")
+            os.utime(second_zip, ns=(0, 10**18))
+            plugins_folder.joinpath("broken.zip").unlink()
+            self.assertTrue(reloaded_index.update())
+            self.assertNotIn("broken.zip", reloaded_index.archives)
+            self.assertEqual(
+                reloaded_index.archives["second_2-0-0.zip"]["metadata"]["version"],
+                "2.0.1",
+            )
+
+    def test_get_plugin(self):
+        """Test plugin object built from the indexed metadata."""
+        with tempfile.TemporaryDirectory(
+            prefix="qdt_test_archives_index_", ignore_cleanup_errors=True
+        ) as tmpdirname:
+            archive_path = Path(tmpdirname, "third_3-0-0.zip")
+            with zipfile.ZipFile(archive_path, mode="w") as zf:
+                zf.writestr("third/__init__.py", "")
+                zf.writestr(
+                    "third/metadata.txt",
+                    "[general]\nname=Plugin third\nversion=3.0.0\n"
+                    "qgisMinimumVersion=3.28\n",
+                )
+            archives_index = PluginsArchivesIndex(plugins_folder=Path(tmpdirname))
+
+            plugin = archives_index.get_plugin(archive_path=archive_path)
+            self.assertIsInstance(plugin, QgisPlugin)
+            self.assertEqual(plugin.folder_name, "third")
+            self.assertEqual(plugin.qgis_minimum_version, "3.28")
+            self.assertEqual(plugin, QgisPlugin.from_zip(archive_path))
+
+            self.assertIsNone(
+                archives_index.get_plugin(Path(tmpdirname, "missing.zip"))
+            )
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
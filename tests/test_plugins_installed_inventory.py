@@ -0,0 +1,111 @@
+#! python3  # noqa E265
+
+"""Usage from the repo root folder:
+
+    .. code-block:: python
+
+        # for whole test
+        python -m unittest tests.test_plugins_installed_inventory
+        # for specific
+        python -m unittest tests.test_plugins_installed_inventory.TestInstalledPluginsInventory.test_refresh_changed_only
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# package
+from qgis_deployment_toolbelt.plugins.installed_inventory import (
+    InstalledPluginsInventory,
+)
+from qgis_deployment_toolbelt.plugins.plugin import QgisPlugin
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class TestInstalledPluginsInventory(unittest.TestCase):
+    """Test module."""
+
+    def test_refresh_changed_only(self):
+        """Test only plugins whose metadata.txt changed are read again."""
+        with tempfile.TemporaryDirectory(
+            prefix="qdt_test_inventory_", ignore_cleanup_errors=True
+        ) as tmpdirname:
+            plugins_folder = Path(tmpdirname, "profiles/test/python/plugins")
+            cache_folder = Path(tmpdirname, "plugins_installed_inventory")
+            for folder_name, version in (("first", "1.0.0"), ("second", "2.0.0")):
+                metadata_path = plugins_folder.joinpath(folder_name, "metadata.txt")
+                metadata_path.parent.mkdir(parents=True)
+                metadata_path.write_text(
+                    f"[general]\nname=Plugin {folder_name}\nversion={version}\n"
+                    "qgisMinimumVersion=3.28\n",
+                    encoding="UTF-8",
+                )
+                os.utime(metadata_path, ns=(10**18, 10**18))
+            # a folder without metadata.txt is not a plugin
+            plugins_folder.joinpath("__pycache__").mkdir()
+
+            inventory = InstalledPluginsInventory(
+                plugins_folder=plugins_folder,
+                cache_folder=cache_folder,
+                max_workers=2,
+            )
+            self.assertTrue(inventory.refresh())
+            self.assertTrue(inventory.inventory_path.is_file())
+            self.assertTrue(inventory.inventory_path.name.startswith("test_"))
+            self.assertEqual(set(inventory.plugins), {"first", "second"})
+
+            plugin = inventory.get(folder_name="first")
+            self.assertIsInstance(plugin, QgisPlugin)
+            self.assertEqual(plugin.version, "1.0.0")
+            self.assertEqual(plugin.qgis_minimum_version, "3.28")
+            self.assertIsNone(inventory.get(folder_name="__pycache__"))
+
+            # unchanged plugins are not read again, even by a new inventory object
+            with patch.object(QgisPlugin, "parse_metadata_txt") as mock_parse:
+                reloaded_inventory = InstalledPluginsInventory(
+                    plugins_folder=plugins_folder, cache_folder=cache_folder
+                )
+                self.assertFalse(reloaded_inventory.refresh())
+                mock_parse.assert_not_called()
+
+            # upgraded and removed plugins
+            metadata_path = plugins_folder.joinpath("first/metadata.txt")
+            metadata_path.write_text(
+                "[general]\nname=Plugin first\nversion=1.1.0\n", encoding="UTF-8"
+            )
+            os.utime(metadata_path, ns=(2 * 10**18, 2 * 10**18))
+            plugins_folder.joinpath("second/metadata.txt").unlink()
+            self.assertTrue(reloaded_inventory.refresh())
+            self.assertEqual(
+                reloaded_inventory.get(folder_name="first").version, "1.1.0"
+            )
+            self.assertIsNone(reloaded_inventory.get(folder_name="second"))
+
+    def test_missing_plugins_folder(self):
+        """Test a profile without plugins folder has an empty inventory."""
+        with tempfile.TemporaryDirectory(
+            prefix="qdt_test_inventory_", ignore_cleanup_errors=True
+        ) as tmpdirname:
+            inventory = InstalledPluginsInventory(
+                plugins_folder=Path(tmpdirname, "profiles/test/python/plugins"),
+                cache_folder=Path(tmpdirname, "plugins_installed_inventory"),
+            )
+            self.assertFalse(inventory.refresh())
+            self.assertEqual(inventory.plugins, {})
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,206 @@
+#! python3  # noqa E265
+
+"""Usage from the repo root folder:
+
+    .. code-block:: python
+
+        # for whole test
+        python -m unittest tests.test_plugins_installer
+        # for specific
+        python -m unittest tests.test_plugins_installer.TestPluginsInstaller.test_install_replaces_previous_version
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+# package
+from qgis_deployment_toolbelt.plugins import installer
+from qgis_deployment_toolbelt.plugins.installer import (
+    check_plugins_archives,
+    install_plugin_archive,
+    quarantine_archive,
+    remove_leftovers,
+)
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class TestPluginsInstaller(unittest.TestCase):
+    """Test module."""
+
+    def test_install_replaces_previous_version(self):
+        """Test files of the previous version are not left behind."""
+        with tempfile.TemporaryDirectory(
+            prefix="qdt_test_installer_", ignore_cleanup_errors=True
+        ) as tmpdirname:
+            plugins_folder = Path(tmpdirname, "profiles/test/python/plugins")
+            old_archive = Path(tmpdirname, "sample_1.0.0.zip")
+            with zipfile.ZipFile(old_archive, mode="w") as zf:
+                zf.writestr("sample/", "")
+                zf.writestr("sample/metadata.txt", "[general]\nversion=1.0.0\n")
+                zf.writestr("sample/old_module.py", "")
+                zf.writestr("sample/core/engine.py", "v1")
+            self.assertEqual(
+                install_plugin_archive(
+                    archive_path=old_archive, plugins_folder=plugins_folder
+                ),
+                [plugins_folder.joinpath("sample")],
+            )
+            self.assertTrue(plugins_folder.joinpath("sample/old_module.py").is_file())
+
+            new_archive = Path(tmpdirname, "sample_2.0.0.zip")
+            with zipfile.ZipFile(new_archive, mode="w") as zf:
+                zf.writestr("sample/metadata.txt", "[general]\nversion=2.0.0\n")
+                zf.writestr("sample/core/engine.py", "v2")
+            install_plugin_archive(
+                archive_path=new_archive, plugins_folder=plugins_folder
+            )
+            self.assertFalse(plugins_folder.joinpath("sample/old_module.py").exists())
+            self.assertEqual(
+                plugins_folder.joinpath("sample/core/engine.py").read_text(), "v2"
+            )
+            # no staging nor backup folder left
+            self.assertEqual(
+                [path.name for path in plugins_folder.iterdir()], ["sample"]
+            )
+
+    def test_install_parallel_extraction(self):
+        """Test large archives are extracted in threads."""
+        with tempfile.TemporaryDirectory(
+            prefix="qdt_test_installer_", ignore_cleanup_errors=True
+        ) as tmpdirname:
+            plugins_folder = Path(tmpdirname, "profiles/test/python/plugins")
+            archive_path = Path(tmpdirname, "sample_1.0.0.zip")
+            with zipfile.ZipFile(archive_path, mode="w") as zf:
+                zf.writestr("sample/metadata.txt", "[general]\nversion=1.0.0\n")
+                for idx in range(50):
+                    zf.writestr(f"sample/resources/file_{idx}.txt", f"{idx}" * 100)
+
+            with patch.object(installer, "PARALLEL_EXTRACTION_MIN_SIZE", 1):
+                install_plugin_archive(
+                    archive_path=archive_path,
+                    plugins_folder=plugins_folder,
+                    max_workers=4,
+                )
+            self.assertEqual(
+                len(list(plugins_folder.joinpath("sample/resources").iterdir())), 50
+            )
+            self.assertEqual(
+                plugins_folder.joinpath("sample/resources/file_7.txt").read_text(),
+                "7" * 100,
+            )
+
+    def test_install_invalid_archives_keep_installed_version(self):
+        """Test a corrupted or unsafe archive does not touch the installed plugin."""
+        with tempfile.TemporaryDirectory(
+            prefix="qdt_test_installer_", ignore_cleanup_errors=True
+        ) as tmpdirname:
+            plugins_folder = Path(tmpdirname, "profiles/test/python/plugins")
+            valid_zip = Path(tmpdirname, "sample_1.0.0.zip")
+            with zipfile.ZipFile(valid_zip, mode="w") as zf:
+                zf.writestr("sample/metadata.txt", "[general]\nversion=1.0.0\n")
+            install_plugin_archive(
+                archive_path=valid_zip, plugins_folder=plugins_folder
+            )
+
+            fake_zip = Path(tmpdirname, "fake.zip")
+            fake_zip.write_text("<html>proxy error</html>")
+            with self.assertRaises(zipfile.BadZipFile):
+                install_plugin_archive(
+                    archive_path=fake_zip, plugins_folder=plugins_folder
+                )
+
+            unsafe_zip = Path(tmpdirname, "unsafe.zip")
+            with zipfile.ZipFile(unsafe_zip, mode="w") as zf:
+                zf.writestr("sample/metadata.txt", "[general]\nversion=6.6.6\n")
+                zf.writestr("../../escaped.py", "")
+            with self.assertRaises(ValueError):
+                install_plugin_archive(
+                    archive_path=unsafe_zip, plugins_folder=plugins_folder
+                )
+
+            self.assertIn(
+                "version=1.0.0",
+                plugins_folder.joinpath("sample/metadata.txt").read_text(),
+            )
+            self.assertEqual(
+                [path.name for path in plugins_folder.iterdir()], ["sample"]
+            )
+
+    def test_check_plugins_archives(self):
+        """Test corrupted archives are detected and quarantined."""
+        with tempfile.TemporaryDirectory(
+            prefix="qdt_test_installer_", ignore_cleanup_errors=True
+        ) as tmpdirname:
+            valid_zip = Path(tmpdirname, "sample_1.0.0.zip")
+            with zipfile.ZipFile(valid_zip, mode="w") as zf:
+                zf.writestr("sample/metadata.txt", "[general]\nversion=1.0.0\n")
+                zf.writestr("sample/a.py", "a" * 100)
+
+            # same archive with a member content altered: CRC mismatch
+            crc_zip = Path(tmpdirname, "crc.zip")
+            with zipfile.ZipFile(
+                crc_zip, mode="w", compression=zipfile.ZIP_STORED
+            ) as zf:
+                zf.writestr("sample/a.py", "a" * 100)
+            crc_zip.write_bytes(crc_zip.read_bytes().replace(b"a" * 100, b"b" * 100))
+
+            fake_zip = Path(tmpdirname, "fake.zip")
+            fake_zip.write_text("<html>proxy error</html>")
+            missing_zip = Path(tmpdirname, "missing.zip")
+
+            invalid_archives = check_plugins_archives(
+                archives_paths=[valid_zip, crc_zip, fake_zip, missing_zip, crc_zip],
+                max_workers=2,
+            )
+            self.assertEqual(set(invalid_archives), {crc_zip, fake_zip, missing_zip})
+            self.assertIn("sample/a.py", invalid_archives[crc_zip])
+            self.assertEqual(check_plugins_archives(archives_paths=[]), {})
+
+            quarantine_folder = Path(tmpdirname, "plugins_quarantine")
+            quarantined_path = quarantine_archive(
+                archive_path=crc_zip, quarantine_folder=quarantine_folder
+            )
+            self.assertFalse(crc_zip.exists())
+            self.assertEqual(quarantined_path.parent, quarantine_folder)
+            self.assertTrue(quarantined_path.name.startswith("crc_"))
+            self.assertIsNone(
+                quarantine_archive(
+                    archive_path=missing_zip, quarantine_folder=quarantine_folder
+                )
+            )
+
+    def test_remove_leftovers(self):
+        """Test folders left by an interrupted installation are removed."""
+        with tempfile.TemporaryDirectory(
+            prefix="qdt_test_installer_", ignore_cleanup_errors=True
+        ) as tmpdirname:
+            plugins_folder = Path(tmpdirname, "profiles/test/python/plugins")
+            plugins_folder.joinpath(".qdt-staging-123/sample").mkdir(parents=True)
+            plugins_folder.joinpath(".qdt-previous-sample-123").mkdir()
+            plugins_folder.joinpath("installed").mkdir()
+
+            self.assertEqual(remove_leftovers(plugins_folder=plugins_folder), 2)
+            self.assertEqual(
+                [path.name for path in plugins_folder.iterdir()], ["installed"]
+            )
+            self.assertEqual(
+                remove_leftovers(plugins_folder=Path(tmpdirname, "missing")), 0
+            )
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+#! python3  # noqa E265
+
+"""Usage from the repo root folder:
+
+    .. code-block:: python
+
+        # for whole test
+        python -m unittest tests.test_plugins_prefetcher
+        # for specific
+        python -m unittest tests.test_plugins_prefetcher.TestPluginsPrefetcher.test_prefetch_profiles_plugins
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+# package
+from qgis_deployment_toolbelt.plugins.plugin import QgisPlugin
+from qgis_deployment_toolbelt.plugins.prefetcher import PluginsPrefetcher
+from qgis_deployment_toolbelt.profiles.qdt_profile import QdtProfile
+
+# #############################################################################
+# ########## Globals ###############
+# ##################################
+
+
+def build_profile(name: str, plugins: list[str]) -> QdtProfile:
+    """Build a profile referencing plugins with a known download URL."""
+    return QdtProfile.from_dict(
+        {
+            "name": name,
+            "plugins": [
+                {
+                    "name": plugin_name,
+                    "version": "1.0.0",
+                    "url": f"https://plugins.example.org/{plugin_name}.1.0.0.zip",
+                    "official_repository": False,
+                }
+                for plugin_name in plugins
+            ],
+        }
+    )
+
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class TestPluginsPrefetcher(unittest.TestCase):
+    """Test module."""
+
+    # -- TESTS ---------------------------------------------------------
+    def test_prefetch_profiles_plugins(self):
+        """Test plugins are downloaded once, in background, as profiles come."""
+        downloaded_urls: list[str] = []
+        release_downloads = threading.Event()
+
+        def fake_download(plugin: QgisPlugin, plugin_download_path: Path) -> Path:
+            release_downloads.wait(timeout=5)
+            if "broken" in plugin.name:
+                raise ConnectionError("plugin not found")
+            downloaded_urls.append(plugin.download_url)
+            plugin_download_path.write_bytes(b"zip")
+            return plugin_download_path
+
+        with tempfile.TemporaryDirectory(
+            prefix="qdt_test_plugins_prefetcher_", ignore_cleanup_errors=True
+        ) as tmpdirname:
+            plugins_folder = Path(tmpdirname, "plugins")
+            plugins_folder.mkdir()
+            already_there = QgisPlugin.from_dict(
+                {"name": "already_there", "version": "1.0.0"}
+            )
+            plugins_folder.joinpath(f"{already_there.id_with_version}.zip").touch()
+
+            prefetcher = PluginsPrefetcher(
+                download_plugin=fake_download,
+                plugins_folder=plugins_folder,
+                repositories_index_folder=Path(tmpdirname, "index"),
+                threads=2,
+            )
+            # enqueuing doesn't wait for downloads
+            prefetcher.enqueue_profiles(
+                [build_profile("first", ["shared", "only_first", "already_there"])]
+            )
+            prefetcher.enqueue_profiles(
+                [build_profile("second", ["shared", "broken"]), build_profile("3", [])]
+            )
+            self.assertEqual(downloaded_urls, [])
+            release_downloads.set()
+
+            downloaded_plugins, failed_plugins = prefetcher.wait()
+
+        self.assertEqual(
+            sorted(plugin.name for plugin in downloaded_plugins),
+            ["only_first", "shared"],
+        )
+        self.assertEqual([plugin.name for plugin in failed_plugins], ["broken"])
+        self.assertEqual(len(downloaded_urls), 2)
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+#! python3  # noqa E265
+
+"""
+    Usage from the repo root folder:
+
+    .. code-block:: bash
+        # for whole tests
+        python -m unittest tests.test_plugins_repository_index
+        # for specific test
+        python -m unittest tests.test_plugins_repository_index.TestPluginsRepositoryIndex.test_resolve_latest
+"""
+
+# standard library
+import tempfile
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from os import environ
+from pathlib import Path
+from threading import Thread
+from unittest.mock import patch
+
+# project
+from qgis_deployment_toolbelt.plugins.plugin import QgisPlugin
+from qgis_deployment_toolbelt.plugins.repository_index import (
+    QgisPluginsRepositoryIndex,
+    iter_plugins_xml_entries,
+    resolve_plugins_from_repositories,
+)
+from qgis_deployment_toolbelt.utils.proxies import clear_proxy_caches
+
+# ############################################################################
+# ########## Globals #############
+# ################################
+
+fixture_plugins_xml = (
+    Path(__file__).parent / "fixtures/plugins_repository/plugins.xml"
+).resolve()
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class RepositoryHandler(BaseHTTPRequestHandler):
+    """Serve the fixture plugins.xml with an ETag, counting full responses."""
+
+    etag: str = '"qdt-fixture-v1"'
+    full_responses: int = 0
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        type(self).full_responses += 1
+        body = fixture_plugins_xml.read_bytes()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/xml")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", self.etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestPluginsRepositoryIndex(unittest.TestCase):
+    """Test plugins repository index."""
+
+    def setUp(self):
+        """Executed before each test."""
+        self.env_patcher = patch.dict(environ)
+        self.env_patcher.start()
+        for proxy_var in (
+            "HTTP_PROXY",
+            "HTTPS_PROXY",
+            "QDT_PAC_FILE",
+            "QDT_PROXY_HTTP",
+        ):
+            environ.pop(proxy_var, None)
+        clear_proxy_caches()
+
+        self.tmp_dir = tempfile.TemporaryDirectory(
+            prefix="qdt_test_repository_index_", ignore_cleanup_errors=True
+        )
+        self.cache_folder = Path(self.tmp_dir.name)
+
+    def tearDown(self):
+        """Executed after each test."""
+        self.tmp_dir.cleanup()
+        self.env_patcher.stop()
+        clear_proxy_caches()
+
+    def test_iter_entries(self):
+        """Test incremental parsing of plugins.xml."""
+        entries = list(iter_plugins_xml_entries(xml_source=fixture_plugins_xml))
+        self.assertEqual(len(entries), 4)
+        self.assertEqual(entries[0]["name"], "QTribu")
+        self.assertEqual(entries[0]["version"], "0.14.2")
+        self.assertEqual(entries[0]["plugin_id"], "2733")
+        self.assertEqual(entries[0]["folder_name"], "qtribu")
+        self.assertFalse(entries[0]["experimental"])
+        self.assertTrue(entries[1]["experimental"])
+        self.assertEqual(entries[3]["folder_name"], "french_locator_filter")
+
+    def test_resolve_latest(self):
+        """Latest stable version is resolved, experimental is ignored."""
+        index = QgisPluginsRepositoryIndex(
+            repository_url_xml=QgisPlugin.OFFICIAL_REPOSITORY_XML,
+            cache_folder=self.cache_folder,
+        )
+        index.build_from_xml(xml_stream=fixture_plugins_xml)
+
+        plugin = QgisPlugin.from_dict({"name": "qtribu", "version": "latest"})
+        resolved = index.resolve(plugin)
+        self.assertEqual(resolved.version, "0.14.2")
+        self.assertEqual(
+            resolved.url,
+            "https://plugins.qgis.org/plugins/qtribu/version/0.14.2/download/",
+        )
+        self.assertEqual(resolved.plugin_id, 2733)
+        self.assertEqual(resolved.folder_name, "qtribu")
+
+        # pinned version
+        pinned = index.resolve(QgisPlugin(name="QTribu", version="0.13.0"))
+        self.assertEqual(pinned.version, "0.13.0")
+        self.assertIsNone(index.resolve(QgisPlugin(name="QTribu", version="0.0.1")))
+
+        # unknown plugin
+        self.assertIsNone(index.resolve(QgisPlugin(name="not_in_repository")))
+
+    def test_index_persisted_and_fetched_conditionally(self):
+        """Index is saved on disk and the repository is fetched only if changed."""
+        RepositoryHandler.full_responses = 0
+        server = ThreadingHTTPServer(("127.0.0.1", 0), RepositoryHandler)
+        Thread(target=server.serve_forever, daemon=True).start()
+        repository_url_xml = f"http://127.0.0.1:{server.server_port}/plugins.xml"
+
+        try:
+            index = QgisPluginsRepositoryIndex(
+                repository_url_xml=repository_url_xml, cache_folder=self.cache_folder
+            )
+            self.assertTrue(index.is_empty)
+            self.assertTrue(index.update())
+            self.assertTrue(index.index_path.is_file())
+            self.assertEqual(len(index.entries), 4)
+
+            # new instance reads the index from disk and gets a 304
+            index_again = QgisPluginsRepositoryIndex(
+                repository_url_xml=repository_url_xml, cache_folder=self.cache_folder
+            )
+            self.assertEqual(len(index_again.entries), 4)
+            self.assertTrue(index_again.update())
+            self.assertEqual(RepositoryHandler.full_responses, 1)
+
+            # resolve several plugins in one pass
+            plugins = resolve_plugins_from_repositories(
+                plugins=[
+                    QgisPlugin(name="QTribu", repository_url_xml=repository_url_xml),
+                    QgisPlugin(
+                        name="French Locator Filter",
+                        repository_url_xml=repository_url_xml,
+                    ),
+                    QgisPlugin(
+                        name="local_plugin", location="local", url="/tmp/plugin.zip"
+                    ),
+                ],
+                cache_folder=self.cache_folder,
+            )
+            self.assertEqual(RepositoryHandler.full_responses, 1)
+            self.assertEqual(plugins[0].version, "0.14.2")
+            self.assertEqual(plugins[1].version, "1.1.1")
+            self.assertEqual(plugins[2].version, "latest")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
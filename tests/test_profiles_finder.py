@@ -0,0 +1,82 @@
+#! python3  # noqa E265
+
+"""Usage from the repo root folder:
+
+    .. code-block:: python
+
+        # for whole test
+        python -m unittest tests.test_profiles_finder
+        # for specific
+        python -m unittest tests.test_profiles_finder.TestProfilesFinder.test_find_profiles_json
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import tempfile
+import unittest
+from pathlib import Path
+
+# package
+from qgis_deployment_toolbelt.profiles.profiles_finder import find_profiles_json
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class TestProfilesFinder(unittest.TestCase):
+    """Test module."""
+
+    # -- TESTS ---------------------------------------------------------
+    def test_find_profiles_json(self):
+        """Test profile.json files are found in the known layout only."""
+        with tempfile.TemporaryDirectory(
+            prefix="qdt_test_profiles_finder_", ignore_cleanup_errors=True
+        ) as tmpdirname:
+            root_folder = Path(tmpdirname)
+            expected = {
+                "repositories/scenario/profile.json",
+                "repositories/scenario/source/examples/profiles/qdt/profile.json",
+                "installed/profile.json",
+            }
+            not_expected = {
+                "plugins/extracted/profile.json",
+                "logs/profile.json",
+                "repositories/scenario/.git/profile.json",
+                "installed/python/plugins/a_plugin/profile.json",
+                "repositories/scenario/source/examples/profiles/qdt/too/deep/profile.json",
+            }
+            for relative_path in expected | not_expected:
+                file_path = root_folder.joinpath(relative_path)
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+                file_path.write_text("{}", encoding="UTF-8")
+
+            self.assertEqual(
+                {
+                    profile_json.relative_to(root_folder).as_posix()
+                    for profile_json in find_profiles_json(root_folder)
+                },
+                expected,
+            )
+
+            # custom depth and exclusions
+            self.assertEqual(
+                set(find_profiles_json(root_folder, max_depth=1, excluded_folders=())),
+                {
+                    root_folder.joinpath("installed/profile.json"),
+                    root_folder.joinpath("logs/profile.json"),
+                },
+            )
+            self.assertEqual(
+                find_profiles_json(root_folder.joinpath("not_a_folder")), []
+            )
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,188 @@
+#! python3  # noqa E265
+
+"""Usage from the repo root folder:
+
+    .. code-block:: python
+
+        # for whole test
+        python -m unittest tests.test_profiles_local_folder_handler
+        # for specific
+        python -m unittest tests.test_profiles_local_folder_handler.TestLocalFolderHandler.test_sync_changed_files_only
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+# package
+from qgis_deployment_toolbelt.profiles.local_folder_handler import (
+    LocalFolderHandler,
+    file_uri_to_path,
+    scan_folder_files,
+)
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class TestLocalFolderHandler(unittest.TestCase):
+    """Test module."""
+
+    # -- Standard methods --------------------------------------------------------
+    def setUp(self):
+        """Fixtures prepared before each test."""
+        self.tmp_dir = tempfile.TemporaryDirectory(prefix="qdt_test_folder_handler_")
+        self.source_path = Path(self.tmp_dir.name, "share")
+        self.destination = Path(self.tmp_dir.name, "downloaded")
+        self.write_files(
+            {
+                "profile_a/profile.json": '{"name": "profile_a"}',
+                "profile_a/QGIS/QGIS3.ini": "[General]",
+                "profile_a/obsolete.txt": "old",
+                "profile_b/profile.json": '{"name": "profile_b"}',
+            }
+        )
+
+    def tearDown(self):
+        """Executed after each test."""
+        self.tmp_dir.cleanup()
+
+    def write_files(self, files: dict[str, str], mtime_shift: int = 0) -> None:
+        """Write files in the source folder, optionally moving their modification
+        time forward (in seconds)."""
+        for relative_path, content in files.items():
+            file_path = self.source_path.joinpath(relative_path)
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.write_text(content, encoding="UTF-8")
+            if mtime_shift:
+                file_stat = file_path.stat()
+                os.utime(
+                    file_path,
+                    (
+                        file_stat.st_atime + mtime_shift,
+                        file_stat.st_mtime + mtime_shift,
+                    ),
+                )
+
+    # -- TESTS ---------------------------------------------------------
+    def test_file_uri_to_path(self):
+        """Test file URIs conversion, including network shares."""
+        self.assertEqual(
+            file_uri_to_path("file:///mnt/profiles"), Path("/mnt/profiles")
+        )
+        self.assertEqual(
+            file_uri_to_path("file://localhost/mnt/profiles"), Path("/mnt/profiles")
+        )
+        self.assertEqual(
+            file_uri_to_path("file://server/share/profiles"),
+            Path("//server/share/profiles"),
+        )
+
+    def test_scan_folder_files(self):
+        """Test folder tree listing."""
+        scanned_files = scan_folder_files(root_path=self.source_path, max_workers=2)
+        self.assertEqual(
+            set(scanned_files),
+            {
+                "profile_a/profile.json",
+                "profile_a/QGIS/QGIS3.ini",
+                "profile_a/obsolete.txt",
+                "profile_b/profile.json",
+            },
+        )
+        self.assertEqual(scanned_files["profile_a/obsolete.txt"].size, 3)
+
+    def test_sync_changed_files_only(self):
+        """Test only changed files are copied and removed ones are deleted."""
+        folder_handler = LocalFolderHandler(self.source_path.as_uri())
+        self.assertEqual(folder_handler.SOURCE_REPOSITORY_PATH_OR_URL, self.source_path)
+
+        # first synchronization: changes are unknown
+        folder_handler.download(destination_local_path=self.destination)
+        self.assertIsNone(folder_handler.CHANGED_PATHS)
+        self.assertTrue(self.destination.joinpath("profile_a/QGIS/QGIS3.ini").is_file())
+
+        unchanged_file = self.destination.joinpath("profile_b/profile.json")
+        unchanged_mtime = unchanged_file.stat().st_mtime_ns
+        # bookkeeping files stored in the destination are left alone
+        manifest = self.destination.joinpath(".qdt_bookkeeping.json")
+        manifest.write_text('{"paths": []}', encoding="UTF-8")
+        self.destination.joinpath(".git").mkdir()
+        self.destination.joinpath(".git/HEAD").write_text("ref: refs/heads/main")
+
+        self.write_files(
+            {"profile_a/QGIS/QGIS3.ini": "[General]\nshowTips=false"}, mtime_shift=10
+        )
+        self.source_path.joinpath("profile_a/obsolete.txt").unlink()
+        folder_handler.download(destination_local_path=self.destination)
+
+        self.assertEqual(
+            folder_handler.CHANGED_PATHS,
+            ("profile_a/QGIS/QGIS3.ini", "profile_a/obsolete.txt"),
+        )
+        self.assertFalse(self.destination.joinpath("profile_a/obsolete.txt").exists())
+        self.assertIn(
+            "showTips",
+            self.destination.joinpath("profile_a/QGIS/QGIS3.ini").read_text("UTF-8"),
+        )
+        self.assertEqual(unchanged_file.stat().st_mtime_ns, unchanged_mtime)
+        self.assertTrue(manifest.is_file())
+        self.assertTrue(self.destination.joinpath(".git/HEAD").is_file())
+
+        # nothing new
+        folder_handler.download(destination_local_path=self.destination)
+        self.assertEqual(folder_handler.CHANGED_PATHS, ())
+
+    def test_sync_compare_checksums(self):
+        """Test files only touched are not copied when checksums are compared."""
+        folder_handler = LocalFolderHandler(
+            self.source_path, compare_checksums=True, max_workers=2
+        )
+        folder_handler.download(destination_local_path=self.destination)
+
+        # same content, newer modification time
+        self.write_files({"profile_b/profile.json": '{"name": "profile_b"}'}, 10)
+        folder_handler.download(destination_local_path=self.destination)
+        self.assertEqual(folder_handler.CHANGED_PATHS, ())
+        self.assertEqual(
+            self.destination.joinpath("profile_b/profile.json").stat().st_mtime_ns,
+            self.source_path.joinpath("profile_b/profile.json").stat().st_mtime_ns,
+        )
+
+        # same size, other content
+        self.write_files({"profile_b/profile.json": '{"name": "profile_c"}'}, 20)
+        folder_handler.download(destination_local_path=self.destination)
+        self.assertEqual(folder_handler.CHANGED_PATHS, ("profile_b/profile.json",))
+
+    def test_sync_selected_profiles(self):
+        """Test only profiles picked from their profile.json are synchronized."""
+        folder_handler = LocalFolderHandler(self.source_path)
+        folder_handler.PROFILES_SELECTOR = lambda profiles_json: {
+            folder
+            for folder, content in profiles_json.items()
+            if b"profile_b" in content
+        }
+        folder_handler.download(destination_local_path=self.destination)
+
+        self.assertTrue(self.destination.joinpath("profile_b/profile.json").is_file())
+        self.assertFalse(self.destination.joinpath("profile_a").exists())
+
+    def test_missing_source(self):
+        """Test a missing source folder raises an error."""
+        folder_handler = LocalFolderHandler(Path(self.tmp_dir.name, "not_mounted"))
+        with self.assertRaises(FileNotFoundError):
+            folder_handler.download(destination_local_path=self.destination)
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,233 @@
+#! python3  # noqa E265
+
+"""
+    Usage from the repo root folder:
+
+    .. code-block:: bash
+        # for whole tests
+        python -m unittest tests.test_profiles_remote_http_handler
+        # for specific test
+        python -m unittest tests.test_profiles_remote_http_handler.TestRemoteHttpHandler.test_download_from_tar_bundle
+"""
+
+# standard library
+import json
+import tarfile
+import tempfile
+import unittest
+import zipfile
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from os import environ
+from pathlib import Path
+from threading import Thread
+from unittest.mock import patch
+
+# project
+from qgis_deployment_toolbelt.profiles.remote_http_handler import HttpHandler
+from qgis_deployment_toolbelt.utils.file_downloader import DOWNLOADS_REGISTRY
+from qgis_deployment_toolbelt.utils.proxies import clear_proxy_caches
+
+# ############################################################################
+# ########## Globals #############
+# ################################
+
+PROFILE_FILES: dict[str, str] = {
+    "qdt_test/profile.json": json.dumps({"name": "qdt_test", "version": "1.0.0"}),
+    "qdt_test/QGIS/QGIS3.ini": "[General]\n",
+    "qdt_test/images/splash.png": "not really a png",
+}
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class CountingHandler(SimpleHTTPRequestHandler):
+    """Static files handler keeping track of requested paths."""
+
+    requested_paths: list[str] = []
+
+    def do_GET(self):
+        type(self).requested_paths.append(self.path)
+        super().do_GET()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestRemoteHttpHandler(unittest.TestCase):
+    """Test HTTP profiles repository handler."""
+
+    def setUp(self):
+        """Executed before each test: publish a profiles repository locally."""
+        self.env_patcher = patch.dict(environ)
+        self.env_patcher.start()
+        for proxy_var in (
+            "HTTP_PROXY",
+            "HTTPS_PROXY",
+            "QDT_PAC_FILE",
+            "QDT_PROXY_HTTP",
+        ):
+            environ.pop(proxy_var, None)
+        clear_proxy_caches()
+        DOWNLOADS_REGISTRY.clear()
+
+        self.tmp_dir = tempfile.TemporaryDirectory(
+            prefix="qdt_test_http_handler_", ignore_cleanup_errors=True
+        )
+        self.published = Path(self.tmp_dir.name, "published")
+        self.destination = Path(self.tmp_dir.name, "downloaded")
+
+        tree = [{"type": "directory", "name": ".", "contents": []}]
+        for rel_path, content in PROFILE_FILES.items():
+            Path(self.published, rel_path).parent.mkdir(parents=True, exist_ok=True)
+            Path(self.published, rel_path).write_text(content)
+            folder = tree[0]
+            for part in Path(rel_path).parent.parts:
+                sub = next((c for c in folder["contents"] if c["name"] == part), None)
+                if sub is None:
+                    sub = {"type": "directory", "name": part, "contents": []}
+                    folder["contents"].append(sub)
+                folder = sub
+            folder["contents"].append(
+                {"type": "file", "name": Path(rel_path).name, "size": len(content)}
+            )
+        Path(self.published, "qdt-files.json").write_text(json.dumps(tree))
+
+        CountingHandler.requested_paths = []
+        self.server = ThreadingHTTPServer(
+            ("127.0.0.1", 0), partial(CountingHandler, directory=self.published)
+        )
+        Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}/"
+
+    def tearDown(self):
+        """Executed after each test."""
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp_dir.cleanup()
+        self.env_patcher.stop()
+        clear_proxy_caches()
+        DOWNLOADS_REGISTRY.clear()
+
+    def assert_profile_downloaded(self):
+        """Check every published file is in the destination."""
+        for rel_path, content in PROFILE_FILES.items():
+            self.assertEqual(Path(self.destination, rel_path).read_text(), content)
+
+    def test_download_from_tar_bundle(self):
+        """Only the index and the tar.gz bundle are requested."""
+        with tarfile.open(Path(self.published, "qdt-bundle.tar.gz"), "w:gz") as tar:
+            tar.add(Path(self.published, "qdt_test"), arcname="qdt_test")
+
+        HttpHandler(self.base_url).download(destination_local_path=self.destination)
+
+        self.assert_profile_downloaded()
+        self.assertEqual(
+            CountingHandler.requested_paths, ["/qdt-files.json", "/qdt-bundle.tar.gz"]
+        )
+
+    def test_download_from_incomplete_zip_bundle(self):
+        """Files missing from the zip bundle are downloaded one by one."""
+        with zipfile.ZipFile(Path(self.published, "qdt-bundle.zip"), "w") as zf:
+            zf.write(
+                Path(self.published, "qdt_test/profile.json"),
+                arcname="qdt_test/profile.json",
+            )
+            zf.writestr("../outside.txt", "must not be extracted outside")
+
+        HttpHandler(self.base_url).download(destination_local_path=self.destination)
+
+        self.assert_profile_downloaded()
+        self.assertFalse(Path(self.tmp_dir.name, "outside.txt").exists())
+        self.assertIn("/qdt-bundle.zip", CountingHandler.requested_paths)
+        self.assertNotIn("/qdt_test/profile.json", CountingHandler.requested_paths)
+        self.assertIn("/qdt_test/QGIS/QGIS3.ini", CountingHandler.requested_paths)
+
+    def test_download_bundle_checked_against_index(self):
+        """Bundle members not listed in qdt-files.json are not extracted and those
+        with a wrong size are downloaded one by one."""
+        with tarfile.open(Path(self.published, "qdt-bundle.tar.gz"), "w:gz") as tar:
+            tar.add(
+                Path(self.published, "qdt_test/profile.json"), "qdt_test/profile.json"
+            )
+            tar.add(Path(self.published, "qdt_test/images"), "qdt_test/images")
+            # stale copy in the bundle
+            stale_ini = Path(self.tmp_dir.name, "QGIS3.ini")
+            stale_ini.write_text("[General]\nstale=true\n")
+            tar.add(stale_ini, "qdt_test/QGIS/QGIS3.ini")
+            # not listed in qdt-files.json
+            tar.add(stale_ini, "qdt_test/unlisted.ini")
+
+        HttpHandler(self.base_url).download(destination_local_path=self.destination)
+
+        self.assert_profile_downloaded()
+        self.assertFalse(Path(self.destination, "qdt_test/unlisted.ini").exists())
+        self.assertIn("/qdt_test/QGIS/QGIS3.ini", CountingHandler.requested_paths)
+        self.assertNotIn("/qdt_test/profile.json", CountingHandler.requested_paths)
+
+    def test_download_without_bundle(self):
+        """Without bundle, files are downloaded one by one."""
+        HttpHandler(self.base_url).download(destination_local_path=self.destination)
+
+        self.assert_profile_downloaded()
+        self.assertEqual(len(CountingHandler.requested_paths), 3 + len(PROFILE_FILES))
+
+    def test_download_selected_profiles_only(self):
+        """Only files of profiles picked from their profile.json are downloaded."""
+        Path(self.published, "excluded/QGIS").mkdir(parents=True)
+        Path(self.published, "excluded/profile.json").write_text(
+            json.dumps({"name": "excluded", "rules": []})
+        )
+        Path(self.published, "excluded/QGIS/QGIS3.ini").write_text("[General]\n")
+        tree = json.loads(Path(self.published, "qdt-files.json").read_text())
+        tree[0]["contents"].append(
+            {
+                "type": "directory",
+                "name": "excluded",
+                "contents": [
+                    {"type": "file", "name": "profile.json"},
+                    {
+                        "type": "directory",
+                        "name": "QGIS",
+                        "contents": [{"type": "file", "name": "QGIS3.ini"}],
+                    },
+                ],
+            }
+        )
+        Path(self.published, "qdt-files.json").write_text(json.dumps(tree))
+
+        read_profiles = {}
+
+        def select_qdt_test(profiles_json: dict[str, bytes]) -> set[str]:
+            read_profiles.update(profiles_json)
+            return {"qdt_test"}
+
+        http_handler = HttpHandler(self.base_url)
+        http_handler.PROFILES_SELECTOR = select_qdt_test
+        http_handler.download(destination_local_path=self.destination)
+
+        self.assertEqual(set(read_profiles), {"qdt_test", "excluded"})
+        self.assert_profile_downloaded()
+        self.assertFalse(Path(self.destination, "excluded/profile.json").exists())
+        self.assertNotIn("/excluded/QGIS/QGIS3.ini", CountingHandler.requested_paths)
+
+        # with a bundle, only the files of the selected profiles are extracted
+        with tarfile.open(Path(self.published, "qdt-bundle.tar.gz"), "w:gz") as tar:
+            tar.add(Path(self.published, "qdt_test"), arcname="qdt_test")
+            tar.add(Path(self.published, "excluded"), arcname="excluded")
+        CountingHandler.requested_paths = []
+        http_handler.download(destination_local_path=self.destination)
+
+        self.assert_profile_downloaded()
+        self.assertFalse(Path(self.destination, "excluded/QGIS/QGIS3.ini").exists())
+        self.assertIn("/qdt-bundle.tar.gz", CountingHandler.requested_paths)
+        self.assertNotIn("/qdt_test/QGIS/QGIS3.ini", CountingHandler.requested_paths)
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -12,10 +12,15 @@
 
 # standard
 import unittest
+from os import environ
 from pathlib import Path
+from unittest.mock import patch
 
 # project
-from qgis_deployment_toolbelt.profiles.qdt_profile import QdtProfile
+from qgis_deployment_toolbelt.profiles.qdt_profile import (
+    QdtProfile,
+    get_profiles_environment,
+)
 
 # ############################################################################
 # ########## Classes #############
@@ -99,6 +104,34 @@ class TestQdtProfile(unittest.TestCase):
         self.assertTrue(profile_v2.is_older_than(profile_v3))
         self.assertFalse(profile_v2.is_older_than(profile_v1))
 
+    def test_profile_shared_environment(self):
+        """Test profiles share one environment snapshot and are slotted."""
+        profile_a = QdtProfile(name="unit_test_a", folder=Path("tests/fixtures"))
+        profile_b = QdtProfile(name="unit_test_b")
+
+        self.assertFalse(hasattr(profile_a, "__dict__"))
+        with self.assertRaises(AttributeError):
+            profile_a.not_an_attribute = True
+
+        # attributes can't be changed once initialized: cached paths don't go stale
+        with self.assertRaises(AttributeError):
+            profile_a._folder = Path("tests")
+        self.assertEqual(profile_a.folder, Path("tests/fixtures").resolve())
+
+        self.assertIs(profile_a.os_config, profile_b.os_config)
+        self.assertIs(profile_a.os_config, get_profiles_environment().os_config)
+        self.assertIs(profile_a.folder, profile_a.folder)
+        self.assertEqual(profile_a.folder, Path("tests/fixtures").resolve())
+        self.assertIs(profile_a.path_in_qgis, profile_a.path_in_qgis)
+
+        # a new environment is built when an environment variable it depends on changes
+        with patch.dict(environ, {"QGIS_CUSTOM_CONFIG_PATH": "/tmp/qdt_tests/QGIS3"}):
+            profile_c = QdtProfile(name="unit_test_c")
+            self.assertEqual(
+                profile_c.path_in_qgis, Path("/tmp/qdt_tests/QGIS3/unit_test_c")
+            )
+        self.assertIsNot(profile_c.os_config, profile_b.os_config)
+
 
 # ############################################################################
 # ####### Stand-alone run ########
@@ -0,0 +1,179 @@
+#! python3  # noqa E265
+
+"""Usage from the repo root folder:
+
+    .. code-block:: python
+
+        # for whole test
+        python -m unittest tests.test_utils_cache_manager
+        # for specific
+        python -m unittest tests.test_utils_cache_manager.TestCacheManager.test_prune_lru
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+# package
+from qgis_deployment_toolbelt.utils.cache_manager import (
+    CacheUsageJournal,
+    QdtCacheManager,
+    find_borrowed_git_mirrors,
+    parse_size,
+)
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class TestCacheManager(unittest.TestCase):
+    """Test module."""
+
+    def test_parse_size(self):
+        """Test budget parsing."""
+        self.assertEqual(parse_size("1024"), 1024)
+        self.assertEqual(parse_size(2048), 2048)
+        self.assertEqual(parse_size("1K"), 1024)
+        self.assertEqual(parse_size("500M"), 500 * 1024**2)
+        self.assertEqual(parse_size("1.5 GB"), int(1.5 * 1024**3))
+        self.assertEqual(parse_size("2Go"), 2 * 1024**3)
+        self.assertEqual(parse_size("1kib"), 1024)
+
+        for bad_size in ("", "big", "-1G", "1P"):
+            with self.subTest(size=bad_size), self.assertRaises(ValueError):
+                parse_size(bad_size)
+
+    def test_prune_lru(self):
+        """Test least recently used entries are evicted first."""
+        with tempfile.TemporaryDirectory(
+            prefix="qdt_test_cache_manager_", ignore_cleanup_errors=True
+        ) as tmpdirname:
+            working_directory = Path(os.path.realpath(tmpdirname), "qdt")
+            # relative path: (size, modification time)
+            for relative_path, (size, mtime) in {
+                "plugins/oldest_1-0.zip": (400, 1000),
+                "plugins/recent_1-0.zip": (400, 3000),
+                "plugins/used_1-0.zip": (400, 500),
+                # not a plugin archive: not part of the cache
+                "plugins/plugins_archives_index.json": (4000, 1),
+                "repositories/scenario/profile.json": (400, 2000),
+            }.items():
+                entry_path = working_directory.joinpath(relative_path)
+                entry_path.parent.mkdir(parents=True, exist_ok=True)
+                entry_path.write_bytes(b"0" * size)
+                os.utime(entry_path, (mtime, mtime))
+            oldest = working_directory.joinpath("plugins/oldest_1-0.zip")
+            recent = working_directory.joinpath("plugins/recent_1-0.zip")
+            used = working_directory.joinpath("plugins/used_1-0.zip")
+            repository = working_directory.joinpath("repositories/scenario")
+            os.utime(repository, (2000, 2000))
+
+            cache_manager = QdtCacheManager(working_directory=working_directory)
+            # last reference recorded by a previous deployment prevails over mtime
+            cache_manager.save_usage(references={os.fspath(used): 4000})
+
+            evicted, cache_size = cache_manager.prune(max_size=1000, dry_run=True)
+            self.assertEqual([entry.path for entry in evicted], [oldest, repository])
+            self.assertEqual(cache_size, 800)
+            self.assertTrue(oldest.exists())
+
+            evicted, cache_size = QdtCacheManager(
+                working_directory=working_directory
+            ).prune(max_size=1000)
+            self.assertEqual(len(evicted), 2)
+            self.assertFalse(oldest.exists())
+            self.assertFalse(repository.exists())
+            self.assertTrue(recent.exists())
+            self.assertTrue(used.exists())
+
+            # nothing to do under the budget
+            self.assertEqual(
+                QdtCacheManager(working_directory=working_directory).prune(
+                    max_size=1000
+                ),
+                ([], 800),
+            )
+
+    def test_prune_protected_and_borrowed_mirror(self):
+        """Test entries referenced by the run and borrowed mirrors are kept."""
+        with tempfile.TemporaryDirectory(
+            prefix="qdt_test_cache_manager_", ignore_cleanup_errors=True
+        ) as tmpdirname:
+            working_directory = Path(os.path.realpath(tmpdirname), "qdt")
+            mirror = working_directory.joinpath("git_mirrors/mirror_1")
+            mirror.joinpath("objects/pack").mkdir(parents=True)
+            mirror.joinpath("objects/pack/pack-1.pack").write_bytes(b"0" * 1000)
+            os.utime(mirror.joinpath("objects/pack/pack-1.pack"), (100, 100))
+            os.utime(mirror, (100, 100))
+            repository = working_directory.joinpath("repositories/scenario")
+            alternates = repository.joinpath(".git/objects/info/alternates")
+            alternates.parent.mkdir(parents=True)
+            alternates.write_text(f"{mirror.joinpath('objects')}\n", encoding="UTF-8")
+            os.utime(alternates, (200, 200))
+            os.utime(repository, (200, 200))
+            plugin = working_directory.joinpath("plugins/plugin_1-0.zip")
+            plugin.parent.mkdir(parents=True)
+            plugin.write_bytes(b"0" * 100)
+            os.utime(plugin, (50, 50))
+
+            self.assertEqual(
+                find_borrowed_git_mirrors(repository_path=repository),
+                {os.fspath(mirror)},
+            )
+
+            # repository in use: its mirror is kept
+            journal = CacheUsageJournal()
+            journal.touch(repository)
+            evicted, cache_size = QdtCacheManager(
+                working_directory=working_directory
+            ).prune(max_size=10, protected=journal.snapshot())
+            self.assertEqual([entry.path for entry in evicted], [plugin])
+            self.assertTrue(mirror.exists())
+            self.assertGreater(cache_size, 10)
+
+            # repository evicted: its mirror follows
+            evicted, cache_size = QdtCacheManager(
+                working_directory=working_directory
+            ).prune(max_size=10)
+            self.assertEqual([entry.path for entry in evicted], [repository, mirror])
+            self.assertEqual(cache_size, 0)
+
+    def test_usage_journal(self):
+        """Test references recorded during a run."""
+        with tempfile.TemporaryDirectory(
+            prefix="qdt_test_cache_manager_", ignore_cleanup_errors=True
+        ) as tmpdirname:
+            working_directory = Path(os.path.realpath(tmpdirname), "qdt")
+            entry_path = working_directory.joinpath("plugins/plugin_1-0.zip")
+            entry_path.parent.mkdir(parents=True)
+            entry_path.write_bytes(b"0")
+
+            journal = CacheUsageJournal()
+            journal.touch(entry_path)
+            self.assertIn(os.fspath(entry_path), journal.snapshot())
+
+            cache_manager = QdtCacheManager(working_directory=working_directory)
+            cache_manager.save_usage(references=journal.snapshot())
+            # missing entries are forgotten
+            entry_path.unlink()
+            cache_manager.save_usage()
+            self.assertEqual(
+                QdtCacheManager(working_directory=working_directory).last_used, {}
+            )
+
+            journal.reset()
+            self.assertEqual(journal.snapshot(), {})
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+#! python3  # noqa E265
+
+"""Usage from the repo root folder:
+
+    .. code-block:: python
+
+        # for whole test
+        python -m unittest tests.test_utils_json_files
+        # for specific
+        python -m unittest tests.test_utils_json_files.TestUtilsJsonFiles.test_write_json_atomically
+"""
+
+# #############################################################################
+# ########## Libraries #############
+# ##################################
+
+# Standard library
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# package
+from qgis_deployment_toolbelt.utils.json_files import (
+    load_json_file,
+    write_json_atomically,
+)
+
+# #############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class TestUtilsJsonFiles(unittest.TestCase):
+    """Test module."""
+
+    def test_load_json_file(self):
+        """Test missing, invalid and valid JSON files."""
+        with tempfile.TemporaryDirectory(prefix="qdt_test_json_files_") as tmp_dir:
+            json_path = Path(tmp_dir, "index.json")
+            self.assertIsNone(load_json_file(file_path=json_path))
+
+            for bad_content in ("{not json", "[1, 2]"):
+                json_path.write_text(bad_content, encoding="UTF-8")
+                with self.subTest(content=bad_content):
+                    self.assertIsNone(load_json_file(file_path=json_path))
+
+            json_path.write_text('{"entries": []}', encoding="UTF-8")
+            self.assertEqual(load_json_file(file_path=json_path), {"entries": []})
+
+    def test_write_json_atomically(self):
+        """Test concurrent writes of the same file from threads."""
+        with tempfile.TemporaryDirectory(prefix="qdt_test_json_files_") as tmp_dir:
+            json_path = Path(tmp_dir, "sub", "index.json")
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(
+                    executor.map(
+                        lambda idx: write_json_atomically(
+                            json_data={"writer": idx}, file_path=json_path
+                        ),
+                        range(50),
+                    )
+                )
+
+            self.assertIn(load_json_file(file_path=json_path).get("writer"), range(50))
+            # no temporary file left
+            self.assertEqual(list(json_path.parent.iterdir()), [json_path])
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+#! python3  # noqa E265
+
+"""
+    Usage from the repo root folder:
+
+    .. code-block:: bash
+        # for whole tests
+        python -m unittest tests.test_utils_network_scheduler
+        # for specific test
+        python -m unittest tests.test_utils_network_scheduler.TestUtilsNetworkScheduler.test_host_jitter_is_deterministic
+"""
+
+# standard library
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from os import environ
+from pathlib import Path
+from threading import Thread
+from unittest.mock import patch
+
+# project
+from qgis_deployment_toolbelt.utils.file_downloader import download_remote_file_to_local
+from qgis_deployment_toolbelt.utils.network_scheduler import (
+    apply_host_jitter,
+    compute_backoff_delay,
+    get_host_jitter_delay,
+    parse_retry_after,
+    request_with_retries,
+    reset_host_jitter,
+)
+from qgis_deployment_toolbelt.utils.proxies import clear_proxy_caches
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class OverloadedHandler(BaseHTTPRequestHandler):
+    """Answer 503 to the first requests, then 200."""
+
+    failures_before_success: int = 2
+    hits: int = 0
+
+    def do_GET(self):
+        type(self).hits += 1
+        if type(self).hits <= self.failures_before_success:
+            self.send_response(503)
+            self.send_header("Retry-After", "0")
+            self.end_headers()
+            return
+
+        body = b"QDT is patient."
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestUtilsNetworkScheduler(unittest.TestCase):
+    """Test network scheduling utilities."""
+
+    def setUp(self):
+        """Executed before each test: local test server must be reached directly."""
+        self.env_patcher = patch.dict(environ)
+        self.env_patcher.start()
+        for proxy_var in (
+            "HTTP_PROXY",
+            "HTTPS_PROXY",
+            "QDT_PAC_FILE",
+            "QDT_PROXY_HTTP",
+        ):
+            environ.pop(proxy_var, None)
+        clear_proxy_caches()
+
+        OverloadedHandler.hits = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), OverloadedHandler)
+        self.server_thread = Thread(target=self.server.serve_forever, daemon=True)
+        self.server_thread.start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def tearDown(self):
+        """Executed after each test."""
+        self.server.shutdown()
+        self.server.server_close()
+        self.env_patcher.stop()
+        clear_proxy_caches()
+        reset_host_jitter()
+
+    def test_host_jitter_is_deterministic(self):
+        """Same host, same delay. Always within bounds."""
+        delay = get_host_jitter_delay(max_delay=300, hostname="qgis-workstation-42")
+        self.assertEqual(
+            delay, get_host_jitter_delay(max_delay=300, hostname="QGIS-Workstation-42")
+        )
+        self.assertGreaterEqual(delay, 0)
+        self.assertLess(delay, 300)
+
+        delays = {
+            get_host_jitter_delay(max_delay=300, hostname=f"host-{i}")
+            for i in range(20)
+        }
+        self.assertGreater(len(delays), 1)
+
+        self.assertEqual(get_host_jitter_delay(max_delay=0, hostname="any"), 0)
+
+    def test_host_jitter_applied_once(self):
+        """Jitter is disabled by default and then applied only once per run."""
+        self.assertEqual(apply_host_jitter(), 0)
+
+        environ["QDT_NETWORK_JITTER_MAX"] = "0.01"
+        first_delay = apply_host_jitter()
+        self.assertEqual(first_delay, get_host_jitter_delay(max_delay=0.01))
+        self.assertEqual(apply_host_jitter(), 0)
+
+    def test_parse_retry_after(self):
+        """Test Retry-After values parsing."""
+        self.assertEqual(parse_retry_after("120"), 120)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("not a date"))
+
+        in_a_minute = datetime.now(tz=timezone.utc) + timedelta(seconds=60)
+        delay = parse_retry_after(format_datetime(in_a_minute, usegmt=True))
+        self.assertGreater(delay, 50)
+        self.assertLessEqual(delay, 60)
+
+        a_minute_ago = datetime.now(tz=timezone.utc) - timedelta(seconds=60)
+        self.assertEqual(
+            parse_retry_after(format_datetime(a_minute_ago, usegmt=True)), 0
+        )
+
+    def test_backoff_delay(self):
+        """Test backoff is exponential and capped."""
+        self.assertEqual(compute_backoff_delay(attempt=1), 1)
+        self.assertEqual(compute_backoff_delay(attempt=3), 4)
+        self.assertEqual(compute_backoff_delay(attempt=30, max_delay=60), 60)
+        self.assertEqual(compute_backoff_delay(attempt=1, retry_after=10), 10)
+        self.assertEqual(
+            compute_backoff_delay(attempt=1, retry_after=3600, max_delay=60), 60
+        )
+
+    def test_request_retried_until_success(self):
+        """Server answers 503 twice, then 200."""
+        response = request_with_retries(url=f"{self.base_url}/file.txt")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(OverloadedHandler.hits, 3)
+
+    def test_request_retries_exhausted(self):
+        """Last response is returned when retries are exhausted."""
+        response = request_with_retries(url=f"{self.base_url}/file.txt", max_retries=1)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(OverloadedHandler.hits, 2)
+
+    def test_download_honours_retry_after(self):
+        """File downloader goes through the retries."""
+        with tempfile.TemporaryDirectory(
+            prefix="qdt_test_scheduler_", ignore_cleanup_errors=True
+        ) as tmpdirname:
+            downloaded_file = download_remote_file_to_local(
+                remote_url_to_download=f"{self.base_url}/file.txt",
+                local_file_path=Path(tmpdirname, "file.txt"),
+            )
+            self.assertEqual(downloaded_file.read_text(), "QDT is patient.")
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+#! python3  # noqa E265
+
+"""
+    Usage from the repo root folder:
+
+    .. code-block:: bash
+        # for whole tests
+        python -m unittest tests.test_utils_shared_cache
+        # for specific test
+        python -m unittest tests.test_utils_shared_cache.TestUtilsSharedCache.test_read_through
+"""
+
+# standard library
+import os
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# project
+from qgis_deployment_toolbelt.utils.file_lock import FileLock, FileLockTimeout
+from qgis_deployment_toolbelt.utils.shared_cache import (
+    SharedFileCache,
+    copy_file_if_changed,
+)
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestUtilsSharedCache(unittest.TestCase):
+    """Test shared cache and file lock."""
+
+    def setUp(self):
+        """Executed before each test."""
+        self.tmp_dir = tempfile.TemporaryDirectory(
+            prefix="qdt_test_shared_cache_", ignore_cleanup_errors=True
+        )
+        self.tmp_path = Path(self.tmp_dir.name)
+
+    def tearDown(self):
+        """Executed after each test."""
+        self.tmp_dir.cleanup()
+
+    def test_file_lock(self):
+        """Lock is exclusive, released on exit and stale locks are removed."""
+        lock_path = self.tmp_path / "entry.lock"
+        with FileLock(lock_path):
+            self.assertTrue(lock_path.is_file())
+            with self.assertRaises(FileLockTimeout):
+                FileLock(lock_path, timeout=0.2, poll_interval=0.05).acquire()
+        self.assertFalse(lock_path.exists())
+
+        # a lock left by a crashed process
+        lock_path.touch()
+        old_time = time.time() - 3600
+        os.utime(lock_path, (old_time, old_time))
+        with FileLock(lock_path, timeout=1, stale_after=60, poll_interval=0.05):
+            self.assertTrue(lock_path.is_file())
+
+    def test_read_through(self):
+        """Concurrent machines populate the shared cache only once."""
+        shared_cache = SharedFileCache(cache_folder=self.tmp_path / "shared")
+        populated = []
+
+        def populate(local_file_path: Path) -> Path:
+            populated.append(local_file_path)
+            time.sleep(0.2)
+            local_file_path.parent.mkdir(parents=True, exist_ok=True)
+            local_file_path.write_bytes(b"PK plugin archive")
+            return local_file_path
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [
+                executor.submit(
+                    shared_cache.fetch,
+                    file_name="2733_qtribu_0-14-2.zip",
+                    local_file_path=self.tmp_path / f"machine_{i}/plugin.zip",
+                    populate=populate,
+                )
+                for i in range(3)
+            ]
+            local_files = [f.result() for f in futures]
+
+        self.assertEqual(len(populated), 1)
+        for local_file in local_files:
+            self.assertEqual(local_file.read_bytes(), b"PK plugin archive")
+        self.assertTrue(Path(self.tmp_path, "shared/2733_qtribu_0-14-2.zip").is_file())
+        self.assertFalse(
+            Path(self.tmp_path, "shared/2733_qtribu_0-14-2.zip.lock").exists()
+        )
+
+    def test_unusable_cache_falls_back(self):
+        """If the shared folder can't be used, the file is retrieved anyway."""
+        not_a_folder = self.tmp_path / "file.txt"
+        not_a_folder.write_text("not a folder")
+        shared_cache = SharedFileCache(cache_folder=not_a_folder)
+
+        def populate(local_file_path: Path) -> Path:
+            local_file_path.write_bytes(b"direct")
+            return local_file_path
+
+        local_file = shared_cache.fetch(
+            file_name="plugin.zip",
+            local_file_path=self.tmp_path / "plugin.zip",
+            populate=populate,
+        )
+        self.assertEqual(local_file.read_bytes(), b"direct")
+
+    def test_copy_file_if_changed(self):
+        """Unchanged files, on size and modification time, are not copied again."""
+        source_file = self.tmp_path / "share" / "plugin.zip"
+        source_file.parent.mkdir()
+        source_file.write_bytes(b"version 1")
+        destination_file = self.tmp_path / "plugins" / "plugin.zip"
+
+        self.assertTrue(copy_file_if_changed(source_file, destination_file))
+        self.assertEqual(destination_file.read_bytes(), b"version 1")
+        self.assertFalse(copy_file_if_changed(source_file, destination_file))
+
+        source_file.write_bytes(b"version 2")
+        new_time = time.time() + 10
+        os.utime(source_file, (new_time, new_time))
+        self.assertTrue(copy_file_if_changed(source_file, destination_file))
+        self.assertEqual(destination_file.read_bytes(), b"version 2")
+        # no temporary file left behind
+        self.assertEqual(len(list(destination_file.parent.iterdir())), 1)
+
+        with self.assertRaises(FileNotFoundError):
+            copy_file_if_changed(self.tmp_path / "missing.zip", destination_file)
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+#! python3  # noqa E265
+
+"""
+    Usage from the repo root folder:
+
+    .. code-block:: bash
+        # for whole tests
+        python -m unittest tests.test_utils_single_flight
+        # for specific test
+        python -m unittest tests.test_utils_single_flight.TestUtilsSingleFlight.test_concurrent_calls_collapsed
+"""
+
+# standard library
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from os import environ
+from pathlib import Path
+from threading import Thread
+from unittest.mock import patch
+
+# project
+from qgis_deployment_toolbelt.utils.file_downloader import (
+    DOWNLOADS_REGISTRY,
+    download_remote_file_to_local,
+)
+from qgis_deployment_toolbelt.utils.proxies import clear_proxy_caches
+from qgis_deployment_toolbelt.utils.single_flight import SingleFlight
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    """Serve a small file, slowly, counting hits."""
+
+    hits: int = 0
+
+    def do_GET(self):
+        type(self).hits += 1
+        time.sleep(0.2)
+        body = b"PK fake plugin archive"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestUtilsSingleFlight(unittest.TestCase):
+    """Test single-flight registry."""
+
+    def setUp(self):
+        """Executed before each test: local test server must be reached directly."""
+        self.env_patcher = patch.dict(environ)
+        self.env_patcher.start()
+        for proxy_var in (
+            "HTTP_PROXY",
+            "HTTPS_PROXY",
+            "QDT_PAC_FILE",
+            "QDT_PROXY_HTTP",
+        ):
+            environ.pop(proxy_var, None)
+        clear_proxy_caches()
+
+    def tearDown(self):
+        """Executed after each test."""
+        self.env_patcher.stop()
+        clear_proxy_caches()
+
+    def test_concurrent_calls_collapsed(self):
+        """Concurrent calls for the same key run the function once."""
+        registry = SingleFlight()
+        calls = []
+
+        def slow_function(value: int) -> int:
+            calls.append(value)
+            time.sleep(0.2)
+            return value * 2
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = [
+                executor.submit(registry.do, "key", slow_function, 21) for _ in range(5)
+            ]
+            results = [f.result() for f in futures]
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([r[0] for r in results], [42] * 5)
+        self.assertEqual(sum(1 for r in results if not r[1]), 1)
+
+        # result is kept for later callers until forgotten
+        self.assertIn("key", registry)
+        self.assertEqual(registry.do("key", slow_function, 1), (42, True))
+        registry.clear()
+        self.assertNotIn("key", registry)
+
+    def test_failures_are_shared_then_forgotten(self):
+        """Exception is raised to waiting callers but not kept."""
+        registry = SingleFlight()
+
+        def failing_function():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            registry.do("key", failing_function)
+        self.assertNotIn("key", registry)
+        self.assertEqual(registry.do("key", lambda: "ok"), ("ok", False))
+
+    def test_download_same_url_once(self):
+        """Same URL requested to different paths is downloaded once."""
+        SlowHandler.hits = 0
+        server = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+        Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}/plugin.zip"
+        DOWNLOADS_REGISTRY.clear()
+
+        try:
+            with tempfile.TemporaryDirectory(
+                prefix="qdt_test_single_flight_", ignore_cleanup_errors=True
+            ) as tmpdirname:
+                with ThreadPoolExecutor(max_workers=3) as executor:
+                    futures = [
+                        executor.submit(
+                            download_remote_file_to_local,
+                            remote_url_to_download=url_variant,
+                            local_file_path=Path(tmpdirname, f"plugin_{i}.zip"),
+                        )
+                        for i, url_variant in enumerate(
+                            (url, url.replace("http://", "HTTP://"), f"{url}#fragment")
+                        )
+                    ]
+                    downloaded = [f.result() for f in futures]
+
+                self.assertEqual(SlowHandler.hits, 1)
+                for local_file in downloaded:
+                    self.assertTrue(local_file.is_file())
+                    self.assertEqual(local_file.read_bytes(), b"PK fake plugin archive")
+                self.assertTrue(downloaded[0].samefile(downloaded[1]))
+
+                # once removed, the file is downloaded again
+                for local_file in downloaded:
+                    local_file.unlink()
+                download_remote_file_to_local(
+                    remote_url_to_download=url,
+                    local_file_path=Path(tmpdirname, "plugin_again.zip"),
+                )
+                self.assertEqual(SlowHandler.hits, 2)
+        finally:
+            server.shutdown()
+            server.server_close()
+            DOWNLOADS_REGISTRY.clear()
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -17,7 +17,7 @@ from pathlib import Path
 
 # project
 from qgis_deployment_toolbelt.__about__ import __uri__
-from qgis_deployment_toolbelt.utils.url_helpers import check_str_is_url
+from qgis_deployment_toolbelt.utils.url_helpers import check_str_is_url, normalize_url
 
 # ############################################################################
 # ########## Classes #############
@@ -39,6 +39,25 @@ class TestUtilsUrlHelpers(unittest.TestCase):
         with self.assertRaises((TypeError, ValueError)):
             check_str_is_url(input_str=Path(__file__), raise_error=True)
 
+    def test_normalize_url(self):
+        """Test URL normalization."""
+        self.assertEqual(
+            normalize_url("HTTPS://Plugins.QGIS.org:443/plugins/qtribu/#top"),
+            "https://plugins.qgis.org/plugins/qtribu/",
+        )
+        self.assertEqual(
+            normalize_url("http://example.com:80"),
+            normalize_url("http://EXAMPLE.com/"),
+        )
+        self.assertEqual(
+            normalize_url("https://example.com:8443/my plugin.zip?v=1"),
+            "https://example.com:8443/my%20plugin.zip?v=1",
+        )
+        self.assertEqual(
+            normalize_url("https://example.com/my%20plugin.zip"),
+            normalize_url("https://example.com/my plugin.zip"),
+        )
+
 
 # ############################################################################
 # ####### Stand-alone run ########
@@ -0,0 +1,71 @@
+#! python3  # noqa E265
+
+"""
+    Usage from the repo root folder:
+
+    .. code-block:: bash
+        # for whole tests
+        python -m unittest tests.test_utils_versions
+        # for specific test
+        python -m unittest tests.test_utils_versions.TestUtilsVersions.test_sort_versions
+"""
+
+# standard library
+import unittest
+
+# 3rd party
+from packaging.version import Version
+
+# project
+from qgis_deployment_toolbelt.plugins.plugin import QgisPlugin
+from qgis_deployment_toolbelt.utils.versions import (
+    parse_version,
+    sort_versions,
+    version_key,
+)
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestUtilsVersions(unittest.TestCase):
+    """Test versions utilities."""
+
+    def test_parse_version(self):
+        """Test versions parsing, memoized."""
+        self.assertEqual(parse_version("v1.2.0"), Version("1.2.0"))
+        self.assertEqual(parse_version("2024.05.1"), Version("2024.5.1"))
+        self.assertIsNone(parse_version("not a version"))
+        self.assertIsNone(parse_version(None))
+
+        parse_version.cache_clear()
+        parse_version("3.34.1")
+        parse_version("3.34.1")
+        self.assertEqual(parse_version.cache_info().hits, 1)
+
+    def test_sort_versions(self):
+        """Test versions are sorted on their release segments, invalid ones first."""
+        self.assertEqual(
+            sort_versions(["3.9", "3.34", "weekly", "3.28.10", "3.28.2"]),
+            ["weekly", "3.9", "3.28.2", "3.28.10", "3.34"],
+        )
+        self.assertEqual(
+            sort_versions(["0.9.0", "1.0.0rc1", "1.0.0"], reverse=True),
+            ["1.0.0", "1.0.0rc1", "0.9.0"],
+        )
+        self.assertLess(version_key("abc"), version_key("0.0.1"))
+
+    def test_plugin_is_older_than(self):
+        """Test plugins comparison relies on parsed versions."""
+        plugin = QgisPlugin(name="Test plugin", version="1.9.0")
+        self.assertTrue(plugin.is_older_than("1.10.0"))
+        self.assertFalse(plugin.is_older_than("v1.2.3"))
+        self.assertIsNone(plugin.is_older_than("unknown"))
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()